@@ -15,7 +15,7 @@ from pathlib import Path
 from typing import Any, Dict
 from threading import Thread
 
-from fastapi import FastAPI, APIRouter, Request
+from fastapi import FastAPI, APIRouter, Request, Response
 
 from taos.common.neurons import BaseNeuron
 from taos.im.neurons.validator import Validator
@@ -84,8 +84,9 @@ class Proxy(Validator):
 
     async def orderbook(self, request : Request):
         body = await request.body()
-        message = msgspec.json.decode(body)
-        state = MarketSimulationStateUpdate.from_json(message) # Populate synapse class from request data
+        encoding = 'msgpack' if request.headers.get('content-type', '').startswith('application/msgpack') else 'json'
+        message = msgspec.msgpack.decode(body) if encoding == 'msgpack' else msgspec.json.decode(body)
+        state = MarketSimulationStateUpdate.from_json(message).as_models() # Populate synapse class from request data
         if not self.start_time:
             self.start_time = time.time()
             self.start_timestamp = state.timestamp
@@ -123,8 +124,10 @@ class Proxy(Validator):
                     agent_responses.append(FinanceAgentResponse.model_validate(response))
                 except Exception as e:
                     bt.logging.error(f"{agent} | Failed to validate response : {e}")
-        simulator_response = SimulatorResponseBatch(agent_responses).serialize()
-        return simulator_response
+        simulator_response = SimulatorResponseBatch(agent_responses)
+        if encoding == 'msgpack':
+            return Response(content=simulator_response.encode(encoding), media_type='application/msgpack')
+        return simulator_response.serialize()
 
     async def account(self, request : Request):
         data = await request.json()
@@ -145,5 +148,5 @@ if __name__ == "__main__":
     app.include_router(proxy.router)
     # Start simulator price seeding data process in new thread
     Thread(target=proxy.seed, daemon=True, name='Seed').start()
-    # Run the proxy as a FastAPI client via uvicorn on the configured port
-    uvicorn.run(app, port=config['proxy']['port'])
\ No newline at end of file
+    # Run the proxy as a FastAPI client via uvicorn on the configured port or Unix domain socket
+    uvicorn.run(app, port=config['proxy']['port'], uds=config['proxy'].get('socket_path'), timeout_keep_alive=config['proxy'].get('keep_alive_timeout', 300))
\ No newline at end of file
@@ -0,0 +1,128 @@
+/*
+ * SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+ * SPDX-License-Identifier: MIT
+ */
+#include <benchmark/benchmark.h>
+
+#include "json_util.hpp"
+#include "msgpack_util.hpp"
+
+#include <random>
+
+//-------------------------------------------------------------------------
+
+// Builds a facsimile of the MULTIBOOK_STATE_PUBLISH payload sent by the
+// DistributedProxyAgent, with the given number of agents and books.
+static rapidjson::Document makeStatePayload(int64_t agentCount, int64_t bookCount)
+{
+    static constexpr int kDepth = 21;
+
+    std::mt19937 rng{42};
+    std::uniform_real_distribution<double> dist{0.0, 1.0};
+
+    rapidjson::Document json{rapidjson::kObjectType};
+    auto& allocator = json.GetAllocator();
+
+    rapidjson::Value books{rapidjson::kArrayType};
+    for (int64_t bookId = 0; bookId < bookCount; ++bookId) {
+        rapidjson::Value book{rapidjson::kObjectType};
+        book.AddMember("bookId", rapidjson::Value{bookId}, allocator);
+        for (const char* side : {"bid", "ask"}) {
+            rapidjson::Value levels{rapidjson::kArrayType};
+            for (int i = 0; i < kDepth; ++i) {
+                rapidjson::Value level{rapidjson::kObjectType};
+                level.AddMember("price", 100.0 + (side[0] == 'a' ? i : -i) * 0.01, allocator);
+                level.AddMember("volume", dist(rng) * 10.0, allocator);
+                levels.PushBack(level, allocator);
+            }
+            book.AddMember(rapidjson::StringRef(side), levels, allocator);
+        }
+        book.AddMember("record", rapidjson::Value{rapidjson::kArrayType}, allocator);
+        books.PushBack(book, allocator);
+    }
+
+    rapidjson::Value accounts{rapidjson::kObjectType};
+    for (int64_t agentId = 0; agentId < agentCount; ++agentId) {
+        rapidjson::Value account{rapidjson::kObjectType};
+        account.AddMember("agentId", rapidjson::Value{agentId}, allocator);
+        rapidjson::Value holdings{rapidjson::kArrayType};
+        for (int64_t bookId = 0; bookId < bookCount; ++bookId) {
+            rapidjson::Value holding{rapidjson::kObjectType};
+            for (const char* currency : {"base", "quote"}) {
+                rapidjson::Value balance{rapidjson::kObjectType};
+                balance.AddMember("free", dist(rng) * 1000.0, allocator);
+                balance.AddMember("reserved", dist(rng) * 1000.0, allocator);
+                balance.AddMember("total", dist(rng) * 2000.0, allocator);
+                holding.AddMember(rapidjson::StringRef(currency), balance, allocator);
+            }
+            holdings.PushBack(holding, allocator);
+        }
+        rapidjson::Value balances{rapidjson::kObjectType};
+        balances.AddMember("holdings", holdings, allocator);
+        account.AddMember("balances", balances, allocator);
+        account.AddMember("orders", rapidjson::Value{rapidjson::kArrayType}, allocator);
+        const auto key = std::to_string(agentId);
+        accounts.AddMember(rapidjson::Value{key.c_str(), allocator}, account, allocator);
+    }
+
+    rapidjson::Value payload{rapidjson::kObjectType};
+    payload.AddMember("books", books, allocator);
+    payload.AddMember("accounts", accounts, allocator);
+    payload.AddMember("notices", rapidjson::Value{rapidjson::kArrayType}, allocator);
+    json.AddMember("timestamp", rapidjson::Value{uint64_t{1'000'000'000}}, allocator);
+    json.AddMember("payload", payload, allocator);
+    return json;
+}
+
+//-------------------------------------------------------------------------
+
+static void BM_EncodeStateJson(benchmark::State& state)
+{
+    const auto json = makeStatePayload(state.range(0), state.range(1));
+    size_t size{};
+    for (auto _ : state) {
+        auto str = taosim::json::json2str(json);
+        size = str.size();
+        benchmark::DoNotOptimize(str);
+    }
+    state.counters["bytes"] = static_cast<double>(size);
+}
+BENCHMARK(BM_EncodeStateJson)->Args({256, 20})->Unit(benchmark::kMillisecond);
+
+static void BM_EncodeStateMsgpack(benchmark::State& state)
+{
+    const auto json = makeStatePayload(state.range(0), state.range(1));
+    size_t size{};
+    for (auto _ : state) {
+        auto str = taosim::msgpack::json2msgpack(json);
+        size = str.size();
+        benchmark::DoNotOptimize(str);
+    }
+    state.counters["bytes"] = static_cast<double>(size);
+}
+BENCHMARK(BM_EncodeStateMsgpack)->Args({256, 20})->Unit(benchmark::kMillisecond);
+
+static void BM_DecodeStateJson(benchmark::State& state)
+{
+    const auto str = taosim::json::json2str(makeStatePayload(state.range(0), state.range(1)));
+    for (auto _ : state) {
+        rapidjson::Document json;
+        json.Parse(str.c_str());
+        benchmark::DoNotOptimize(json);
+    }
+    state.counters["bytes"] = static_cast<double>(str.size());
+}
+BENCHMARK(BM_DecodeStateJson)->Args({256, 20})->Unit(benchmark::kMillisecond);
+
+static void BM_DecodeStateMsgpack(benchmark::State& state)
+{
+    const auto str = taosim::msgpack::json2msgpack(makeStatePayload(state.range(0), state.range(1)));
+    for (auto _ : state) {
+        auto json = taosim::msgpack::msgpack2json(str);
+        benchmark::DoNotOptimize(json);
+    }
+    state.counters["bytes"] = static_cast<double>(str.size());
+}
+BENCHMARK(BM_DecodeStateMsgpack)->Args({256, 20})->Unit(benchmark::kMillisecond);
+
+//-------------------------------------------------------------------------
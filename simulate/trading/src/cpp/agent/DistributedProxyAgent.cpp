@@ -7,11 +7,14 @@
 #include "ExchangeAgentMessagePayloads.hpp"
 #include "Simulation.hpp"
 #include "json_util.hpp"
+#include "msgpack_util.hpp"
 #include "util.hpp"
 
 #include <rapidjson/stringbuffer.h>
 #include <rapidjson/writer.h>
 
+#include <boost/asio/local/stream_protocol.hpp>
+
 #include <source_location>
 #include <chrono>
 #include <thread>
@@ -41,10 +44,7 @@ void DistributedProxyAgent::receiveMessage(Message::Ptr msg)
                 json.PushBack(msgJson, allocator);
             });
         rapidjson::Document res;
-        net::io_context ctx;
-        net::co_spawn(
-            ctx, asyncSendOverNetwork(json, m_generalMsgEndpoint, res), net::detached);
-        ctx.run();
+        sendOverNetwork(json, m_generalMsgEndpoint, res);
         if (m_testMode) {
             const Timestamp now = simulation()->currentTimestamp();
             for (const rapidjson::Value& response : res["responses"].GetArray()) {
@@ -68,9 +68,24 @@ void DistributedProxyAgent::configure(const pugi::xml_node& node)
     if (!(att = node.attribute("port")).empty()) {
         m_port = simulation()->parameters().processString(att.as_string());
     }
+    if (!(att = node.attribute("socketPath")).empty()) {
+        m_socketPath = simulation()->parameters().processString(att.as_string());
+    }
     if (!(att = node.attribute("bookStateEndpoint")).empty()) {
         m_bookStateEndpoint = simulation()->parameters().processString(att.as_string());
     }
+    if (!(att = node.attribute("bookStateEncoding")).empty()) {
+        const auto encoding = simulation()->parameters().processString(att.as_string());
+        if (encoding == "json") {
+            m_bookStateEncoding = PayloadEncoding::JSON;
+        } else if (encoding == "msgpack") {
+            m_bookStateEncoding = PayloadEncoding::MSGPACK;
+        } else {
+            throw std::invalid_argument{fmt::format(
+                "{}: attribute 'bookStateEncoding' should be one of 'json' or 'msgpack', was '{}'",
+                std::source_location::current().file_name(), encoding)};
+        }
+    }
     if (!(att = node.attribute("generalMsgEndpoint")).empty()) {
         m_generalMsgEndpoint = simulation()->parameters().processString(att.as_string());
     }
@@ -102,10 +117,7 @@ void DistributedProxyAgent::handleBookStatePublish(Message::Ptr msg)
         allocator);
 
     rapidjson::Document res;
-
-    net::io_context ctx;
-    net::co_spawn(ctx, asyncSendOverNetwork(msgJson, m_bookStateEndpoint, res), net::detached);
-    ctx.run();
+    sendOverNetwork(msgJson, m_bookStateEndpoint, res, m_bookStateEncoding);
 
     const Timestamp now = simulation()->currentTimestamp();
     for (const rapidjson::Value& response : res["responses"].GetArray()) {
@@ -119,120 +131,221 @@ void DistributedProxyAgent::handleBookStatePublish(Message::Ptr msg)
 
 //-------------------------------------------------------------------------
 
-net::awaitable<void> DistributedProxyAgent::asyncSendOverNetwork(
-    const rapidjson::Value& reqBody, const std::string& endpoint, rapidjson::Document& resJson)
+void DistributedProxyAgent::sendOverNetwork(
+    const rapidjson::Value& reqBody,
+    const std::string& endpoint,
+    rapidjson::Document& resJson,
+    PayloadEncoding encoding)
 {
-    auto resolver =
-        use_nothrow_awaitable.as_default_on(tcp::resolver{co_await this_coro::executor});
-    auto tcp_stream =
-        use_nothrow_awaitable.as_default_on(beast::tcp_stream{co_await this_coro::executor});
+    // The context is kept alive across steps so that the connection it owns can be reused.
+    m_ioContext.restart();
+    net::co_spawn(
+        m_ioContext,
+        asyncSendOverNetwork(reqBody, endpoint, resJson, encoding),
+        net::detached);
+    m_ioContext.run();
+}
 
-    int attempts = 0;
-    // Resolve.
-    auto endpointsVariant = co_await (resolver.async_resolve(m_host, m_port) || timeout(1s));
-    while (endpointsVariant.index() == 1) {
-        fmt::println("tcp::resolver timed out on {}:{}", m_host, m_port);
-        std::this_thread::sleep_for(10s);
-        endpointsVariant = co_await (resolver.async_resolve(m_host, m_port) || timeout(1s));
-    }
-    auto [e1, endpoints] = std::get<0>(endpointsVariant);
-    while (e1) {
-        const auto loc = std::source_location::current();
-        simulation()->logDebug("{}#L{}: {}:{}: {}", loc.file_name(), loc.line(), m_host, m_port, e1.what());
-        attempts++;
-        fmt::println("Unable to resolve connection to validator at {}:{}{} - Retrying (Attempt {})", m_host, m_port, endpoint, attempts);
-        std::this_thread::sleep_for(10s);
-        endpointsVariant = co_await (resolver.async_resolve(m_host, m_port) || timeout(1s));
-        auto [e11, endpoints1] = std::get<0>(endpointsVariant);
-        e1 = e11;
-        endpoints = endpoints1;
+//-------------------------------------------------------------------------
+
+net::awaitable<void> DistributedProxyAgent::asyncConnect(const std::string& endpoint)
+{
+    std::vector<net::generic::stream_protocol::endpoint> endpoints;
+
+    if (!m_socketPath.empty()) {
+        endpoints.emplace_back(net::local::stream_protocol::endpoint{m_socketPath});
+    } else {
+        auto resolver =
+            use_nothrow_awaitable.as_default_on(tcp::resolver{co_await this_coro::executor});
+
+        int attempts = 0;
+        // Resolve.
+        auto endpointsVariant = co_await (resolver.async_resolve(m_host, m_port) || timeout(1s));
+        while (endpointsVariant.index() == 1) {
+            fmt::println("tcp::resolver timed out on {}:{}", m_host, m_port);
+            std::this_thread::sleep_for(10s);
+            endpointsVariant = co_await (resolver.async_resolve(m_host, m_port) || timeout(1s));
+        }
+        auto [e1, results] = std::get<0>(endpointsVariant);
+        while (e1) {
+            const auto loc = std::source_location::current();
+            simulation()->logDebug("{}#L{}: {}:{}: {}", loc.file_name(), loc.line(), m_host, m_port, e1.what());
+            attempts++;
+            fmt::println("Unable to resolve connection to validator at {}:{}{} - Retrying (Attempt {})", m_host, m_port, endpoint, attempts);
+            std::this_thread::sleep_for(10s);
+            endpointsVariant = co_await (resolver.async_resolve(m_host, m_port) || timeout(1s));
+            auto [e11, results1] = std::get<0>(endpointsVariant);
+            e1 = e11;
+            results = results1;
+        }
+        for (const auto& entry : results) {
+            endpoints.emplace_back(entry.endpoint());
+        }
     }
 
     // Connect.
-    attempts = 0;
-    auto connectVariant = co_await (tcp_stream.async_connect(endpoints) || timeout(3s));
+    m_stream.emplace(co_await this_coro::executor);
+    int attempts = 0;
+    auto connectVariant =
+        co_await (m_stream->async_connect(endpoints, use_nothrow_awaitable) || timeout(3s));
     while (connectVariant.index() == 1) {
-        fmt::println("tcp_stream::async_connect timed out on {}:{}", m_host, m_port);
+        fmt::println("async_connect timed out on {}", address());
         std::this_thread::sleep_for(10s);
-        connectVariant = co_await (tcp_stream.async_connect(endpoints) || timeout(3s));
+        connectVariant =
+            co_await (m_stream->async_connect(endpoints, use_nothrow_awaitable) || timeout(3s));
     }
     auto [e2, _2] = std::get<0>(connectVariant);
     while (e2) {
         const auto loc = std::source_location::current();
-        simulation()->logDebug("{}#L{}: {}:{}: {}", loc.file_name(), loc.line(), m_host, m_port, e2.what());
+        simulation()->logDebug("{}#L{}: {}: {}", loc.file_name(), loc.line(), address(), e2.what());
         attempts++;
-        fmt::println("Unable to connect to validator at {}:{}{} - Retrying (Attempt {})", m_host, m_port, endpoint, attempts);
+        fmt::println("Unable to connect to validator at {}{} - Retrying (Attempt {})", address(), endpoint, attempts);
         std::this_thread::sleep_for(10s);
-        connectVariant = co_await (tcp_stream.async_connect(endpoints) || timeout(3s));
+        connectVariant =
+            co_await (m_stream->async_connect(endpoints, use_nothrow_awaitable) || timeout(3s));
         auto [e21, _21] = std::get<0>(connectVariant);
         e2 = e21;
         _2 = _21;
     }
+}
 
-    // Create the request.
-    const auto req = makeHttpRequest(endpoint, taosim::json::json2str(reqBody));
+//-------------------------------------------------------------------------
 
-    // Send the request.
-    attempts = 0;
-    auto writeVariant = co_await (http::async_write(tcp_stream, req) || timeout(10s));
-    while (writeVariant.index() == 1) {
-        fmt::println("http::async_write timed out on {}:{}", m_host, m_port);
-        std::this_thread::sleep_for(10s);
-        writeVariant = co_await (http::async_write(tcp_stream, req) || timeout(10s));
-    }
-    auto [e3, _3] = std::get<0>(writeVariant);
-    while (e3) {
-        const auto loc = std::source_location::current();
-        simulation()->logDebug("{}#L{}: {}:{}: {}", loc.file_name(), loc.line(), m_host, m_port, e3.what());
-        attempts++;
-        fmt::println("Unable to send request to validator at {}:{}{} - Retrying (Attempt {})", m_host, m_port, endpoint, attempts);
-        std::this_thread::sleep_for(10s);
-        writeVariant = co_await (http::async_write(tcp_stream, req) || timeout(10s));
-        auto [e31, _31] = std::get<0>(writeVariant);
-        e3 = e31;
-        _3 = _31;
-    }
+net::awaitable<void> DistributedProxyAgent::asyncSendOverNetwork(
+    const rapidjson::Value& reqBody,
+    const std::string& endpoint,
+    rapidjson::Document& resJson,
+    PayloadEncoding encoding)
+{
+    auto elapsedUs = [](steady_clock::time_point start) {
+        return std::chrono::duration_cast<std::chrono::microseconds>(
+            steady_clock::now() - start).count();
+    };
+
+    // Create the request.
+    const auto encodeStart = steady_clock::now();
+    const auto req = encoding == PayloadEncoding::MSGPACK
+        ? makeHttpRequest(endpoint, taosim::msgpack::json2msgpack(reqBody), taosim::msgpack::kContentType)
+        : makeHttpRequest(endpoint, taosim::json::json2str(reqBody), "application/json");
+    simulation()->logDebug(
+        "{}{}: encoded request ({} bytes) in {}us",
+        address(), endpoint, req.body().size(), elapsedUs(encodeStart));
 
-    // Receive the response.
-    attempts = 0;
-    beast::flat_buffer buf;
+    // Send the request and receive the response, (re)connecting as necessary. A failure on
+    // a reused connection is most likely the validator having closed it while idle, so the
+    // request is retried immediately on a fresh connection rather than after a back-off.
     http::response<http::string_body> res;
-    auto readVariant = co_await (http::async_read(tcp_stream, buf, res) || timeout(30s));
-    while (readVariant.index() == 1) {
-        fmt::println("http::async_read timed out on {}:{}", m_host, m_port);
-        std::this_thread::sleep_for(10s);
-        readVariant = co_await (http::async_read(tcp_stream, buf, res) || timeout(30s));
+    int64_t connectUs{}, sendUs{}, receiveUs{};
+    bool reused{};
+    for (int attempts = 1;; ++attempts) {
+        reused = m_stream.has_value();
+        const auto connectStart = steady_clock::now();
+        if (!reused) {
+            co_await asyncConnect(endpoint);
+        }
+        connectUs = elapsedUs(connectStart);
+
+        // Send the request.
+        const auto sendStart = steady_clock::now();
+        auto writeVariant =
+            co_await (http::async_write(*m_stream, req, use_nothrow_awaitable) || timeout(10s));
+        const auto e3 = writeVariant.index() == 0
+            ? std::get<0>(std::get<0>(writeVariant))
+            : beast::error_code{net::error::timed_out};
+        if (e3) {
+            const auto loc = std::source_location::current();
+            simulation()->logDebug("{}#L{}: {}: {}", loc.file_name(), loc.line(), address(), e3.what());
+            closeConnection();
+            if (!reused) {
+                fmt::println("Unable to send request to validator at {}{} - Retrying (Attempt {})", address(), endpoint, attempts);
+                std::this_thread::sleep_for(10s);
+            }
+            continue;
+        }
+        sendUs = elapsedUs(sendStart);
+
+        // Receive the response.
+        const auto receiveStart = steady_clock::now();
+        beast::flat_buffer buf;
+        res = http::response<http::string_body>{};
+        auto readVariant =
+            co_await (http::async_read(*m_stream, buf, res, use_nothrow_awaitable) || timeout(30s));
+        while (readVariant.index() == 1) {
+            fmt::println("http::async_read timed out on {}", address());
+            readVariant =
+                co_await (http::async_read(*m_stream, buf, res, use_nothrow_awaitable) || timeout(30s));
+        }
+        const auto [e4, _4] = std::get<0>(readVariant);
+        if (e4) {
+            const auto loc = std::source_location::current();
+            simulation()->logDebug("{}#L{}: {}: {}", loc.file_name(), loc.line(), address(), e4.what());
+            closeConnection();
+            if (!reused) {
+                fmt::println("Unable to read response from validator at {}{} - Retrying (Attempt {})", address(), endpoint, attempts);
+                std::this_thread::sleep_for(10s);
+            }
+            continue;
+        }
+        receiveUs = elapsedUs(receiveStart);
+        break;
     }
-    auto [e4, _4] = std::get<0>(readVariant);
-    while (e4) {
-        const auto loc = std::source_location::current();
-        simulation()->logDebug("{}#L{}: {}:{}: {}", loc.file_name(), loc.line(), m_host, m_port, e4.what());
-        attempts++;
-        fmt::println("Unable to read response from validator at {}:{}{} - Retrying (Attempt {})", m_host, m_port, endpoint, attempts);
-        std::this_thread::sleep_for(10s);
-        readVariant = co_await (http::async_read(tcp_stream, buf, res) || timeout(30s));
-        auto [e41, _41] = std::get<0>(readVariant);
-        e4 = e41;
-        _4 = _41;
+    if (!res.keep_alive()) {
+        closeConnection();
     }
+    simulation()->logDebug(
+        "{}{}: connect {}us ({}), send {}us, receive {}us",
+        address(), endpoint, connectUs, reused ? "reused" : "new", sendUs, receiveUs);
 
-    resJson.Parse(res.body().c_str());
+    // Decode the response according to the encoding chosen by the validator.
+    const auto decodeStart = steady_clock::now();
+    const auto contentType = res[http::field::content_type];
+    if (std::string_view{contentType.data(), contentType.size()}.starts_with(taosim::msgpack::kContentType)) {
+        resJson = taosim::msgpack::msgpack2json(res.body());
+    } else {
+        resJson.Parse(res.body().c_str());
+    }
+    simulation()->logDebug(
+        "{}{}: decoded response ({} bytes) in {}us",
+        address(), endpoint, res.body().size(), elapsedUs(decodeStart));
 }
 
 //-------------------------------------------------------------------------
 
 http::request<http::string_body> DistributedProxyAgent::makeHttpRequest(
-    const std::string& target, const std::string& body)
+    const std::string& target, std::string body, std::string_view contentType)
 {
     http::request<http::string_body> req;
     req.method(http::verb::get);
     req.target(target);
     req.version(11);
+    req.keep_alive(true);
     req.set(http::field::host, m_host);
-    req.set(http::field::content_type, "application/json");
-    req.body() = body;
+    const beast::string_view contentTypeView{contentType.data(), contentType.size()};
+    req.set(http::field::content_type, contentTypeView);
+    req.set(http::field::accept, contentTypeView);
+    req.body() = std::move(body);
     req.prepare_payload();
     return req;
 }
 
 //-------------------------------------------------------------------------
+
+std::string DistributedProxyAgent::address() const
+{
+    return m_socketPath.empty() ? fmt::format("{}:{}", m_host, m_port) : m_socketPath;
+}
+
+//-------------------------------------------------------------------------
+
+void DistributedProxyAgent::closeConnection() noexcept
+{
+    if (!m_stream) {
+        return;
+    }
+    beast::error_code ec;
+    m_stream->socket().shutdown(net::socket_base::shutdown_both, ec);
+    m_stream->socket().close(ec);
+    m_stream.reset();
+}
+
+//-------------------------------------------------------------------------
@@ -10,10 +10,22 @@
 
 #include "rapidjson/document.h"
 
+#include <boost/asio/generic/stream_protocol.hpp>
+
+#include <optional>
+#include <string_view>
 #include <vector>
 
 //-------------------------------------------------------------------------
 
+enum class PayloadEncoding : uint32_t
+{
+    JSON,
+    MSGPACK
+};
+
+//-------------------------------------------------------------------------
+
 class DistributedProxyAgent : public Agent
 {
 public:
@@ -25,19 +37,37 @@ public:
     void setTestMode(bool flag) noexcept { m_testMode = flag; }
 
 private:
+    using Stream = beast::basic_stream<net::generic::stream_protocol>;
+
+    void sendOverNetwork(
+        const rapidjson::Value& reqBody,
+        const std::string& endpoint,
+        rapidjson::Document& resJson,
+        PayloadEncoding encoding = PayloadEncoding::JSON);
+    net::awaitable<void> asyncConnect(const std::string& endpoint);
     net::awaitable<void> asyncSendOverNetwork(
-        const rapidjson::Value& reqBody, const std::string& endpoint, rapidjson::Document& resJson);
-    http::request<http::string_body>
-        makeHttpRequest(const std::string& target, const std::string& body);
+        const rapidjson::Value& reqBody,
+        const std::string& endpoint,
+        rapidjson::Document& resJson,
+        PayloadEncoding encoding = PayloadEncoding::JSON);
+    http::request<http::string_body> makeHttpRequest(
+        const std::string& target, std::string body, std::string_view contentType);
+    void closeConnection() noexcept;
+    [[nodiscard]] std::string address() const;
 
     void handleBookStatePublish(Message::Ptr msg);
 
     std::string m_host;
     std::string m_port;
+    std::string m_socketPath;
     std::string m_bookStateEndpoint;
     std::string m_generalMsgEndpoint;
+    PayloadEncoding m_bookStateEncoding{PayloadEncoding::JSON};
     std::vector<Message::Ptr> m_messages;
     bool m_testMode{};
+
+    net::io_context m_ioContext;
+    std::optional<Stream> m_stream;
 };
 
 //-------------------------------------------------------------------------
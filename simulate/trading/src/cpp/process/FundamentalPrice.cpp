@@ -36,6 +36,7 @@ FundamentalPrice::FundamentalPrice(
 {
     m_value = m_X0;
     m_seedfile = (simulation->logDir() / "fundamental_seed.csv").generic_string();
+    m_seedChannelFile = simulation->logDir() / "fundamental_seed.bin";
 }
 
 //-------------------------------------------------------------------------
@@ -45,22 +46,40 @@ void FundamentalPrice::update(Timestamp timestamp)
     if (timestamp - m_last_seed_time >= m_seedInterval) {
         int count = m_last_count;
         uint64_t seed = 0;
-        if ( fs::exists( m_seedfile ) ) {
-            try {
-                std::vector<std::string> lines = taosim::util::getLastLines(m_seedfile, 2);
-                if (lines.size() >= 2) {
-                    std::vector<std::string> line = taosim::util::split(lines[lines.size() - 2],',');
-                    if (line.size()== 2) {
-                        count = std::stoi(line[0]);
-                        seed = static_cast<uint64_t>(round(std::stof(line[1])*100)) + m_bookId*10;
+        // Where the validator publishes seeds to the memory-mapped channel, the latest value is read from it directly;
+        // otherwise the seed is parsed from the tail of the seed file.  The channel is removed by the validator when it stops publishing to it.
+        if (m_seedChannel && !fs::exists(m_seedChannelFile)) {
+            fmt::println("FundamentalPrice::update : SEED CHANNEL REMOVED - READING SEED FROM FILE");
+            m_seedChannel.reset();
+        }
+        if (!m_seedChannel && fs::exists(m_seedChannelFile)) {
+            m_seedChannel = taosim::util::SeedChannel::open(m_seedChannelFile);
+        }
+        if ( m_seedChannel || fs::exists( m_seedfile ) ) {
+            if (m_seedChannel) {
+                if (auto record = m_seedChannel->latest()) {
+                    count = static_cast<int>(record->count);
+                    seed = static_cast<uint64_t>(round(static_cast<float>(record->price)*100)) + m_bookId*10;
+                } else {
+                    fmt::println("FundamentalPrice::update : FAILED TO GET SEED FROM CHANNEL - NO DATA");
+                }
+            } else {
+                try {
+                    std::vector<std::string> lines = taosim::util::getLastLines(m_seedfile, 2);
+                    if (lines.size() >= 2) {
+                        std::vector<std::string> line = taosim::util::split(lines[lines.size() - 2],',');
+                        if (line.size()== 2) {
+                            count = std::stoi(line[0]);
+                            seed = static_cast<uint64_t>(round(std::stof(line[1])*100)) + m_bookId*10;
+                        } else {
+                            fmt::println("FundamentalPrice::update : FAILED TO GET SEED FROM LINE - {}", lines[lines.size() - 2]);
+                        }
                     } else {
-                        fmt::println("FundamentalPrice::update : FAILED TO GET SEED FROM LINE - {}", lines[lines.size() - 2]);
+                        fmt::println("FundamentalPrice::update : FAILED TO GET SEED FROM FILE - NO DATA ({} LINES READ)", lines.size());
                     }
-                } else {
-                    fmt::println("FundamentalPrice::update : FAILED TO GET SEED FROM FILE - NO DATA ({} LINES READ)", lines.size());
+                } catch (const std::exception &exc) {
+                    fmt::println("FundamentalPrice::update : ERROR GETTING SEED FROM FILE - {}", exc.what());
                 }
-            } catch (const std::exception &exc) {
-                fmt::println("FundamentalPrice::update : ERROR GETTING SEED FROM FILE - {}", exc.what());
             }
             if (count == m_last_count) {
                 std::random_device rd;
@@ -6,6 +6,7 @@
 
 #include "Process.hpp"
 #include "RNG.hpp"
+#include "SeedChannel.hpp"
 #include "common.hpp"
 
 #include <pugixml.hpp>
@@ -46,6 +47,8 @@ private:
     uint64_t m_bookId;
     uint64_t m_seedInterval;
     std::string m_seedfile;
+    fs::path m_seedChannelFile;
+    std::unique_ptr<taosim::util::SeedChannel> m_seedChannel;
     RNG m_rng;
     double m_X0, m_mu, m_sigma, m_dt;
     double m_dJ;
@@ -0,0 +1,329 @@
+/*
+ * SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+ * SPDX-License-Identifier: MIT
+ */
+#include "msgpack_util.hpp"
+
+#include <fmt/format.h>
+
+#include <bit>
+#include <concepts>
+#include <cstdint>
+#include <cstring>
+#include <source_location>
+#include <stdexcept>
+
+//-------------------------------------------------------------------------
+
+namespace taosim::msgpack
+{
+
+//-------------------------------------------------------------------------
+
+namespace
+{
+
+//-------------------------------------------------------------------------
+
+template<std::unsigned_integral T>
+void writeBigEndian(std::string& out, T value)
+{
+    if constexpr (std::endian::native == std::endian::little) {
+        value = std::byteswap(value);
+    }
+    out.append(reinterpret_cast<const char*>(&value), sizeof(T));
+}
+
+void packUint(std::string& out, uint64_t value)
+{
+    if (value <= 0x7f) {
+        out.push_back(static_cast<char>(value));
+    } else if (value <= UINT8_MAX) {
+        out.push_back('\xcc');
+        writeBigEndian(out, static_cast<uint8_t>(value));
+    } else if (value <= UINT16_MAX) {
+        out.push_back('\xcd');
+        writeBigEndian(out, static_cast<uint16_t>(value));
+    } else if (value <= UINT32_MAX) {
+        out.push_back('\xce');
+        writeBigEndian(out, static_cast<uint32_t>(value));
+    } else {
+        out.push_back('\xcf');
+        writeBigEndian(out, value);
+    }
+}
+
+void packInt(std::string& out, int64_t value)
+{
+    if (value >= 0) {
+        packUint(out, static_cast<uint64_t>(value));
+    } else if (value >= -32) {
+        out.push_back(static_cast<char>(value));
+    } else if (value >= INT8_MIN) {
+        out.push_back('\xd0');
+        writeBigEndian(out, static_cast<uint8_t>(value));
+    } else if (value >= INT16_MIN) {
+        out.push_back('\xd1');
+        writeBigEndian(out, static_cast<uint16_t>(value));
+    } else if (value >= INT32_MIN) {
+        out.push_back('\xd2');
+        writeBigEndian(out, static_cast<uint32_t>(value));
+    } else {
+        out.push_back('\xd3');
+        writeBigEndian(out, static_cast<uint64_t>(value));
+    }
+}
+
+void packHeader(
+    std::string& out, uint32_t size, uint8_t fixCode, uint32_t fixMax, uint8_t code16, uint8_t code32)
+{
+    if (size <= fixMax) {
+        out.push_back(static_cast<char>(fixCode | size));
+    } else if (size <= UINT16_MAX) {
+        out.push_back(static_cast<char>(code16));
+        writeBigEndian(out, static_cast<uint16_t>(size));
+    } else {
+        out.push_back(static_cast<char>(code32));
+        writeBigEndian(out, size);
+    }
+}
+
+void packString(std::string& out, const char* str, uint32_t size)
+{
+    if (size <= 31) {
+        out.push_back(static_cast<char>(0xa0 | size));
+    } else if (size <= UINT8_MAX) {
+        out.push_back('\xd9');
+        writeBigEndian(out, static_cast<uint8_t>(size));
+    } else if (size <= UINT16_MAX) {
+        out.push_back('\xda');
+        writeBigEndian(out, static_cast<uint16_t>(size));
+    } else {
+        out.push_back('\xdb');
+        writeBigEndian(out, size);
+    }
+    out.append(str, size);
+}
+
+void pack(std::string& out, const rapidjson::Value& json)
+{
+    switch (json.GetType()) {
+        case rapidjson::kNullType:
+            out.push_back('\xc0');
+            break;
+        case rapidjson::kFalseType:
+            out.push_back('\xc2');
+            break;
+        case rapidjson::kTrueType:
+            out.push_back('\xc3');
+            break;
+        case rapidjson::kObjectType:
+            packHeader(out, json.MemberCount(), 0x80, 15, 0xde, 0xdf);
+            for (const auto& member : json.GetObject()) {
+                packString(out, member.name.GetString(), member.name.GetStringLength());
+                pack(out, member.value);
+            }
+            break;
+        case rapidjson::kArrayType:
+            packHeader(out, json.Size(), 0x90, 15, 0xdc, 0xdd);
+            for (const auto& element : json.GetArray()) {
+                pack(out, element);
+            }
+            break;
+        case rapidjson::kStringType:
+            packString(out, json.GetString(), json.GetStringLength());
+            break;
+        case rapidjson::kNumberType:
+            if (json.IsUint64()) {
+                packUint(out, json.GetUint64());
+            } else if (json.IsInt64()) {
+                packInt(out, json.GetInt64());
+            } else {
+                out.push_back('\xcb');
+                writeBigEndian(out, std::bit_cast<uint64_t>(json.GetDouble()));
+            }
+            break;
+    }
+}
+
+//-------------------------------------------------------------------------
+
+class Reader
+{
+public:
+    explicit Reader(std::string_view data) noexcept : m_data{data} {}
+
+    template<typename Handler>
+    bool operator()(Handler& handler)
+    {
+        parseValue(handler);
+        if (m_pos != m_data.size()) {
+            fail("trailing data");
+        }
+        return true;
+    }
+
+private:
+    [[noreturn]] void fail(std::string_view reason) const
+    {
+        throw std::invalid_argument{fmt::format(
+            "{}: Error parsing MessagePack data at byte {} of {}: {}",
+            std::source_location::current().function_name(), m_pos, m_data.size(), reason)};
+    }
+
+    const char* take(size_t count)
+    {
+        if (m_data.size() - m_pos < count) {
+            fail("unexpected end of data");
+        }
+        const char* ptr = m_data.data() + m_pos;
+        m_pos += count;
+        return ptr;
+    }
+
+    template<std::unsigned_integral T>
+    T readBigEndian()
+    {
+        T value;
+        std::memcpy(&value, take(sizeof(T)), sizeof(T));
+        if constexpr (std::endian::native == std::endian::little) {
+            value = std::byteswap(value);
+        }
+        return value;
+    }
+
+    template<typename Handler>
+    void parseString(Handler& handler, uint32_t size, bool isKey = false)
+    {
+        const char* str = take(size);
+        if (isKey) {
+            handler.Key(str, size, true);
+        } else {
+            handler.String(str, size, true);
+        }
+    }
+
+    template<typename Handler>
+    void parseArray(Handler& handler, uint32_t size)
+    {
+        handler.StartArray();
+        for (uint32_t i = 0; i < size; ++i) {
+            parseValue(handler);
+        }
+        handler.EndArray(size);
+    }
+
+    template<typename Handler>
+    void parseKey(Handler& handler)
+    {
+        const auto code = readBigEndian<uint8_t>();
+        auto key = [&](std::string_view str) {
+            handler.Key(str.data(), static_cast<rapidjson::SizeType>(str.size()), true);
+        };
+        // Integer keys are stringified, mirroring how Json object keys are represented.
+        if (code <= 0x7f) return key(std::to_string(code));
+        if (code >= 0xe0) return key(std::to_string(static_cast<int8_t>(code)));
+        if ((code & 0xe0) == 0xa0) return parseString(handler, code & 0x1f, true);
+        switch (code) {
+            case 0xd9: return parseString(handler, readBigEndian<uint8_t>(), true);
+            case 0xda: return parseString(handler, readBigEndian<uint16_t>(), true);
+            case 0xdb: return parseString(handler, readBigEndian<uint32_t>(), true);
+            case 0xcc: return key(std::to_string(readBigEndian<uint8_t>()));
+            case 0xcd: return key(std::to_string(readBigEndian<uint16_t>()));
+            case 0xce: return key(std::to_string(readBigEndian<uint32_t>()));
+            case 0xcf: return key(std::to_string(readBigEndian<uint64_t>()));
+            case 0xd0: return key(std::to_string(static_cast<int8_t>(readBigEndian<uint8_t>())));
+            case 0xd1: return key(std::to_string(static_cast<int16_t>(readBigEndian<uint16_t>())));
+            case 0xd2: return key(std::to_string(static_cast<int32_t>(readBigEndian<uint32_t>())));
+            case 0xd3: return key(std::to_string(static_cast<int64_t>(readBigEndian<uint64_t>())));
+            default: fail(fmt::format("unsupported map key type code {:#04x}", code));
+        }
+    }
+
+    template<typename Handler>
+    void parseMap(Handler& handler, uint32_t size)
+    {
+        handler.StartObject();
+        for (uint32_t i = 0; i < size; ++i) {
+            parseKey(handler);
+            parseValue(handler);
+        }
+        handler.EndObject(size);
+    }
+
+    template<typename Handler>
+    void parseValue(Handler& handler)
+    {
+        const auto code = readBigEndian<uint8_t>();
+        if (code <= 0x7f) {
+            handler.Uint(code);
+        } else if (code <= 0x8f) {
+            parseMap(handler, code & 0x0f);
+        } else if (code <= 0x9f) {
+            parseArray(handler, code & 0x0f);
+        } else if (code <= 0xbf) {
+            parseString(handler, code & 0x1f);
+        } else if (code >= 0xe0) {
+            handler.Int(static_cast<int8_t>(code));
+        } else {
+            switch (code) {
+                case 0xc0: handler.Null(); break;
+                case 0xc2: handler.Bool(false); break;
+                case 0xc3: handler.Bool(true); break;
+                case 0xc4: parseString(handler, readBigEndian<uint8_t>()); break;
+                case 0xc5: parseString(handler, readBigEndian<uint16_t>()); break;
+                case 0xc6: parseString(handler, readBigEndian<uint32_t>()); break;
+                case 0xca: handler.Double(std::bit_cast<float>(readBigEndian<uint32_t>())); break;
+                case 0xcb: handler.Double(std::bit_cast<double>(readBigEndian<uint64_t>())); break;
+                case 0xcc: handler.Uint(readBigEndian<uint8_t>()); break;
+                case 0xcd: handler.Uint(readBigEndian<uint16_t>()); break;
+                case 0xce: handler.Uint(readBigEndian<uint32_t>()); break;
+                case 0xcf: handler.Uint64(readBigEndian<uint64_t>()); break;
+                case 0xd0: handler.Int(static_cast<int8_t>(readBigEndian<uint8_t>())); break;
+                case 0xd1: handler.Int(static_cast<int16_t>(readBigEndian<uint16_t>())); break;
+                case 0xd2: handler.Int(static_cast<int32_t>(readBigEndian<uint32_t>())); break;
+                case 0xd3: handler.Int64(static_cast<int64_t>(readBigEndian<uint64_t>())); break;
+                case 0xd9: parseString(handler, readBigEndian<uint8_t>()); break;
+                case 0xda: parseString(handler, readBigEndian<uint16_t>()); break;
+                case 0xdb: parseString(handler, readBigEndian<uint32_t>()); break;
+                case 0xdc: parseArray(handler, readBigEndian<uint16_t>()); break;
+                case 0xdd: parseArray(handler, readBigEndian<uint32_t>()); break;
+                case 0xde: parseMap(handler, readBigEndian<uint16_t>()); break;
+                case 0xdf: parseMap(handler, readBigEndian<uint32_t>()); break;
+                default: fail(fmt::format("unsupported type code {:#04x}", code));
+            }
+        }
+    }
+
+    std::string_view m_data;
+    size_t m_pos{};
+};
+
+//-------------------------------------------------------------------------
+
+}  // namespace
+
+//-------------------------------------------------------------------------
+
+std::string json2msgpack(const rapidjson::Value& json)
+{
+    std::string out;
+    pack(out, json);
+    return out;
+}
+
+//-------------------------------------------------------------------------
+
+rapidjson::Document msgpack2json(std::string_view data)
+{
+    rapidjson::Document json;
+    Reader reader{data};
+    json.Populate(reader);
+    return json;
+}
+
+//-------------------------------------------------------------------------
+
+}  // namespace taosim::msgpack
+
+//-------------------------------------------------------------------------
@@ -0,0 +1,38 @@
+/*
+ * SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+ * SPDX-License-Identifier: MIT
+ */
+#pragma once
+
+#include <rapidjson/document.h>
+
+#include <string>
+#include <string_view>
+
+//-------------------------------------------------------------------------
+
+namespace taosim::msgpack
+{
+
+//-------------------------------------------------------------------------
+
+inline constexpr std::string_view kContentType = "application/msgpack";
+
+/**
+ * Encodes a Json value as MessagePack. Numbers retain the Json value's
+ * representation (unsigned/signed integer or double), so that decoding on
+ * the other end yields the same types as parsing the Json text would.
+ */
+[[nodiscard]] std::string json2msgpack(const rapidjson::Value& json);
+
+/**
+ * Decodes MessagePack data into a Json document. Non-string map keys are
+ * converted to their string representation; extension types are rejected.
+ */
+[[nodiscard]] rapidjson::Document msgpack2json(std::string_view data);
+
+//-------------------------------------------------------------------------
+
+}  // namespace taosim::msgpack
+
+//-------------------------------------------------------------------------
@@ -0,0 +1,101 @@
+/*
+ * SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+ * SPDX-License-Identifier: MIT
+ */
+#include "SeedChannel.hpp"
+
+#include <atomic>
+#include <cstring>
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+//-------------------------------------------------------------------------
+
+namespace taosim::util
+{
+
+//-------------------------------------------------------------------------
+
+SeedChannel::SeedChannel(void* data, size_t size, uint32_t slots) noexcept
+    : m_data{data}, m_size{size}, m_slots{slots}
+{}
+
+//-------------------------------------------------------------------------
+
+SeedChannel::~SeedChannel() noexcept
+{
+    munmap(m_data, m_size);
+}
+
+//-------------------------------------------------------------------------
+
+uint64_t SeedChannel::load(size_t offset) const noexcept
+{
+    auto ptr = reinterpret_cast<uint64_t*>(static_cast<char*>(m_data) + offset);
+    return std::atomic_ref<uint64_t>{*ptr}.load(std::memory_order_acquire);
+}
+
+//-------------------------------------------------------------------------
+
+std::optional<SeedChannel::Record> SeedChannel::latest() const noexcept
+{
+    static constexpr int kAttempts = 8;
+    for (int attempt = 0; attempt < kAttempts; ++attempt) {
+        const uint64_t count = load(16);
+        if (count == 0) {
+            return std::nullopt;
+        }
+        const size_t offset = kHeaderSize + (count % m_slots) * kSlotSize;
+        const uint64_t end = load(offset + 24);
+        Record record{.count = count};
+        std::memcpy(&record.price, static_cast<const char*>(m_data) + offset + 8, sizeof(double));
+        std::memcpy(&record.timestamp, static_cast<const char*>(m_data) + offset + 16, sizeof(int64_t));
+        std::atomic_thread_fence(std::memory_order_acquire);
+        const uint64_t begin = load(offset);
+        if (begin == count && end == count) {
+            return record;
+        }
+    }
+    return std::nullopt;
+}
+
+//-------------------------------------------------------------------------
+
+std::unique_ptr<SeedChannel> SeedChannel::open(const std::filesystem::path& path) noexcept
+{
+    const int fd = ::open(path.c_str(), O_RDONLY);
+    if (fd < 0) {
+        return nullptr;
+    }
+    struct stat info;
+    if (fstat(fd, &info) != 0 || static_cast<size_t>(info.st_size) < kHeaderSize) {
+        close(fd);
+        return nullptr;
+    }
+    const size_t size = static_cast<size_t>(info.st_size);
+    void* data = mmap(nullptr, size, PROT_READ, MAP_SHARED, fd, 0);
+    close(fd);
+    if (data == MAP_FAILED) {
+        return nullptr;
+    }
+    uint32_t version, slots;
+    std::memcpy(&version, static_cast<const char*>(data) + 8, sizeof(uint32_t));
+    std::memcpy(&slots, static_cast<const char*>(data) + 12, sizeof(uint32_t));
+    if (std::memcmp(data, kMagic, sizeof(kMagic)) != 0
+        || version != kVersion
+        || slots == 0
+        || size != kHeaderSize + slots * kSlotSize) {
+        munmap(data, size);
+        return nullptr;
+    }
+    return std::make_unique<SeedChannel>(data, size, slots);
+}
+
+//-------------------------------------------------------------------------
+
+}  // namespace taosim::util
+
+//-------------------------------------------------------------------------
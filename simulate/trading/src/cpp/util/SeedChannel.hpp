@@ -0,0 +1,66 @@
+/*
+ * SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+ * SPDX-License-Identifier: MIT
+ */
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+#include <filesystem>
+#include <memory>
+#include <optional>
+
+//-------------------------------------------------------------------------
+
+namespace taosim::util
+{
+
+//-------------------------------------------------------------------------
+
+/**
+ * Read-only view of the memory-mapped seed ring written by the validator (`taos.im.validator.seed.SeedChannel`).
+ *
+ * The file consists of a 64-byte header holding the magic bytes `TAOSSEED`, the format version,
+ * the number of slots and the count of the latest complete record, followed by slots of
+ * (count, price, timestamp, count). The writer stores the leading count, the values and then the
+ * trailing count, and publishes the record in the header only once the slot is complete; a record
+ * is accepted only if both counts read back match the published count, otherwise the read is retried.
+ */
+class SeedChannel
+{
+public:
+    struct Record
+    {
+        uint64_t count;
+        double price;
+        int64_t timestamp;
+    };
+
+    static constexpr char kMagic[8] = {'T', 'A', 'O', 'S', 'S', 'E', 'E', 'D'};
+    static constexpr uint32_t kVersion = 1;
+    static constexpr size_t kHeaderSize = 64;
+    static constexpr size_t kSlotSize = 32;
+
+    SeedChannel(void* data, size_t size, uint32_t slots) noexcept;
+    ~SeedChannel() noexcept;
+
+    SeedChannel(const SeedChannel&) = delete;
+    SeedChannel& operator=(const SeedChannel&) = delete;
+
+    [[nodiscard]] std::optional<Record> latest() const noexcept;
+
+    [[nodiscard]] static std::unique_ptr<SeedChannel> open(const std::filesystem::path& path) noexcept;
+
+private:
+    [[nodiscard]] uint64_t load(size_t offset) const noexcept;
+
+    void* m_data;
+    size_t m_size;
+    uint32_t m_slots;
+};
+
+//-------------------------------------------------------------------------
+
+}  // namespace taosim::util
+
+//-------------------------------------------------------------------------
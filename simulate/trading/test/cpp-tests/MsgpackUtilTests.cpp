@@ -0,0 +1,72 @@
+/*
+ * SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+ * SPDX-License-Identifier: MIT
+ */
+#include "msgpack_util.hpp"
+
+#include <gmock/gmock.h>
+#include <gtest/gtest.h>
+
+#include <stdexcept>
+
+//-------------------------------------------------------------------------
+
+using namespace testing;
+
+//-------------------------------------------------------------------------
+
+TEST(MsgpackUtilTest, RoundTrip)
+{
+    rapidjson::Document json;
+    json.Parse(R"({
+        "type": "RESPONSES_ERROR_REPORT",
+        "timestamp": 18446744073709551615,
+        "payload": {
+            "bookId": 3,
+            "delta": -123456789012,
+            "price": 100.25,
+            "small": -7,
+            "flag": true,
+            "none": null,
+            "empty": {},
+            "levels": [1, 2.5, "three", [], [false]]
+        }
+    })");
+    ASSERT_FALSE(json.HasParseError());
+
+    const auto decoded = taosim::msgpack::msgpack2json(taosim::msgpack::json2msgpack(json));
+
+    EXPECT_EQ(decoded, json);
+    EXPECT_TRUE(decoded["timestamp"].IsUint64());
+    EXPECT_TRUE(decoded["payload"]["delta"].IsInt64());
+    EXPECT_TRUE(decoded["payload"]["price"].IsDouble());
+}
+
+//-------------------------------------------------------------------------
+
+TEST(MsgpackUtilTest, IntegerKeysAreStringified)
+{
+    // {1: "a", -2: "b"}
+    static constexpr char kData[]{'\x82', '\x01', '\xa1', 'a', '\xfe', '\xa1', 'b'};
+
+    const auto json = taosim::msgpack::msgpack2json({kData, sizeof(kData)});
+
+    ASSERT_TRUE(json.IsObject());
+    EXPECT_THAT(json["1"].GetString(), StrEq("a"));
+    EXPECT_THAT(json["-2"].GetString(), StrEq("b"));
+}
+
+//-------------------------------------------------------------------------
+
+TEST(MsgpackUtilTest, MalformedInputThrows)
+{
+    // Truncated fixarray of two elements.
+    static constexpr char kTruncated[]{'\x92', '\x01'};
+    EXPECT_THROW(taosim::msgpack::msgpack2json({kTruncated, sizeof(kTruncated)}), std::invalid_argument);
+
+    // Trailing bytes after a complete value.
+    static constexpr char kTrailing[]{'\x01', '\x02'};
+    EXPECT_THROW(taosim::msgpack::msgpack2json({kTrailing, sizeof(kTrailing)}), std::invalid_argument);
+}
+
+//-------------------------------------------------------------------------
@@ -191,6 +191,28 @@ def add_miner_args(cls, parser):
         help="Arbitrary user-defined parameters relevant to their specific agent implementation.  Pass in format `--agent.params p_0=x p_1=y ...`"
     )
 
+    parser.add_argument(
+        "--agent.executor",
+        type=str,
+        choices=['thread', 'process'],
+        help="Type of worker pool in which agent handlers are run, so as not to block the axon.  With `process`, each worker process holds its own instance of the agent, and each validator is served by the same worker throughout.",
+        default='thread',
+    )
+
+    parser.add_argument(
+        "--agent.workers",
+        type=int,
+        help="Number of workers in the agent pool.  Requests from the same validator are always handled one at a time and in order; with more than one thread worker, requests from different validators are handled concurrently by the same agent instance.",
+        default=1,
+    )
+
+    parser.add_argument(
+        "--agent.cancel_on_timeout",
+        action="store_true",
+        help="If set, requests which are not handled by the agent within the timeout of the querying validator are answered without a response rather than awaited; requests still queued at the timeout are not passed to the agent.",
+        default=False,
+    )
+
 
 def add_validator_args(cls, parser):
     """Add validator specific arguments to the parser."""
@@ -216,6 +238,48 @@ def add_validator_args(cls, parser):
         default=5,
     )
 
+    parser.add_argument(
+        "--dendrite.max_in_flight",
+        type=int,
+        help="Maximum number of requests to miners in flight at once; further requests wait for a slot before being sent, and their response time is measured from when they are sent.",
+        default=256,
+    )
+
+    parser.add_argument(
+        "--dendrite.connections_per_axon",
+        type=int,
+        help="Maximum number of connections open to each miner axon.",
+        default=2,
+    )
+
+    parser.add_argument(
+        "--dendrite.keepalive_timeout",
+        type=float,
+        help="Time in seconds for which idle connections to miner axons are kept open for reuse in later requests.",
+        default=120.0,
+    )
+
+    parser.add_argument(
+        "--dendrite.breaker.threshold",
+        type=int,
+        help="Number of consecutive timeouts or connection failures after which a miner axon is only probed periodically rather than queried in every request; 0 disables this.",
+        default=3,
+    )
+
+    parser.add_argument(
+        "--dendrite.breaker.cooldown",
+        type=float,
+        help="Time in seconds after which an axon which has reached `dendrite.breaker.threshold` is first probed; doubled after each further failure.",
+        default=30.0,
+    )
+
+    parser.add_argument(
+        "--dendrite.breaker.max_cooldown",
+        type=float,
+        help="Maximum time in seconds between probes of an axon which continues to fail.",
+        default=600.0,
+    )
+
     parser.add_argument(
         "--neuron.num_concurrent_forwards",
         type=int,
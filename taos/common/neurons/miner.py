@@ -24,7 +24,11 @@ import typing
 import asyncio
 import threading
 import argparse
+import statistics
 import traceback
+import multiprocessing
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 import bittensor as bt
 
@@ -35,6 +39,34 @@ from taos.common.config import add_miner_args
 from taos.common.agents import SimulationAgent
 from taos.common.protocol import SimulationStateUpdate, EventNotification
 
+def load_agent(path : str, name : str, uid : int, params : argparse.Namespace) -> SimulationAgent:
+    """
+    Loads the agent class defined at `{path}/{name}.py` and creates an instance of it.
+    """
+    module_spec = importlib.util.spec_from_file_location(name, os.path.join(path, name + '.py'))
+    agent_module = importlib.util.module_from_spec(module_spec)
+    module_spec.loader.exec_module(agent_module)
+    agent_class = getattr(agent_module, name)
+    return agent_class(uid, params)
+
+# Instance of the agent held by each worker process, where agent handlers are run in a process pool.
+worker_agent : SimulationAgent = None
+
+def init_worker(path : str, name : str, uid : int, params : argparse.Namespace) -> None:
+    """
+    Initializes an agent worker process with its own instance of the agent.
+    """
+    global worker_agent
+    worker_agent = load_agent(path, name, uid, params)
+
+def call_agent(agent : SimulationAgent | None, method : str, synapse : bt.Synapse) -> tuple[typing.Any, float, float]:
+    """
+    Calls a handler method of the agent, returning the result together with the times at which handling started and finished.
+    In worker processes, `agent` is None and the instance held by the process is used.
+    """
+    started = time.time()
+    result = getattr(agent or worker_agent, method)(synapse)
+    return result, started, time.time()
 
 class BaseMinerNeuron(BaseNeuron):
     """
@@ -87,11 +119,81 @@ class BaseMinerNeuron(BaseNeuron):
         self.thread: threading.Thread = None
         self.lock = asyncio.Lock()    
         
-        module_spec = importlib.util.spec_from_file_location(self.config.agent.name, os.path.join(self.config.agent.path, self.config.agent.name + '.py'))
-        agent_module = importlib.util.module_from_spec(module_spec)
-        module_spec.loader.exec_module(agent_module)
-        agent_class = getattr(agent_module, self.config.agent.name)
-        self.agent = agent_class(self.uid, self.config.agent.params)
+        self.agent = load_agent(self.config.agent.path, self.config.agent.name, self.uid, self.config.agent.params)
+
+        # Agent handlers are run in a pool of workers so that the axon event loop is not blocked while they execute.
+        # Process workers each hold their own instance of the agent, so each validator is assigned to a single worker to keep its state consistent.
+        if self.config.agent.executor == 'process':
+            self.executors = [ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'), initializer=init_worker,
+                                                  initargs=(self.config.agent.path, self.config.agent.name, self.uid, self.config.agent.params)) for _ in range(self.config.agent.workers)]
+        else:
+            self.executors = [ThreadPoolExecutor(max_workers=self.config.agent.workers, thread_name_prefix='Agent')]
+        self.validator_executors = {}
+        # Requests from each validator are handled one at a time, in order of receipt.
+        self.validator_locks = defaultdict(asyncio.Lock)
+        self.agent_stats = defaultdict(lambda : {'queue_wait' : deque(maxlen=100), 'handle_time' : deque(maxlen=100), 'cancelled' : 0})
+
+    async def dispatch(self, method : str, synapse : bt.Synapse) -> typing.Any:
+        """
+        Runs an agent handler for the synapse in the agent worker pool, after any previous requests from the same validator have been handled.
+
+        Where `agent.cancel_on_timeout` is set, the handler is abandoned if it has not completed within the timeout of the synapse;
+        a request still waiting at that time is not passed to the agent, while one which has started runs to completion before the next request from the validator is handled.
+
+        Args:
+            method (str): Name of the agent method handling the synapse.
+            synapse (bt.Synapse): The synapse to be handled.
+
+        Returns:
+            typing.Any: The result of the agent handler, or None if it was abandoned.
+        """
+        hotkey = synapse.dendrite.hotkey
+        received = time.time()
+        deadline = received + synapse.timeout if self.config.agent.cancel_on_timeout and synapse.timeout else None
+        stats = self.agent_stats[hotkey]
+        lock = self.validator_locks[hotkey]
+        try:
+            await asyncio.wait_for(lock.acquire(), deadline - time.time() if deadline else None)
+        except asyncio.TimeoutError:
+            stats['cancelled'] += 1
+            bt.logging.warning(f"Timed out waiting for previous requests from {hotkey} to be handled - {method} request cancelled.")
+            return None
+        if hotkey not in self.validator_executors:
+            self.validator_executors[hotkey] = self.executors[len(self.validator_executors) % len(self.executors)]
+        loop = asyncio.get_running_loop()
+        try:
+            future = self.validator_executors[hotkey].submit(call_agent, self.agent if self.config.agent.executor == 'thread' else None, method, synapse)
+        except Exception:
+            lock.release()
+            raise
+        # The lock is released only once the handler has finished, even if the result is abandoned.
+        future.add_done_callback(lambda _ : loop.call_soon_threadsafe(lock.release))
+        result = asyncio.wrap_future(future)
+        try:
+            result, started, finished = await asyncio.wait_for(asyncio.shield(result), deadline - time.time() if deadline else None)
+        except asyncio.TimeoutError:
+            stats['cancelled'] += 1
+            if future.cancel():
+                bt.logging.warning(f"{method} request from {hotkey} was not started within timeout of {synapse.timeout}s - request cancelled.")
+            else:
+                bt.logging.warning(f"{method} request from {hotkey} was not handled within timeout of {synapse.timeout}s - result abandoned.")
+                result.add_done_callback(lambda result : result.cancelled() or result.exception())
+            return None
+        stats['queue_wait'].append(started - received)
+        stats['handle_time'].append(finished - started)
+        bt.logging.debug(f"Agent {method} for {hotkey} : Queued {started - received:.4f}s | Handled {finished - started:.4f}s")
+        return result
+
+    def log_agent_stats(self) -> None:
+        """
+        Logs the time spent by requests from each validator waiting for and being handled by the agent.
+        """
+        for hotkey, stats in self.agent_stats.items():
+            if stats['handle_time']:
+                bt.logging.info(f"Agent stats for {hotkey} (last {len(stats['handle_time'])}) : "
+                                f"Queue wait mean {statistics.mean(stats['queue_wait']):.4f}s max {max(stats['queue_wait']):.4f}s | "
+                                f"Handle time mean {statistics.mean(stats['handle_time']):.4f}s max {max(stats['handle_time']):.4f}s | "
+                                f"Cancelled {stats['cancelled']}")
     
     async def forward(
         self, synapse: SimulationStateUpdate
@@ -105,7 +207,7 @@ class BaseMinerNeuron(BaseNeuron):
         Returns:
             protocol.common.SimulationStateUpdate: The synapse object with the 'response' field updated with any instructions generated by the agent.
         """
-        synapse.response = self.agent.handle(synapse)
+        synapse.response = await self.dispatch('handle', synapse)
         return synapse
     
     async def update(
@@ -121,8 +223,7 @@ class BaseMinerNeuron(BaseNeuron):
         Returns:
             protocol.common.EventNotification: The synapse object with the 'acknowledged' field updated to true.
         """
-        synapse = self.agent.process(synapse)
-        return synapse
+        return await self.dispatch('process', synapse) or synapse
     
     def blacklist_forward(
         self, synapse: SimulationStateUpdate
@@ -297,6 +398,7 @@ class BaseMinerNeuron(BaseNeuron):
 
                 # Sync metagraph
                 self.sync()
+                self.log_agent_stats()
                 self.step += 1
                 time.sleep(bt.BLOCKTIME * 10)
 
@@ -356,6 +458,8 @@ class BaseMinerNeuron(BaseNeuron):
                        None if the context was exited without an exception.
         """
         self.stop_run_thread()
+        for executor in self.executors:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def resync_metagraph(self):
         """Resyncs the metagraph and updates the hotkeys and moving averages based on the new metagraph."""
@@ -37,6 +37,7 @@ from multiprocessing import Process, Queue
 
 from taos.common.neurons import BaseNeuron
 from taos.mock import MockDendrite
+from taos.common.utils.dendrite import PooledDendrite
 from taos.common.config import add_validator_args
 
 import taos.common.utils.weights as weight_utils
@@ -62,10 +63,18 @@ class BaseValidatorNeuron(BaseNeuron):
         self.deregistered_uids = []
 
         # Dendrite lets us send messages to other nodes (axons) in the network.
+        dendrite_args = dict(
+            max_in_flight=self.config.dendrite.max_in_flight,
+            connections_per_axon=self.config.dendrite.connections_per_axon,
+            keepalive_timeout=self.config.dendrite.keepalive_timeout,
+            breaker_threshold=self.config.dendrite.breaker.threshold,
+            breaker_cooldown=self.config.dendrite.breaker.cooldown,
+            breaker_max_cooldown=self.config.dendrite.breaker.max_cooldown
+        )
         if self.config.mock:
-            self.dendrite = MockDendrite(wallet=self.wallet)
+            self.dendrite = MockDendrite(wallet=self.wallet, **dendrite_args)
         else:
-            self.dendrite = bt.dendrite(wallet=self.wallet)
+            self.dendrite = PooledDendrite(wallet=self.wallet, **dendrite_args)
         bt.logging.info(f"Dendrite: {self.dendrite}")
 
         # Set up initial scoring weights for validation
@@ -0,0 +1,197 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+import time
+import math
+import asyncio
+import aiohttp
+import bittensor as bt
+from collections import defaultdict
+
+class CircuitBreaker:
+    """
+    Tracks the consecutive timeouts and connection failures of an axon, and suspends queries to the axon once `threshold` have occurred.
+
+    While the breaker is open, a single query is allowed through to probe the axon once the cooldown has elapsed.
+    The cooldown doubles with each further failure up to `max_cooldown`, and a successful probe closes the breaker.
+    A `threshold` of zero disables the breaker.
+    """
+    def __init__(self, threshold : int, cooldown : float, max_cooldown : float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.failures = 0
+        self.retry_at = 0.0
+        self.probing = False
+
+    @property
+    def open(self) -> bool:
+        return self.threshold > 0 and self.failures >= self.threshold
+
+    def allow(self, now : float) -> bool:
+        """
+        Returns whether the axon may be queried, marking the query as a probe if the breaker is open.
+        """
+        if not self.open:
+            return True
+        if self.probing or now < self.retry_at:
+            return False
+        self.probing = True
+        return True
+
+    def record(self, failed : bool | None, now : float) -> None:
+        """
+        Records the outcome of a query allowed by the breaker; `None` indicates that the query was abandoned without an outcome.
+        """
+        self.probing = False
+        if failed is None:
+            return
+        if not failed:
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.open:
+            self.retry_at = now + min(self.cooldown * 2 ** (self.failures - self.threshold), self.max_cooldown)
+
+class PooledDendrite(bt.dendrite):
+    """
+    Dendrite which queries axons over a persistent pool of keep-alive connections, limits the number of requests in flight,
+    and suspends queries to axons which repeatedly time out or cannot be reached.
+
+    The default `bt.dendrite` session allows 100 connections in total, so that when querying more axons the remaining requests wait for a connection
+    while their timeout runs, and closes idle connections after 15 seconds.  Here the number of requests in flight is limited explicitly, with the time
+    taken to respond measured from when the request is sent, and idle connections to each axon are kept open for `keepalive_timeout` so that they are
+    reused in subsequent steps where the axon also keeps the connection alive.
+
+    Queries to axons are gated by a `CircuitBreaker` for each hotkey; queries which are not sent are returned with a 408 status as for a timeout.
+
+    Transport metrics accumulated since they were last read are obtained from `metrics`, and a moving average of the round trip time of successful
+    requests to each hotkey is maintained in `rtt`.
+    """
+    RTT_ALPHA = 0.2
+
+    def __init__(self, wallet, max_in_flight : int = 256, connections_per_axon : int = 2, keepalive_timeout : float = 120.0,
+                 breaker_threshold : int = 3, breaker_cooldown : float = 30.0, breaker_max_cooldown : float = 600.0):
+        super().__init__(wallet)
+        self.max_in_flight = max_in_flight
+        self.connections_per_axon = connections_per_axon
+        self.keepalive_timeout = keepalive_timeout
+        self.limiter = asyncio.Semaphore(max_in_flight)
+        self.breakers = defaultdict(lambda : CircuitBreaker(breaker_threshold, breaker_cooldown, breaker_max_cooldown))
+        self.rtt = {}
+        self.counters = self._counters()
+
+    @staticmethod
+    def _counters() -> dict:
+        return {'connections' : 0, 'reused' : 0, 'connect_time' : 0.0, 'requests' : 0, 'skipped' : 0, 'slot_wait' : 0.0}
+
+    @property
+    async def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_create_start.append(self._on_connection_create_start)
+            trace.on_connection_create_end.append(self._on_connection_create_end)
+            trace.on_connection_reuseconn.append(self._on_connection_reuse)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_in_flight, limit_per_host=self.connections_per_axon, keepalive_timeout=self.keepalive_timeout),
+                trace_configs=[trace]
+            )
+        return self._session
+
+    async def _on_connection_create_start(self, session, context, params) -> None:
+        context.connect_start = time.time()
+
+    async def _on_connection_create_end(self, session, context, params) -> None:
+        self.record_connection(False, time.time() - context.connect_start)
+
+    async def _on_connection_reuse(self, session, context, params) -> None:
+        self.record_connection(True)
+
+    def record_connection(self, reused : bool, connect_time : float = 0.0) -> None:
+        """
+        Records whether a request was sent over a pooled connection, and the time taken to establish the connection if not.
+        """
+        if reused:
+            self.counters['reused'] += 1
+        else:
+            self.counters['connections'] += 1
+            self.counters['connect_time'] += connect_time
+
+    def metrics(self) -> dict[str, float]:
+        """
+        Returns the transport metrics accumulated since the last call:
+
+        - pool_hit_rate: Fraction of requests sent over an existing pooled connection.
+        - connect_time: Average time in seconds taken to establish new connections.
+        - slot_wait: Average time in seconds requests waited for one of the `max_in_flight` slots.
+        - skipped_requests: Number of queries not sent due to an open circuit breaker.
+        - open_circuits: Number of axons for which the circuit breaker is currently open.
+        """
+        counters, self.counters = self.counters, self._counters()
+        acquired = counters['connections'] + counters['reused']
+        return {
+            'pool_hit_rate' : counters['reused'] / acquired if acquired else math.nan,
+            'connect_time' : counters['connect_time'] / counters['connections'] if counters['connections'] else math.nan,
+            'slot_wait' : counters['slot_wait'] / counters['requests'] if counters['requests'] else math.nan,
+            'skipped_requests' : counters['skipped'],
+            'open_circuits' : sum(breaker.open for breaker in list(self.breakers.values()))
+        }
+
+    async def _request(self, target_axon : bt.AxonInfo, request_name : str, synapse : bt.Synapse, timeout : float) -> None:
+        """
+        Sends the request to the axon and fills the synapse from the response.
+        """
+        url = self._get_endpoint_url(target_axon, request_name=request_name)
+        async with (await self.session).post(
+            url=url,
+            headers=synapse.to_headers(),
+            json=synapse.model_dump(),
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            json_response = await response.json()
+            self.process_server_response(response, json_response, synapse)
+
+    async def call(
+        self,
+        target_axon : bt.AxonInfo | bt.axon,
+        synapse : bt.Synapse = bt.Synapse(),
+        timeout : float = 12.0,
+        deserialize : bool = True,
+    ) -> bt.Synapse:
+        """
+        Sends a request to the axon if its circuit breaker allows, once a slot is available, and processes the response.
+        """
+        target_axon = target_axon.info() if isinstance(target_axon, bt.axon) else target_axon
+        request_name = synapse.__class__.__name__
+        synapse = self.preprocess_synapse_for_request(target_axon, synapse, timeout)
+        breaker = self.breakers[target_axon.hotkey]
+        if not breaker.allow(time.time()):
+            self.counters['skipped'] += 1
+            synapse.dendrite.status_code = 408
+            synapse.dendrite.status_message = f"Circuit open : axon not queried after {breaker.failures} consecutive failures"
+            return synapse.deserialize() if deserialize else synapse
+
+        failed = None
+        try:
+            self._log_outgoing_request(synapse)
+            queued_time = time.time()
+            async with self.limiter:
+                start_time = time.time()
+                self.counters['requests'] += 1
+                self.counters['slot_wait'] += start_time - queued_time
+                try:
+                    await self._request(target_axon, request_name, synapse, timeout)
+                    synapse.dendrite.process_time = str(time.time() - start_time)
+                    rtt = self.rtt.get(target_axon.hotkey)
+                    self.rtt[target_axon.hotkey] = synapse.dendrite.process_time if rtt is None else (1 - self.RTT_ALPHA) * rtt + self.RTT_ALPHA * synapse.dendrite.process_time
+                    failed = synapse.is_timeout
+                except Exception as e:
+                    synapse = self.process_error_message(synapse, request_name, e)
+                    failed = isinstance(e, (asyncio.TimeoutError, aiohttp.ClientConnectorError))
+        finally:
+            breaker.record(failed, time.time())
+            self._log_incoming_response(synapse)
+            self.synapse_history.append(bt.Synapse.from_headers(synapse.to_headers()))
+        return synapse.deserialize() if deserialize else synapse
+
+    def __str__(self) -> str:
+        return f"PooledDendrite({self.keypair.ss58_address} | {self.max_in_flight} in flight | {self.connections_per_axon} connections per axon)"
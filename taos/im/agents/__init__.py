@@ -2,15 +2,36 @@
 # SPDX-License-Identifier: MIT
 import bittensor as bt
 from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from threading import Lock, local
 from taos.common.agents import SimulationAgent
-from taos.im.protocol import MarketSimulationStateUpdate, FinanceAgentResponse
+from taos.common.protocol import EventNotification
+from taos.im.protocol import MarketSimulationStateUpdate, FinanceAgentResponse, MarketSimulationConfig
+from taos.im.protocol.models import Account
 from taos.im.protocol.events import *
 
+class ValidatorState:
+    """
+    Agent data derived from the states received from a single validator.
+    """
+    def __init__(self, history_length : int) -> None:
+        self.history = deque(maxlen=history_length)
+        self.accounts = {}
+        self.events = []
+        self.simulation_config = None
+
 # Base class for agents operating in intelligent market simulations
-class FinanceSimulationAgent(SimulationAgent):    
+class FinanceSimulationAgent(SimulationAgent):
+    # Number of previous states retained in the history for each validator.
+    HISTORY_LENGTH = 10
+
     def __init__(self, uid : int, config : object) -> None:
         """
         Initializer method that sets up the agent's unique ID and configuration, and initializes common objects for storing agent data.
+
+        Agent data is held separately for each validator querying the miner, so that states from different validators can be handled concurrently.
+        `accounts`, `events`, `simulation_config` and `history` refer to the data of the validator whose request is being handled in the calling thread.
         
         Args:
             uid (int): The UID of the agent in the subnet.
@@ -19,12 +40,80 @@ class FinanceSimulationAgent(SimulationAgent):
         Returns:
             None
         """
-        self.history = []
-        self.accounts = {}
+        self.validator_states = {}
+        self.validator_states_lock = Lock()
+        self.handling = local()
         super().__init__(uid, config)
 
+    @property
+    def validator(self) -> str | None:
+        """
+        Hotkey of the validator whose request is being handled in the calling thread.
+        """
+        return getattr(self.handling, 'validator', None)
+
+    @property
+    def validator_state(self) -> ValidatorState:
+        """
+        Agent data of the validator whose request is being handled in the calling thread.
+        """
+        state = self.validator_states.get(self.validator)
+        if not state:
+            with self.validator_states_lock:
+                state = self.validator_states.setdefault(self.validator, ValidatorState(self.HISTORY_LENGTH))
+        return state
+
+    @property
+    def history(self) -> deque[MarketSimulationStateUpdate]:
+        return self.validator_state.history
+
+    @history.setter
+    def history(self, history : deque[MarketSimulationStateUpdate]) -> None:
+        self.validator_state.history = history
+
+    @property
+    def accounts(self) -> dict[int, Account]:
+        return self.validator_state.accounts
+
+    @accounts.setter
+    def accounts(self, accounts : dict[int, Account]) -> None:
+        self.validator_state.accounts = accounts
+
+    @property
+    def events(self) -> list[FinanceEvent]:
+        return self.validator_state.events
+
+    @events.setter
+    def events(self, events : list[FinanceEvent]) -> None:
+        self.validator_state.events = events
+
+    @property
+    def simulation_config(self) -> MarketSimulationConfig:
+        return self.validator_state.simulation_config
+
+    @simulation_config.setter
+    def simulation_config(self, simulation_config : MarketSimulationConfig) -> None:
+        self.validator_state.simulation_config = simulation_config
+
+    @contextmanager
+    def handling_validator(self, synapse : bt.Synapse):
+        """
+        Context within which agent data accessed by the calling thread is that of the validator which sent the synapse.
+        """
+        previous = self.validator
+        self.handling.validator = synapse.dendrite.hotkey if synapse.dendrite else None
+        try:
+            yield
+        finally:
+            self.handling.validator = previous
+
     def handle(self, state: MarketSimulationStateUpdate) -> FinanceAgentResponse:
-        return super().handle(state)
+        with self.handling_validator(state):
+            return super().handle(state)
+
+    def process(self, notification : EventNotification) -> EventNotification:
+        with self.handling_validator(notification):
+            return super().process(notification)
 
     def update(self, state : MarketSimulationStateUpdate) -> None:
         """
@@ -37,7 +126,6 @@ class FinanceSimulationAgent(SimulationAgent):
             None
         """
         self.history.append(state)
-        self.history = self.history[-10:]
         self.accounts = state.accounts[self.uid]
         self.events = state.notices[self.uid]
         self.simulation_config = state.config
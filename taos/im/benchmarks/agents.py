@@ -0,0 +1,118 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+"""
+Measures the rate at which a miner agent handles states as the number of validators querying it increases, with the states of each validator
+handled concurrently against the agent data held for that validator, compared with handling all states under a single lock.
+The agent verifies in each response that the accounts and history it sees are those of the validator which sent the state.
+
+The agent waits in `respond` without holding the GIL, as when awaiting inference from a model server or accelerator, so that handling can proceed in parallel across threads;
+computation in `respond` using libraries which release the GIL scales similarly up to the number of available cores.
+
+Usage:
+    python -m taos.im.benchmarks.agents --validators 1 2 4 8 --states 20 --books 20 --work 0.02
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))))
+
+def build(validators : int, states : int, books : int, uid : int, xml : str) -> dict[str, list]:
+    """
+    Constructs the sequence of states sent by each validator, with the account balances of the agent identifying the validator and state.
+    """
+    import bittensor as bt
+    from taos.im.protocol import MarketSimulationStateUpdate
+    from taos.im.protocol.models import MarketSimulationConfig, Book, LevelInfo, Account, Balance
+    config = MarketSimulationConfig.from_xml(ET.parse(xml).getroot())
+    levels = lambda side : [LevelInfo(price=100.0 + side * 0.01 * (i + 1), quantity=1.0, orders=None) for i in range(config.book_levels)]
+    sequences = {}
+    for validator in range(validators):
+        hotkey = f"validator-{validator}"
+        sequences[hotkey] = [MarketSimulationStateUpdate(
+            timestamp=step * config.publish_interval,
+            config=config,
+            books={book_id : Book(id=book_id, bids=levels(-1), asks=levels(1), events=[]) for book_id in range(books)},
+            accounts={uid : {book_id : Account(agent_id=uid, book_id=book_id,
+                                               base_balance=Balance(currency='BASE', total=float(validator), free=float(validator), reserved=0.0),
+                                               quote_balance=Balance(currency='QUOTE', total=float(step), free=float(step), reserved=0.0),
+                                               fees=None) for book_id in range(books)}},
+            notices={uid : []},
+            dendrite=bt.TerminalInfo(hotkey=hotkey)
+        ) for step in range(states)]
+    return sequences
+
+def agent(uid : int, work : float):
+    """
+    Creates an agent whose response takes `work` seconds, and which records any state it sees not belonging to the validator being handled.
+    """
+    from taos.im.agents import FinanceSimulationAgent
+    from taos.im.protocol import FinanceAgentResponse
+
+    class BenchmarkAgent(FinanceSimulationAgent):
+        def initialize(self):
+            self.errors = 0
+
+        def update(self, state):
+            # Skips reporting of the state by the base class, so that only the handling of agent data is measured.
+            self.history.append(state)
+            self.accounts = state.accounts[self.uid]
+            self.simulation_config = state.config
+
+        def respond(self, state):
+            validator = int(self.validator.split('-')[1])
+            if any(account.base_balance.total != validator or account.quote_balance.total != state.timestamp // state.config.publish_interval for account in self.accounts.values()) \
+                or any(previous.dendrite.hotkey != self.validator for previous in self.history):
+                self.errors += 1
+            time.sleep(work)
+            return FinanceAgentResponse(agent_id=self.uid)
+
+        def report(self, state, response):
+            pass
+
+    return BenchmarkAgent(uid, None)
+
+def run(sequences : dict[str, list], uid : int, work : float, shared : bool) -> tuple[float, int]:
+    """
+    Handles the states of all validators, each validator sending its next state once the previous has been handled, returning the states handled per second and the number of isolation errors.
+    """
+    instance = agent(uid, work)
+    lock = threading.Lock()
+    def serve(states : list) -> None:
+        for state in states:
+            if shared:
+                with lock:
+                    instance.handle(state)
+            else:
+                instance.handle(state)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(sequences)) as executor:
+        list(executor.map(serve, sequences.values()))
+    return sum(len(states) for states in sequences.values()) / (time.perf_counter() - start), instance.errors
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--validators", type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument("--states", type=int, default=20, help="Number of states sent by each validator.")
+    parser.add_argument("--books", type=int, default=20)
+    parser.add_argument("--work", type=float, default=0.02, help="Time in seconds taken to generate each response.")
+    parser.add_argument("--xml", type=str, default=os.path.join(REPO_ROOT, 'simulate', 'trading', 'run', 'config', 'simulation_0.xml'))
+    args = parser.parse_args()
+    sys.argv = sys.argv[:1]
+
+    uid = 0
+    baseline = None
+    failed = False
+    for validators in args.validators:
+        sequences = build(validators, args.states, args.books, uid, args.xml)
+        shared, shared_errors = run(sequences, uid, args.work, shared=True)
+        isolated, isolated_errors = run(sequences, uid, args.work, shared=False)
+        baseline = baseline or isolated
+        failed |= bool(shared_errors or isolated_errors)
+        print(f"{validators:>3} validators : single lock {shared:8.1f} states/s | per-validator {isolated:8.1f} states/s "
+              f"(x{isolated / shared:.2f} vs single lock, x{isolated / baseline:.2f} vs 1 validator) | isolation errors {shared_errors + isolated_errors}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+"""
+Compares the time and memory taken by miners to decompress a state update synapse when decoding directly into the `msgspec.Struct` mirrors of the state models,
+against decoding to builtin objects which are then validated into the pydantic models, and verifies that both produce the same state.
+
+Memory is reported as the peak allocated while decoding and the size retained by the decoded state, as measured by `tracemalloc`.
+
+Usage:
+    python -m taos.im.benchmarks.decompress --agents 256 --books 40 --levels 21 --notices 20 --repeats 5
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))))
+
+def build(agents : int, books : int, levels : int, notices : int, seed : int):
+    """
+    Constructs a synthetic state update containing orderbooks with resting orders and events, and accounts and a mix of notice events for each agent.
+    """
+    from taos.im.protocol import MarketSimulationStateUpdate, structs
+    from taos.im.protocol.models import MarketSimulationConfig
+    rng = random.Random(seed)
+    order = lambda i, price : structs.Order(id=i, client_id=None, timestamp=rng.randint(0, 10**12), quantity=round(rng.uniform(0.1, 10.0), 4), side=rng.randint(0, 1), order_type='limit', price=price)
+    level = lambda price : structs.LevelInfo(price=price, quantity=round(rng.uniform(0.1, 100.0), 4), orders=[order(rng.randint(0, 10**9), price) for _ in range(rng.randint(1, 3))])
+    def event(i):
+        match rng.randint(0, 2):
+            case 0:
+                return order(i, rng.choice([None, 100.0]))
+            case 1:
+                return structs.TradeInfo(id=i, side=rng.randint(0, 1), timestamp=i, taker_id=i, taker_agent_id=rng.randint(0, agents - 1), maker_id=i + 1,
+                                         maker_agent_id=rng.randint(0, agents - 1), quantity=1.0, price=100.0, maker_fee=0.001, taker_fee=0.002)
+            case 2:
+                return structs.Cancellation(orderId=i, quantity=rng.choice([None, 0.5]))
+    state_books = {book_id : structs.Book(id=book_id,
+                                          bids=[level(round(100.0 - 0.01 * i, 2)) for i in range(levels)],
+                                          asks=[level(round(100.01 + 0.01 * i, 2)) for i in range(levels)],
+                                          events=[event(i) for i in range(30)]) for book_id in range(books)}
+    balance = lambda currency : structs.Balance(currency=currency, total=rng.uniform(0, 1000), free=rng.uniform(0, 500), reserved=rng.uniform(0, 500))
+    accounts = {agent_id : {book_id : structs.Account(agent_id=agent_id, book_id=book_id, base_balance=balance('BASE'), quote_balance=balance('QUOTE'),
+                                                       orders=[order(i, 99.0) for i in range(rng.randint(0, 3))],
+                                                       fees=structs.Fees(volume_traded=rng.uniform(0, 1000), maker_fee_rate=0.001, taker_fee_rate=0.002))
+                            for book_id in range(books)} for agent_id in range(agents)}
+    def notice(agent_id, timestamp):
+        book_id = rng.randint(0, books - 1)
+        match rng.randint(0, 4):
+            case 0:
+                return structs.LimitOrderPlacementEvent(timestamp=timestamp, agentId=agent_id, bookId=book_id, orderId=timestamp, clientOrderId=None, side=0, price=100.0, quantity=1.0, success=True, message='Placed')
+            case 1:
+                return structs.MarketOrderPlacementErrorEvent(timestamp=timestamp, agentId=agent_id, bookId=book_id, orderId=None, clientOrderId=None, side=1, quantity=1.0, success=False, message='Rejected')
+            case 2:
+                return structs.TradeEvent(timestamp=timestamp, agentId=agent_id, bookId=book_id, tradeId=timestamp, clientOrderId=None, takerAgentId=agent_id, takerOrderId=1,
+                                          makerAgentId=0, makerOrderId=2, side=0, price=100.0, quantity=1.0, makerFee=0.001, takerFee=0.002)
+            case 3:
+                return structs.OrderCancellationsEvent(timestamp=timestamp, agentId=agent_id, bookId=book_id, cancellations=[
+                    structs.OrderCancellationEvent(timestamp=timestamp, bookId=book_id, orderId=i, quantity=None, success=True, message='Cancelled') for i in range(3)])
+            case 4:
+                return structs.ResetAgentsEvent(timestamp=timestamp, agentId=agent_id, resets=[
+                    structs.ResetAgentEvent(type='RESPONSE_DISTRIBUTED_RESET_AGENT', timestamp=timestamp, agentId=agent_id, success=True, message='Reset')])
+    state_notices = {agent_id : [notice(agent_id, timestamp) for timestamp in range(notices)] for agent_id in range(agents)}
+    config = MarketSimulationConfig.from_xml(ET.parse(os.path.join(REPO_ROOT, 'simulate', 'trading', 'run', 'config', 'simulation_0.xml')).getroot())
+    return MarketSimulationStateUpdate.model_construct(name='MarketSimulationStateUpdate', timestamp=1, config=config, books=state_books, accounts=accounts, notices=state_notices).compress()
+
+def validated(synapse):
+    """
+    Decompresses the synapse by decoding the state fields to builtin objects which are validated into the pydantic models on assignment.
+    """
+    from taos.im.protocol import _decompress_field
+    for name in ['books', 'accounts', 'notices', 'config']:
+        setattr(synapse, name, _decompress_field(getattr(synapse, name)))
+    synapse.compressed = False
+    return synapse
+
+def typed(synapse):
+    return synapse.decompress()
+
+def measure(compressed, decompress, repeats : int) -> tuple[float, int, int, object]:
+    """
+    Returns the best time taken to decompress the synapse, the peak and retained memory allocated in doing so, and the decompressed synapse.
+    """
+    times = []
+    for _ in range(repeats):
+        synapse = compressed.model_copy()
+        start = time.perf_counter()
+        decompress(synapse)
+        times.append(time.perf_counter() - start)
+    synapse = compressed.model_copy()
+    tracemalloc.start()
+    decompress(synapse)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak, retained, synapse
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agents", type=int, default=256)
+    parser.add_argument("--books", type=int, default=40)
+    parser.add_argument("--levels", type=int, default=21)
+    parser.add_argument("--notices", type=int, default=20, help="Number of notice events for each agent.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sys.argv = sys.argv[:1]
+
+    compressed = build(args.agents, args.books, args.levels, args.notices, args.seed)
+    results = {}
+    for name, decompress in [('validated models', validated), ('typed structs', typed)]:
+        results[name] = measure(compressed, decompress, args.repeats)
+        elapsed, peak, retained, _ = results[name]
+        print(f"{name:<18} : {elapsed:.4f}s | peak {peak / 2**20:.1f}MB | retained {retained / 2**20:.1f}MB")
+    models = results['validated models'][3]
+    structs = results['typed structs'][3].as_models()
+    identical = models.books == structs.books and models.accounts == structs.accounts and models.notices == structs.notices and models.config == structs.config
+    print(f"Speedup : x{results['validated models'][0] / results['typed structs'][0]:.2f} | Identical : {identical}")
+    sys.exit(0 if identical else 1)
@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+"""
+Load tests the validator dendrite transport against the simulated network of `taos.mock.MockDendrite`, querying all axons in each step as the validator does.
+
+Reports for each configuration the average and maximum time taken to complete the queries of a step, the number of requests sent and timed out,
+and the transport metrics of `taos.common.utils.dendrite.PooledDendrite`.  Configurations are run with and without circuit breaking, and with
+a limit on requests in flight below the number of axons.
+
+Usage:
+    python -m taos.im.benchmarks.dendrite --axons 256 --steps 20 --timeout 1.5 --unresponsive 0.1 --max_in_flight 64
+"""
+import sys
+import time
+import asyncio
+import argparse
+
+async def run(dendrite, axons : list, steps : int, timeout : float) -> dict:
+    """
+    Queries all axons in each of `steps` steps, returning the step times and request outcomes together with the transport metrics.
+    """
+    from taos.im.protocol import MarketSimulationStateUpdate
+    step_times = []
+    sent = 0
+    timeouts = 0
+    for _ in range(steps):
+        start = time.time()
+        skipped = dendrite.counters['skipped']
+        responses = await asyncio.gather(*[dendrite.call(target_axon=axon, synapse=MarketSimulationStateUpdate(timestamp=0, books={}, accounts={}), timeout=timeout, deserialize=False) for axon in axons])
+        step_times.append(time.time() - start)
+        sent += len(responses) - (dendrite.counters['skipped'] - skipped)
+        timeouts += sum(response.is_timeout for response in responses)
+    return {'step_times' : step_times, 'sent' : sent, 'timeouts' : timeouts} | dendrite.metrics()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--axons", type=int, default=256)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=1.5)
+    parser.add_argument("--unresponsive", type=float, default=0.1, help="Fraction of axons which never respond.")
+    parser.add_argument("--max_in_flight", type=int, default=64, help="Limit on requests in flight for the limited configuration.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sys.argv = sys.argv[:1]
+
+    import bittensor as bt
+    from taos.mock import MockDendrite
+    keypairs = [bt.Keypair.create_from_mnemonic(bt.Keypair.generate_mnemonic()) for _ in range(args.axons + 1)]
+    axons = [bt.AxonInfo(version=1, ip='127.0.0.1', port=8091 + uid, ip_type=4, hotkey=keypair.ss58_address, coldkey=keypair.ss58_address) for uid, keypair in enumerate(keypairs[1:])]
+    configurations = {
+        'no breaker' : dict(breaker_threshold=0),
+        'breaker' : dict(),
+        f'breaker, {args.max_in_flight} in flight' : dict(max_in_flight=args.max_in_flight),
+    }
+    for name, kwargs in configurations.items():
+        dendrite = MockDendrite(wallet=keypairs[0], unresponsive=args.unresponsive, seed=args.seed, **kwargs)
+        result = asyncio.run(run(dendrite, axons, args.steps, args.timeout))
+        print(f"{name:<24} : step {sum(result['step_times']) / len(result['step_times']):.4f}s (max {max(result['step_times']):.4f}s) | "
+              f"sent {result['sent']} | timeouts {result['timeouts']} | skipped {result['skipped_requests']} | open circuits {result['open_circuits']} | "
+              f"pool hit rate {result['pool_hit_rate']:.3f} | connect {result['connect_time']:.4f}s | slot wait {result['slot_wait']:.4f}s")
@@ -0,0 +1,143 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+"""
+Compares the validator time taken to validate the responses of all miners in a step and encode the response body returned to the simulator,
+when parsing responses with the bounded parser in `taos.im.protocol.parser`, validating the instructions of all miners together as columns of a
+`taos.im.utils.instructions.InstructionBatch` and encoding the body directly from the batch, against validating each response into the pydantic `FinanceAgentResponse`,
+checking its instructions one at a time and returning the serialized `SimulatorResponseBatch` to be encoded by FastAPI.
+Verifies that both produce the same response body.
+
+Scenarios are run for miners submitting a typical number of instructions on each book, for miners submitting the maximum number accepted on each book,
+for the latter with one hostile miner submitting the maximum number of instructions allowed in a response, and for miners submitting several times the maximum
+on each book of whom half follow these with an instruction for another agent.  A fraction of miners are at their volume cap on some books.
+
+Usage:
+    python -m taos.im.benchmarks.responses --miners 256 --books 20 --max_instructions_per_book 20 --typical 5 --hostile 200000 --repeats 3
+"""
+import sys
+import time
+import random
+import argparse
+
+def build(uid : int, books : int, count : int, seed : int, foreign : bool = False) -> str:
+    """
+    Constructs a compressed response containing `count` instructions of all types distributed randomly over the books,
+    followed by an order placement for another agent if `foreign` is set.
+    """
+    from taos.im.protocol import FinanceAgentResponse, _compress_field
+    from taos.im.protocol.models import OrderDirection
+    rng = random.Random(seed)
+    response = FinanceAgentResponse(agent_id=uid)
+    for i in range(count):
+        book_id = rng.randint(0, books - 1)
+        match rng.randint(0, 2):
+            case 0:
+                response.market_order(book_id, OrderDirection.BUY, round(rng.uniform(0.1, 10.0), 4), clientOrderId=i)
+            case 1:
+                response.limit_order(book_id, OrderDirection.SELL, round(rng.uniform(0.1, 10.0), 4), round(rng.uniform(99.0, 101.0), 2), clientOrderId=i)
+            case 2:
+                response.cancel_orders(book_id, [rng.randint(0, 10**9) for _ in range(rng.randint(1, 5))])
+    if foreign:
+        response.market_order(0, OrderDirection.BUY, 1.0)
+        response.instructions[-1].agentId = uid + 1
+    return _compress_field(response.model_dump(mode='json'))
+
+def looped(responses : dict[int, str], volumes, volume_cap : float, books : int, max_instructions_per_book : int):
+    """
+    Validates each response into the pydantic models, and checks the agent ID, volume cap and per-book limit for each instruction in turn.
+    """
+    from taos.im.protocol import FinanceAgentResponse, _decompress_field
+    from taos.im.protocol.simulator import SimulatorResponseBatch
+    validated = []
+    for uid, data in responses.items():
+        response = FinanceAgentResponse.model_validate(_decompress_field(data))
+        if response.agent_id != uid:
+            continue
+        valid_instructions = []
+        for instruction in response.instructions:
+            if instruction.agentId != uid or instruction.type == 'RESET_AGENT':
+                valid_instructions = []
+                break
+            if volumes[uid, instruction.bookId] >= volume_cap and instruction.type != "CANCEL_ORDERS":
+                continue
+            valid_instructions.append(instruction)
+        instructions_per_book = {}
+        response.instructions = []
+        for instruction in valid_instructions:
+            instructions_per_book[instruction.bookId] = instructions_per_book.get(instruction.bookId, 0) + 1
+            if instructions_per_book[instruction.bookId] <= max_instructions_per_book:
+                response.instructions.append(instruction)
+        validated.append(response)
+    return SimulatorResponseBatch(validated)
+
+def looped_encode(batch) -> bytes:
+    """
+    Serializes the response batch and encodes it as FastAPI encodes a dictionary returned from a route.
+    """
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    return JSONResponse(content=jsonable_encoder(batch.serialize())).body
+
+def vectorized(responses : dict[int, str], volumes, volume_cap : float, books : int, max_instructions_per_book : int):
+    """
+    Parses each response with the bounded parser, and validates the instructions of all miners together.
+    """
+    import numpy as np
+    from taos.im.protocol.parser import parse_response
+    from taos.im.utils.instructions import InstructionBatch
+    capped = volumes >= volume_cap
+    parsed = {uid : parse_response(data, uid, books, max_instructions_per_book, set(np.flatnonzero(capped[uid]).tolist())) for uid, data in responses.items()}
+    batch, _, _ = InstructionBatch.from_responses(parsed).validate(volumes, volume_cap, max_instructions_per_book)
+    return batch
+
+def vectorized_encode(batch) -> bytes:
+    from taos.im.protocol.simulator import SimulatorResponseBatch
+    return SimulatorResponseBatch.encode_instructions(batch, 'json')
+
+def measure(validate, encode, responses : dict[int, str], volumes, volume_cap : float, books : int, max_instructions_per_book : int, repeats : int) -> tuple[float, float, bytes]:
+    """
+    Returns the best times taken to validate the responses and to encode the response body, and the encoded body.
+    """
+    validate_times = []
+    encode_times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        batch = validate(responses, volumes, volume_cap, books, max_instructions_per_book)
+        validate_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        body = encode(batch)
+        encode_times.append(time.perf_counter() - start)
+    return min(validate_times), min(encode_times), body
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--miners", type=int, default=256)
+    parser.add_argument("--books", type=int, default=20)
+    parser.add_argument("--max_instructions_per_book", type=int, default=20)
+    parser.add_argument("--typical", type=int, default=5, help="Number of instructions submitted on each book by miners in the typical scenario.")
+    parser.add_argument("--hostile", type=int, default=200000, help="Number of instructions submitted by the hostile miner.")
+    parser.add_argument("--capped", type=float, default=0.05, help="Fraction of miner books on which the volume cap has been reached.")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sys.argv = sys.argv[:1]
+
+    import numpy as np
+    import msgspec
+    volume_cap = 1.0
+    volumes = (np.random.default_rng(args.seed).random((args.miners, args.books)) < args.capped).astype(np.float64)
+    per_book = {'typical' : args.typical, 'maximum' : args.max_instructions_per_book, 'foreign' : 5 * args.max_instructions_per_book}
+    identical = True
+    for name in ['typical', 'maximum', 'hostile', 'foreign']:
+        count = per_book.get(name, args.max_instructions_per_book) * args.books
+        responses = {uid : build(uid, args.books, args.hostile if name == 'hostile' and uid == 0 else count, args.seed + uid, name == 'foreign' and uid % 2 == 1) for uid in range(args.miners)}
+        looped_time, looped_encode_time, looped_body = measure(looped, looped_encode, responses, volumes, volume_cap, args.books, args.max_instructions_per_book, args.repeats)
+        vectorized_time, vectorized_encode_time, vectorized_body = measure(vectorized, vectorized_encode, responses, volumes, volume_cap, args.books, args.max_instructions_per_book, args.repeats)
+        body = msgspec.json.decode(vectorized_body)
+        same = msgspec.json.decode(looped_body) == body
+        identical &= same
+        print(f"{name:<8} ({sum(len(data) for data in responses.values())} bytes) : "
+              f"validate per-instruction {looped_time:.4f}s | vectorized {vectorized_time:.4f}s (x{looped_time / vectorized_time:.2f}) ; "
+              f"encode serialized {looped_encode_time:.4f}s | direct {vectorized_encode_time:.4f}s (x{looped_encode_time / vectorized_encode_time:.2f}) ; "
+              f"accepted {len(body['responses'])} | body {len(vectorized_body)} bytes | identical {same}")
+    sys.exit(0 if identical else 1)
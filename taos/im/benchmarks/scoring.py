@@ -0,0 +1,123 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+"""
+Compares the per-UID scoring implementation with the vectorized scoring over the inventory history ring buffer, and verifies that both produce identical results.
+
+Usage:
+    python -m taos.im.benchmarks.scoring --uids 256 --books 20 --lookback 720
+"""
+import sys
+import time
+import copy
+import argparse
+import numpy as np
+import torch
+from types import SimpleNamespace
+
+def build(uids : int, books : int, lookback : int, seed : int) -> SimpleNamespace:
+    """
+    Constructs a minimal validator-like object holding synthetic inventory and trading volume histories.
+    Some UIDs are given partial histories, a simulation changeover or no history at all so that all scoring paths are exercised.
+    """
+    from taos.im.utils.inventory import InventoryHistory
+    from taos.im.utils.volume import TradeVolumes
+    rng = np.random.default_rng(seed)
+    publish_interval = 1_000_000_000
+    sampling_interval = 600_000_000_000
+    config = SimpleNamespace(scoring=SimpleNamespace(
+        sharpe=SimpleNamespace(lookback=lookback, normalization_min=-10.0, normalization_max=10.0),
+        activity=SimpleNamespace(capital_turnover_cap=10.0)
+    ))
+    simulation = SimpleNamespace(book_count=books, miner_wealth=100000.0, volumeDecimals=4, publish_interval=publish_interval)
+    history = InventoryHistory(uids, books, lookback)
+    timestamps = np.arange(1, lookback + 1) * publish_interval
+    for uid in range(uids):
+        count = [0, 1, 2, lookback // 3, lookback][uid % 5]
+        uid_timestamps = timestamps.copy()
+        if uid % 7 == 3:
+            # Simulation changeover part way through the history
+            uid_timestamps[lookback // 2:] -= timestamps[lookback // 2]
+        values = np.cumsum(rng.normal(0.0, rng.uniform(1.0, 100.0), (lookback, books)), axis=0)
+        if uid % 11 == 5:
+            values[:, :books // 2] = 0.0
+        for timestamp, book_values in zip(uid_timestamps[-count:].tolist() if count else [], values[-count:].tolist() if count else []):
+            history.append(uid, timestamp, book_values)
+    simulation_timestamp = int(timestamps[-1])
+    trade_volumes = TradeVolumes(uids, books, sampling_interval, 86400_000_000_000, simulation.volumeDecimals)
+    for sampled_timestamp in range(sampling_interval, simulation_timestamp + sampling_interval, sampling_interval):
+        trade_volumes.advance(sampled_timestamp)
+        for uid in range(1, uids, 3):
+            for book_id in np.flatnonzero(rng.integers(0, 2, books)).tolist():
+                trade_volumes.record(uid, book_id, 'total', float(rng.exponential(10000.0)))
+    return SimpleNamespace(
+        config=config,
+        simulation=simulation,
+        simulation_timestamp=simulation_timestamp,
+        inventory_history=history,
+        trade_volumes=trade_volumes,
+        activity_factors={uid : {book_id : float(rng.uniform(0.0, 2.0)) for book_id in range(books)} for uid in range(uids)},
+        sharpe_values={uid : {'books' : {book_id : 0.0 for book_id in range(books)}, 'total' : 0.0, 'average' : 0.0, 'median' : 0.0,
+                              'normalized_average' : 0.0, 'normalized_total' : 0.0, 'normalized_median' : 0.0} for uid in range(uids)},
+        reward_weights={'sharpe' : 1.0},
+        scores=torch.tensor(rng.uniform(0.0, 1.0, uids), dtype=torch.float64),
+        step=0
+    )
+
+def per_uid(validator : SimpleNamespace, uids : np.ndarray, histories : dict) -> np.ndarray:
+    """Scores each UID in turn using the reference implementation, falling back to the existing score where the UID cannot be scored."""
+    from taos.im.validator.reward import score_inventory_values
+    scores = []
+    for uid in uids.tolist():
+        try:
+            scores.append(score_inventory_values(validator, uid, histories[uid]))
+        except Exception:
+            scores.append(validator.scores[uid].item())
+    return np.array(scores, dtype=np.float64)
+
+def vectorized(validator : SimpleNamespace, uids : np.ndarray) -> np.ndarray:
+    from taos.im.validator.reward import score_inventory_histories
+    return score_inventory_histories(validator, uids)
+
+def identical(a, b) -> bool:
+    return np.array_equal(np.asarray(a, dtype=np.float64).view(np.int64), np.asarray(b, dtype=np.float64).view(np.int64))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uids", type=int, default=256)
+    parser.add_argument("--books", type=int, default=20)
+    parser.add_argument("--lookback", type=int, default=720)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sys.argv = sys.argv[:1]
+
+    base = build(args.uids, args.books, args.lookback, args.seed)
+    uids = np.arange(args.uids)
+    # The per-UID implementation operates on the mapping of timestamp to book inventory values previously maintained for each UID
+    histories = {uid : base.inventory_history.to_dict(uid) for uid in uids.tolist()}
+    timings = {}
+    results = {}
+    for name, method in [('per-uid', lambda validator, uids : per_uid(validator, uids, histories)), ('vectorized', vectorized)]:
+        timings[name] = []
+        for _ in range(args.repeats):
+            validator = copy.deepcopy(base)
+            start = time.perf_counter()
+            scores = method(validator, uids)
+            timings[name].append(time.perf_counter() - start)
+        results[name] = (scores, validator)
+
+    (reference, reference_validator), (scores, validator) = results['per-uid'], results['vectorized']
+    mismatches = [
+        uid for uid in uids.tolist() if not (
+            identical(reference[uid], scores[uid])
+            and identical(list(reference_validator.activity_factors[uid].values()), list(validator.activity_factors[uid].values()))
+            and identical(list(reference_validator.sharpe_values[uid]['books'].values()), list(validator.sharpe_values[uid]['books'].values()))
+            and all(identical(reference_validator.sharpe_values[uid][key], validator.sharpe_values[uid][key]) for key in reference_validator.sharpe_values[uid] if key != 'books')
+        )
+    ]
+    print(f"{args.uids} UIDs x {args.books} books x {args.lookback} lookback")
+    for name, times in timings.items():
+        print(f"{name:>12} : best {min(times)*1000:.1f}ms | mean {np.mean(times)*1000:.1f}ms")
+    print(f"Speedup : {min(timings['per-uid']) / min(timings['vectorized']):.1f}x")
+    print(f"Results identical : {len(mismatches) == 0}" + (f" (mismatched UIDs : {mismatches})" if mismatches else ""))
+    sys.exit(1 if mismatches else 0)
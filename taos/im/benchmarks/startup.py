@@ -0,0 +1,107 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+"""
+Measures the cold start time of the validator and miner entry points, and reports the imports contributing most to it.
+
+For the validator, the time to be ready to handle the first `/orderbook` request is taken as the time to import the validator together with the modules
+loaded by its entry point, plus the time for a newly started reward process to answer its first request; the reward process is started with
+the validator script as its main module, as in deployment, so that the imports repeated by the spawned process are included.
+Each measurement is taken in a fresh interpreter; the best of the repeats is compared against the budget.
+
+Usage:
+    python -m taos.im.benchmarks.startup --repeats 3 --budget 6.0 --top 15
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+ENTRY_POINTS = {
+    'validator' : ['taos.im.neurons.validator', 'taos.im.validator.update', 'taos.im.validator.forward', 'taos.im.validator.report', 'taos.im.validator.reward'],
+    'miner' : ['taos.im.neurons.miner']
+}
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))))
+
+IMPORT_SCRIPT = """
+import sys, time, json
+sys.argv = sys.argv[:1]
+start = time.perf_counter()
+for module in {modules!r}:
+    __import__(module)
+print(json.dumps({{'time' : time.perf_counter() - start}}))
+"""
+
+REWARD_SCRIPT = """
+import sys, time, json
+sys.argv = sys.argv[:1]
+# The reward process is spawned, and so imports the main module of the parent; this is the validator script in deployment.
+sys.modules['__main__'].__file__ = {validator!r}
+import xml.etree.ElementTree as ET
+from types import SimpleNamespace
+from taos.im.protocol.models import MarketSimulationConfig
+from taos.im.utils.inventory import InventoryHistory
+from taos.im.utils.volume import TradeVolumes
+from taos.im.validator.reward import RewardWorker
+if __name__ == '__main__':
+    simulation = MarketSimulationConfig.from_xml(ET.parse({xml!r}).getroot())
+    start = time.perf_counter()
+    worker = RewardWorker(SimpleNamespace(), simulation, {{
+        'reward_weights' : {{'sharpe' : 1.0}},
+        'inventory_history' : InventoryHistory(256, simulation.book_count, 720),
+        'trade_volumes' : TradeVolumes(256, simulation.book_count, 600_000_000_000, 86400_000_000_000, simulation.volumeDecimals),
+        'activity_factors' : {{}},
+        'sharpe_values' : {{}}
+    }})
+    worker.request('state').result()
+    print(json.dumps({{'time' : time.perf_counter() - start}}))
+    worker.stop()
+"""
+
+def run(script : str, importtime : bool = False) -> tuple[float, str]:
+    """Executes a script in a fresh interpreter from the repository root, returning the time it reports and its standard error output."""
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', script]
+    result = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True, env=os.environ | {'PYTHONPATH' : REPO_ROOT})
+    lines = [line for line in result.stdout.splitlines() if line.startswith('{')]
+    if result.returncode != 0 or not lines:
+        raise Exception(f"Startup measurement failed : {result.stderr[-2000:]}")
+    return json.loads(lines[-1])['time'], result.stderr
+
+def top_imports(importtime : str, count : int) -> list[tuple[str, float, float]]:
+    """
+    Parses the output of `python -X importtime`, returning the modules imported directly by the measured script (or by the packages it imports)
+    having the highest cumulative import times, with their self and cumulative times in seconds.
+    """
+    imports = []
+    for line in importtime.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_time, cumulative, module = line[len('import time:'):].split('|')
+        depth = (len(module) - len(module.lstrip())) // 2
+        if depth <= 2:
+            imports.append((module.strip(), int(self_time) / 1e6, int(cumulative) / 1e6))
+    return sorted(imports, key=lambda entry : -entry[2])[:count]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget", type=float, default=None, help="Maximum time in seconds for the validator to be ready to handle the first state.")
+    parser.add_argument("--xml", type=str, default=os.path.join(REPO_ROOT, 'simulate', 'trading', 'run', 'config', 'simulation_0.xml'))
+    args = parser.parse_args()
+
+    results = {}
+    for name, modules in ENTRY_POINTS.items():
+        script = IMPORT_SCRIPT.format(modules=modules)
+        results[name] = min(run(script)[0] for _ in range(args.repeats))
+        _, importtime = run(script, importtime=True)
+        print(f"{name} imports : best {results[name]:.3f}s")
+        for module, self_time, cumulative in top_imports(importtime, args.top):
+            print(f"    {module:<48} self {self_time:.3f}s | cumulative {cumulative:.3f}s")
+    script = REWARD_SCRIPT.format(validator=os.path.join(REPO_ROOT, 'taos', 'im', 'neurons', 'validator.py'), xml=args.xml)
+    results['reward'] = min(run(script)[0] for _ in range(args.repeats))
+    print(f"reward process ready : best {results['reward']:.3f}s")
+    ready = results['validator'] + results['reward']
+    print(f"validator ready for first state : {ready:.3f}s" + (f" (budget {args.budget:.3f}s)" if args.budget else ""))
+    sys.exit(1 if args.budget and ready > args.budget else 0)
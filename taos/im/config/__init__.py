@@ -51,6 +51,13 @@ def add_im_validator_args(cls, parser):
         default="btcusdt",
     )
     
+    parser.add_argument(
+        "--simulation.seeding.fundamental.channel",
+        action="store_true",
+        help="If set, fundamental price seeds are also published to a memory-mapped ring (`fundamental_seed.bin` in the simulation output directory) from which the simulator reads the latest seed directly; `fundamental_seed.csv` is still written as a record of the seeds.  If not set, any existing channel file is removed so that the simulator reads seeds from `fundamental_seed.csv`.",
+        default=False,
+    )
+    
     parser.add_argument(
         "--simulation.seeding.external.symbol.coinbase",
         type=str,
@@ -86,6 +93,93 @@ def add_im_validator_args(cls, parser):
         default=8000,
     )
 
+    parser.add_argument(
+        "--socket_path",
+        type=str,
+        help="Path of a Unix domain socket on which to serve the validator listener instead of the TCP port; must match `DistributedProxyAgent.socketPath` in the simulation XML config.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--response_encoding",
+        type=str,
+        choices=['auto', 'json', 'msgpack'],
+        help="Encoding of the instructions returned to the simulator; `auto` replies in the encoding of the state update received.  The simulator accepts either regardless of its `bookStateEncoding`.",
+        default='auto',
+    )
+
+    parser.add_argument(
+        "--keep_alive_timeout",
+        type=int,
+        help="Time in seconds for which the validator listener keeps an idle simulator connection open between simulation steps.",
+        default=300,
+    )
+
+    parser.add_argument(
+        "--neuron.state_compaction_steps",
+        type=int,
+        help="Number of simulation steps between saves of the full validator state.  In between, only the changes made in each step are appended to a journal which is replayed on loading.",
+        default=100,
+    )
+
+    parser.add_argument(
+        "--neuron.per_miner_state",
+        action="store_true",
+        help="If set, each miner is sent the shared orderbook state together with only its own account and notices, rather than the state of all agents.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--neuron.book_deltas",
+        action="store_true",
+        help="If set along with `neuron.per_miner_state`, orderbook levels are sent as changes relative to the previous state to miners which acknowledged that state; other miners receive the full snapshot.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--compression.codec",
+        type=str,
+        choices=['zlib', 'zstd', 'lz4'],
+        help="Codec used to compress state synapses sent to miners.  `zstd` and `lz4` require miners to have the `zstandard` and `lz4` packages installed.",
+        default='zlib',
+    )
+
+    parser.add_argument(
+        "--compression.level",
+        type=int,
+        help="Compression level used for state synapses sent to miners; if not set, the default level of the selected codec is used.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--archive.codec",
+        type=str,
+        choices=['zstd', 'zlib', 'lz4'],
+        help="Codec used to compress the output directories of completed simulations.",
+        default='zstd',
+    )
+
+    parser.add_argument(
+        "--archive.level",
+        type=int,
+        help="Compression level used when archiving simulation outputs; if not set, the default level of the selected codec is used.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--archive.workers",
+        type=int,
+        help="Number of processes used to compress files concurrently when archiving simulation outputs.",
+        default=2,
+    )
+
+    parser.add_argument(
+        "--archive.io_budget",
+        type=float,
+        help="Maximum total rate in MB/s at which simulation output files are read for archiving; set to 0 to not limit the rate.",
+        default=50.0,
+    )
+
     parser.add_argument(
         "--scoring.max_instructions_per_book",
         type=int,
@@ -93,6 +187,13 @@ def add_im_validator_args(cls, parser):
         default=20,
     )
 
+    parser.add_argument(
+        "--scoring.max_response_size",
+        type=int,
+        help="Maximum decompressed size in bytes of a miner response; larger responses are rejected without being parsed.",
+        default=16_000_000,
+    )
+
     parser.add_argument(
         "--scoring.sharpe.lookback",
         type=int,
@@ -31,6 +31,11 @@ class Miner(BaseMinerNeuron):
 
     Overrides state processing methods to provide the correct signature when attaching axon handlers.
     """
+    def __init__(self, config=None):
+        super().__init__(config=config)
+        # Orderbook state most recently processed for each validator, against which book deltas are applied.
+        self.book_states = {}
+
     async def forward(
         self, synapse: MarketSimulationStateUpdate
     ) -> MarketSimulationStateUpdate:
@@ -44,7 +49,16 @@ class Miner(BaseMinerNeuron):
             taos.im.protocol.MarketSimulationStateUpdate: The synapse object with the 'response' field updated with any instructions generated by the agent.
         """
         synapse.decompress()
-        synapse.response = self.agent.handle(synapse)
+        if synapse.book_base is not None:
+            timestamp, books = self.book_states.get(synapse.dendrite.hotkey, (None, None))
+            if timestamp != synapse.book_base:
+                # Returning without acknowledging the state causes the validator to send a full snapshot on the next query.
+                bt.logging.warning(f"Unable to apply book deltas from {synapse.dendrite.hotkey} : State at {synapse.book_base} not available.")
+                return synapse.clear_inputs().compress()
+            synapse.apply_deltas(books)
+        self.book_states[synapse.dendrite.hotkey] = (synapse.timestamp, synapse.books)
+        synapse.response = await self.dispatch('handle', synapse)
+        synapse.state_ack = synapse.timestamp
         return synapse.clear_inputs().compress()
     
     def blacklist_forward(
@@ -17,32 +17,27 @@
 # DEALINGS IN THE SOFTWARE.
 
 import os
-import platform
 import time
+import asyncio
 import argparse
 import torch
 import traceback
 import json
 import xml.etree.ElementTree as ET
-import pandas as pd
-import msgpack
+import numpy as np
 import msgspec
 import math
-import shutil
 from datetime import datetime
 
 # Bittensor
 import bittensor as bt
 
-import uvicorn
 from typing import Tuple
-from fastapi import FastAPI, APIRouter
-from fastapi import Request
+from fastapi import APIRouter, Request, Response
 from threading import Thread
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
 
-import subprocess
-import psutil
-from git import Repo
 from pathlib import Path
 
 from taos.common.neurons.validator import BaseValidatorNeuron
@@ -52,6 +47,13 @@ from taos.im.protocol.simulator import SimulatorBookMessage, SimulatorResponseBa
 from taos.im.protocol import MarketSimulationStateUpdate, FinanceEventNotification, FinanceAgentResponse
 from taos.im.protocol.models import MarketSimulationConfig
 from taos.im.protocol.events import SimulationStartEvent
+from taos.im.utils.archive import archive_directory
+from taos.im.utils.fundamental import FundamentalPriceReader
+from taos.im.utils.inventory import InventoryHistory
+from taos.im.utils.journal import StateJournal
+from taos.im.utils.pipeline import StepPipeline
+from taos.im.utils.state import VERSION, save_arrays, load_arrays, fit
+from taos.im.utils.volume import TradeVolumes
 
 class Validator(BaseValidatorNeuron):
     """
@@ -61,6 +63,8 @@ class Validator(BaseValidatorNeuron):
     Metagraph maintenance, weight setting, state persistence and other general bittensor routines are executed in a separate thread.
     The validator also handles publishing of metrics via Prometheus for visualization and analysis, as well as retrieval and recording of seed data for simulation price process generation.
     """
+    # Sharpe values maintained for each UID in addition to the per-book values
+    SHARPE_KEYS = ['total', 'average', 'median', 'normalized_average', 'normalized_total', 'normalized_median']
 
     @classmethod
     def add_args(cls, parser: argparse.ArgumentParser) -> None:
@@ -120,17 +124,21 @@ class Validator(BaseValidatorNeuron):
             return False
 
     def _compress_outputs(self):
+        import shutil
+        import psutil
         self.compressing = True
         try:
             if self.simulation.logDir:
                 log_root = Path(self.simulation.logDir).parent
                 for output_dir in log_root.iterdir():
-                    if output_dir.is_dir() and str(output_dir.resolve()) != self.simulation.logDir:
-                        size = sum(file.stat().st_size for file in output_dir.rglob('*'))
-                        bt.logging.info(f"Compressing output directory {output_dir.name} ({int(size / 1024 / 1024)}MB)...")
+                    if output_dir.is_dir() and not output_dir.name.endswith('.archive.parts') and str(output_dir.resolve()) != self.simulation.logDir:
+                        bt.logging.info(f"Compressing output directory {output_dir.name}...")
                         try:
-                            shutil.make_archive(output_dir, 'zip', output_dir)
-                            bt.logging.success(f"Compressed {output_dir.name} to {output_dir.name + '.zip'}.")
+                            # Archives interrupted by a restart are resumed from the last file recorded in the archive index
+                            summary = archive_directory(output_dir, codec=self.config.archive.codec, level=self.config.archive.level,
+                                                        workers=self.config.archive.workers, io_budget=self.config.archive.io_budget * 1024 * 1024 if self.config.archive.io_budget else None)
+                            bt.logging.success(f"Compressed {output_dir.name} to {output_dir.name + '.archive'} ({summary['files']} files | {int(summary['size'] / 1024 / 1024)}MB -> {int(summary['compressed_size'] / 1024 / 1024)}MB | "
+                                               f"Ratio {summary['ratio']:.2f} | {summary['throughput'] / 1024 / 1024:.2f}MB/s).")
                         except Exception as ex:
                             self.pagerduty_alert(f"Failed to compress folder {output_dir.name} : {ex}", details={"trace" : traceback.format_exc()})
                             continue
@@ -147,9 +155,10 @@ class Validator(BaseValidatorNeuron):
                             archive_date = int(output_archive.name[:8])
                         except:
                             continue
-                        if output_archive.is_file() and output_archive.name.endswith('.zip') and archive_date < first_day_of_month:
+                        if output_archive.is_file() and output_archive.name.endswith(('.zip', '.archive')) and archive_date < first_day_of_month:
                             try:
                                 output_archive.unlink()
+                                Path(str(output_archive) + ".index").unlink(missing_ok=True)
                                 disk_usage = psutil.disk_usage('/').percent
                                 bt.logging.success(f"Deleted {output_dir.name} ({disk_usage}% disk available).")
                                 if disk_usage <= 90:
@@ -165,13 +174,13 @@ class Validator(BaseValidatorNeuron):
         if not self.compressing:
             Thread(target=self._compress_outputs, args=(), daemon=True, name=f'compress_{self.step}').start()
 
-    def _save_state(self) -> None:
-        """Saves the state of the validator to a file."""
-        self.saving = True
+    def _save_simulation_state(self) -> None:
+        """
+        Saves the state of the simulation to file.
+        """
         try:
             bt.logging.info("Saving simulation state...")
             start = time.time()
-            # Save the state of the simulation to file.
             torch.save(
                 {
                     "start_time": self.start_time,
@@ -181,8 +190,7 @@ class Validator(BaseValidatorNeuron):
                     "recent_trades": self.recent_trades,
                     "recent_miner_trades": self.recent_miner_trades,
                     "pending_notices": self.pending_notices,
-                    "simulation.logDir": self.simulation.logDir,
-                    "fundamental_price": self.fundamental_price
+                    "simulation.logDir": self.simulation.logDir
                 },
                 self.simulation_state_file + ".tmp",
             )
@@ -190,44 +198,91 @@ class Validator(BaseValidatorNeuron):
                 os.remove(self.simulation_state_file)
             os.rename(self.simulation_state_file + ".tmp", self.simulation_state_file)
             bt.logging.success(f"Simulation state saved to {self.simulation_state_file} ({time.time()-start:.4f}s)")
+        except Exception as ex:
+            if os.path.exists(self.simulation_state_file + ".tmp"):
+                os.remove(self.simulation_state_file + ".tmp")
+            self.pagerduty_alert(f"Failed to save simulation state : {ex}", details={"trace" : traceback.format_exc()})
+
+    def _save_state(self, reward : Future | None = None) -> None:
+        """
+        Saves the state of the validator to file.
+        The simulation state is saved in full at every step.  Where the result of scoring the latest state is given, only the changes made to the
+        scoring state in the step are appended to the state journal, and the full validator state is saved once every `neuron.state_compaction_steps` steps.
+        """
+        self._save_simulation_state()
+        if reward and self.journal.count + 1 < self.config.neuron.state_compaction_steps and not reward.exception():
+            try:
+                start = time.time()
+                result = reward.result()
+                record = {
+                    **result['validator'],
+                    "delta": result['delta'],
+                    "sharpe_values": result['sharpe_values'],
+                    "activity_factors": result['activity_factors']
+                }
+                if list(self.hotkeys) != self.journal_hotkeys:
+                    record["hotkeys"] = self.journal_hotkeys = list(self.hotkeys)
+                size = self.journal.append(record)
+                bt.logging.success(f"Validator state journaled to {self.journal.path} ({size} bytes | {time.time()-start:.4f}s)")
+                return
+            except Exception as ex:
+                self.pagerduty_alert(f"Failed to journal state, saving full state : {ex}", details={"trace" : traceback.format_exc()})
+        try:
             bt.logging.info("Saving validator state...")
             start = time.time()
-            # Save the state of the validator to file.
-            with open(self.validator_state_file + ".tmp", 'wb') as file:
-                packed_data = msgpack.packb(
-                    {
-                        "step": self.step,
-                        "simulation_timestamp": self.simulation_timestamp,
-                        "hotkeys": self.hotkeys,
-                        "scores": [score.item() for score in self.scores],
-                        "activity_factors": self.activity_factors,
-                        "inventory_history": self.inventory_history,
-                        "sharpe_values": self.sharpe_values,
-                        "unnormalized_scores": self.unnormalized_scores,
-                        "trade_volumes" : self.trade_volumes,
-                        "deregistered_uids" : self.deregistered_uids
-                    }, use_bin_type=True
-                )
-                file.write(packed_data)
-            if os.path.exists(self.validator_state_file):
-                os.remove(self.validator_state_file)
-            os.rename(self.validator_state_file + ".tmp", self.validator_state_file)
+            # Retrieve the scoring state from the reward process once scoring of the latest state is complete.
+            scoring_state = self.reward_worker.request('state').result()
+            # The validator state resulting from the scored step is saved where available, rather than that of any step processed since.
+            validator = reward.result()['validator'] if reward and not reward.exception() else {
+                "step": self.step,
+                "simulation_timestamp": self.simulation_timestamp,
+                "scores": [score.item() for score in self.scores],
+                "unnormalized_scores": [self.unnormalized_scores[uid] for uid in range(len(self.unnormalized_scores))],
+                "deregistered_uids": list(self.deregistered_uids)
+            }
+            sharpe_values, activity_factors = scoring_state['sharpe_values'], scoring_state['activity_factors']
+            uids, books = range(len(sharpe_values)), range(self.simulation.book_count)
+            # Save the state of the validator to file, with per-UID values held as fixed-dtype arrays so that they can be memory-mapped on loading.
+            save_arrays(
+                self.validator_state_file,
+                {
+                    "scores": np.array(validator["scores"], dtype=np.float32),
+                    "unnormalized_scores": np.array(validator["unnormalized_scores"], dtype=np.float64),
+                    "activity_factors": np.array([[activity_factors[uid].get(bookId, 0.0) for bookId in books] for uid in uids], dtype=np.float64).reshape((len(uids), len(books))),
+                    "sharpe_books": np.array([[sharpe_values[uid]['books'].get(bookId, 0.0) for bookId in books] for uid in uids], dtype=np.float64).reshape((len(uids), len(books))),
+                    **{f"sharpe_{key}": np.array([sharpe_values[uid][key] for uid in uids], dtype=np.float64) for key in self.SHARPE_KEYS},
+                    **{f"inventory_{name}": array for name, array in scoring_state['inventory_history'].items()},
+                    "volume_timestamps": scoring_state['trade_volumes']['timestamps'],
+                    "volumes": scoring_state['trade_volumes']['volumes']
+                },
+                {
+                    "step": validator["step"],
+                    "scoring_step": scoring_state['step'],
+                    "simulation_timestamp": validator["simulation_timestamp"],
+                    "hotkeys": list(self.hotkeys),
+                    "deregistered_uids" : validator["deregistered_uids"]
+                }
+            )
+            # Changes recorded in the journal are now included in the saved state
+            self.journal.clear()
+            self.journal_hotkeys = list(self.hotkeys)
             bt.logging.success(f"Validator state saved to {self.validator_state_file} ({time.time()-start:.4f}s)")
         except Exception as ex:
-            if os.path.exists(self.simulation_state_file + ".tmp"):
-                os.remove(self.simulation_state_file + ".tmp")
             if os.path.exists(self.validator_state_file + ".tmp"):
                 os.remove(self.validator_state_file + ".tmp")
             self.pagerduty_alert(f"Failed to save state : {ex}", details={"trace" : traceback.format_exc()})
-        finally:
-            self.saving = False
 
-    def save_state(self) -> None:
-        if not self.saving:
-            Thread(target=self._save_state, args=(), daemon=True, name=f'save_{self.step}').start()
+    def save_state(self, reward : Future | None = None) -> Future:
+        """
+        Queues saving of the validator state; saves are executed in order on a dedicated thread.
+        """
+        return self.save_executor.submit(self._save_state, reward)
 
     def load_state(self) -> None:
         """Loads the state of the validator from a file."""
+        if self.pipeline:
+            # Saving and reporting of the last step may still be in progress, and must complete before the state is reloaded.
+            wait([future for future in self.pipeline.futures.values()])
         if not self.config.neuron.reset and os.path.exists(self.simulation_state_file):
             bt.logging.info(f"Loading simulation state variables from {self.simulation_state_file}...")
             simulation_state = torch.load(self.simulation_state_file, weights_only=False)
@@ -239,7 +294,7 @@ class Validator(BaseValidatorNeuron):
             self.recent_trades = simulation_state["recent_trades"]
             self.recent_miner_trades = simulation_state["recent_miner_trades"] if "recent_miner_trades" in simulation_state else {uid : {bookId : [] for bookId in range(self.simulation.book_count)} for uid in range(self.subnet_info.max_uids)}
             self.simulation.logDir = simulation_state["simulation.logDir"]
-            self.fundamental_price = simulation_state["fundamental_price"]
+            self.fundamental_prices = FundamentalPriceReader(os.path.join(self.simulation.logDir,'fundamental.csv'), self.simulation.book_count) if self.simulation.logDir else None
             # self.inventory_history = simulation_state["inventory_history"] if "inventory_history" in simulation_state else {uid : {} for uid in range(self.subnet_info.max_uids)}
             bt.logging.success(f"Loaded simulation state.")
         else:
@@ -252,82 +307,125 @@ class Validator(BaseValidatorNeuron):
             self.initial_balances = {uid : {bookId : {'BASE' : None, 'QUOTE' : None} for bookId in range(self.simulation.book_count)} for uid in range(self.subnet_info.max_uids)}
             self.recent_trades = {bookId : [] for bookId in range(self.simulation.book_count)}
             self.recent_miner_trades = {uid : {bookId : [] for bookId in range(self.simulation.book_count)} for uid in range(self.subnet_info.max_uids)}
-            self.fundamental_price = {bookId : None for bookId in range(self.simulation.book_count)}
+            self.fundamental_prices = None
             # self.inventory_history = {uid : {} for uid in range(self.subnet_info.max_uids)}
 
-        if os.path.exists(self.validator_state_file.replace('.mp', '.pt')):
+        import msgpack
+        if os.path.exists(self.legacy_validator_state_file.replace('.mp', '.pt')):
             bt.logging.info("Pytorch validator state file exists - converting to msgpack...")
-            pt_validator_state = torch.load(self.validator_state_file.replace('.mp', '.pt'), weights_only=False)
+            pt_validator_state = torch.load(self.legacy_validator_state_file.replace('.mp', '.pt'), weights_only=False)
             pt_validator_state["scores"] = [score.item() for score in pt_validator_state['scores']]
-            with open(self.validator_state_file, 'wb') as file:
+            with open(self.legacy_validator_state_file, 'wb') as file:
                 packed_data = msgpack.packb(
                     pt_validator_state, use_bin_type=True
                 )
                 file.write(packed_data)
-            os.rename(self.validator_state_file.replace('.mp', '.pt'), self.validator_state_file.replace('.mp', '.pt') + ".bak")
-            bt.logging.info(f"Pytorch validator state file converted to msgpack at {self.validator_state_file}")
-
-        if not self.config.neuron.reset and os.path.exists(self.validator_state_file):
-            bt.logging.info(f"Loading validator state variables from {self.validator_state_file}...")
-            with open(self.validator_state_file, 'rb') as file:
-                byte_data = file.read()
-            validator_state = msgpack.unpackb(byte_data, use_list=False, strict_map_key=False)
-            self.step = validator_state["step"]
-            self.simulation_timestamp = validator_state["simulation_timestamp"] if "simulation_timestamp" in validator_state else 0
-            self.hotkeys = validator_state["hotkeys"]
-            self.deregistered_uids = list(validator_state["deregistered_uids"]) if "deregistered_uids" in validator_state else []
-            self.scores = torch.tensor(validator_state["scores"])
-            self.activity_factors = validator_state["activity_factors"] if "activity_factors" in validator_state else {uid : {bookId : 0.0 for bookId in range(self.simulation.book_count)} for uid in range(self.subnet_info.max_uids)}
-            if isinstance(self.activity_factors[0], float):
-                self.activity_factors = {uid : {bookId : self.activity_factors[uid] for bookId in range(self.simulation.book_count)} for uid in range(self.subnet_info.max_uids)}
-            self.inventory_history = validator_state["inventory_history"] if "inventory_history" in validator_state else {uid : {} for uid in range(self.subnet_info.max_uids)}
-            for uid in self.inventory_history:
-                for timestamp in self.inventory_history[uid]:
-                    if len(self.inventory_history[uid][timestamp]) < self.simulation.book_count:
-                        for bookId in range(len(self.inventory_history[uid][timestamp]),self.simulation.book_count):
-                            self.inventory_history[uid][timestamp][bookId] = 0.0
-                    if len(self.inventory_history[uid][timestamp]) > self.simulation.book_count:
-                        self.inventory_history[uid][timestamp] = {k : v for k, v in self.inventory_history[uid][timestamp].items() if k < self.simulation.book_count}
-            self.sharpe_values = validator_state["sharpe_values"]
-            for uid in self.sharpe_values:
-                if len(self.sharpe_values[uid]['books']) < self.simulation.book_count:
-                    for bookId in range(len(self.sharpe_values[uid]['books']),self.simulation.book_count):
-                        self.sharpe_values[uid]['books'][bookId] = 0.0
-                if len(self.sharpe_values[uid]['books']) > self.simulation.book_count:
-                    self.sharpe_values[uid]['books'] = {k : v for k, v in self.sharpe_values[uid]['books'].items() if k < self.simulation.book_count}
-            self.unnormalized_scores = validator_state["unnormalized_scores"]
-            self.trade_volumes = validator_state["trade_volumes"] if "trade_volumes" in validator_state else {uid : {bookId : {'total' : {}, 'maker' : {}, 'taker' : {}, 'self' : {}} for bookId in range(self.simulation.book_count)} for uid in range(self.subnet_info.max_uids)}
-            reorg = False
-            for uid in self.trade_volumes:
-                for bookId in self.trade_volumes[uid]:
-                    if not 'total' in self.trade_volumes[uid][bookId]:
-                        if not reorg:
-                            bt.logging.info(f"Optimizing miner volume history structures...")
-                            reorg = True
-                        volumes = {'total' : {}, 'maker' : {}, 'taker' : {}, 'self' : {}}
-                        for time, role_volume in self.trade_volumes[uid][bookId].items():
-                            sampled_time = math.ceil(time / self.config.scoring.activity.trade_volume_sampling_interval) * self.config.scoring.activity.trade_volume_sampling_interval
-                            for role, volume in role_volume.items():
-                                if not sampled_time in volumes[role]:
-                                    volumes[role][sampled_time] = 0.0
-                                volumes[role][sampled_time] += volume
-                        self.trade_volumes[uid][bookId] = {role : {time : round(volumes[role][time], self.simulation.volumeDecimals) for time in volumes[role]} for role in volumes}
-                if len(self.trade_volumes[uid]) < self.simulation.book_count:
-                    for bookId in range(len(self.trade_volumes[uid]),self.simulation.book_count):
-                        self.trade_volumes[uid][bookId] = {'total' : {}, 'maker' : {}, 'taker' : {}, 'self' : {}}
-                if len(self.trade_volumes[uid]) > self.simulation.book_count:
-                    self.trade_volumes[uid] = {k : v for k, v in self.trade_volumes[uid].items() if k < self.simulation.book_count}
-            if reorg:
-                self._save_state()
+            os.rename(self.legacy_validator_state_file.replace('.mp', '.pt'), self.legacy_validator_state_file.replace('.mp', '.pt') + ".bak")
+            bt.logging.info(f"Pytorch validator state file converted to msgpack at {self.legacy_validator_state_file}")
+
+        reorg = False
+        migrate = False
+        if not self.config.neuron.reset and (os.path.exists(self.validator_state_file) or os.path.exists(self.legacy_validator_state_file)):
+            if os.path.exists(self.validator_state_file):
+                bt.logging.info(f"Loading validator state variables from {self.validator_state_file}...")
+                version, metadata, arrays = load_arrays(self.validator_state_file)
+                if version != VERSION:
+                    raise Exception(f"Unsupported validator state file version {version} at {self.validator_state_file} (expected {VERSION}).")
+                uids, books = self.subnet_info.max_uids, self.simulation.book_count
+                self.step = metadata["step"]
+                self.scoring_step = metadata["scoring_step"]
+                self.simulation_timestamp = metadata["simulation_timestamp"]
+                self.hotkeys = metadata["hotkeys"]
+                self.deregistered_uids = list(metadata["deregistered_uids"])
+                self.scores = torch.tensor(np.asarray(arrays["scores"]))
+                self.unnormalized_scores = dict(enumerate(arrays["unnormalized_scores"].tolist()))
+                # Changes in the number of UIDs or books are applied by truncating or zero-padding the saved arrays
+                self.activity_factors = {uid : dict(enumerate(factors)) for uid, factors in enumerate(fit(arrays["activity_factors"], (uids, books)).tolist())}
+                sharpe_books = fit(arrays["sharpe_books"], (uids, books)).tolist()
+                sharpe_values = {key : fit(arrays[f"sharpe_{key}"], (uids,)).tolist() for key in self.SHARPE_KEYS}
+                self.sharpe_values = {uid : {'books' : dict(enumerate(sharpe_books[uid])), **{key : sharpe_values[key][uid] for key in self.SHARPE_KEYS}} for uid in range(uids)}
+                self.inventory_history = InventoryHistory.from_arrays(arrays["inventory_values"], arrays["inventory_timestamps"], arrays["inventory_heads"], arrays["inventory_counts"], uids, books, self.config.scoring.sharpe.lookback)
+                self.trade_volumes = TradeVolumes.from_arrays(arrays["volume_timestamps"], arrays["volumes"], uids, books, self.config.scoring.activity.trade_volume_sampling_interval, self.config.scoring.activity.trade_volume_assessment_period, self.simulation.volumeDecimals)
+            else:
+                # State saved by previous validator versions as msgpack is converted to the array format once loaded
+                migrate = True
+                bt.logging.info(f"Loading validator state variables from {self.legacy_validator_state_file}...")
+                with open(self.legacy_validator_state_file, 'rb') as file:
+                    byte_data = file.read()
+                validator_state = msgpack.unpackb(byte_data, use_list=False, strict_map_key=False)
+                self.step = validator_state["step"]
+                self.simulation_timestamp = validator_state["simulation_timestamp"] if "simulation_timestamp" in validator_state else 0
+                self.hotkeys = validator_state["hotkeys"]
+                self.deregistered_uids = list(validator_state["deregistered_uids"]) if "deregistered_uids" in validator_state else []
+                self.scores = torch.tensor(validator_state["scores"])
+                self.activity_factors = validator_state["activity_factors"] if "activity_factors" in validator_state else {uid : {bookId : 0.0 for bookId in range(self.simulation.book_count)} for uid in range(self.subnet_info.max_uids)}
+                if isinstance(self.activity_factors[0], float):
+                    self.activity_factors = {uid : {bookId : self.activity_factors[uid] for bookId in range(self.simulation.book_count)} for uid in range(self.subnet_info.max_uids)}
+                self.inventory_history = InventoryHistory.from_state(validator_state["inventory_history"], self.subnet_info.max_uids, self.simulation.book_count, self.config.scoring.sharpe.lookback) if "inventory_history" in validator_state else InventoryHistory(self.subnet_info.max_uids, self.simulation.book_count, self.config.scoring.sharpe.lookback)
+                self.sharpe_values = validator_state["sharpe_values"]
+                for uid in self.sharpe_values:
+                    if len(self.sharpe_values[uid]['books']) < self.simulation.book_count:
+                        for bookId in range(len(self.sharpe_values[uid]['books']),self.simulation.book_count):
+                            self.sharpe_values[uid]['books'][bookId] = 0.0
+                    if len(self.sharpe_values[uid]['books']) > self.simulation.book_count:
+                        self.sharpe_values[uid]['books'] = {k : v for k, v in self.sharpe_values[uid]['books'].items() if k < self.simulation.book_count}
+                self.unnormalized_scores = validator_state["unnormalized_scores"]
+                if "trade_volumes" in validator_state and "volumes" not in validator_state["trade_volumes"]:
+                    # Volume history saved by previous validator versions is held as a mapping of UID to `{bookId : {role : {timestamp : volume}}}`
+                    self.trade_volumes = validator_state["trade_volumes"]
+                    for uid in self.trade_volumes:
+                        for bookId in self.trade_volumes[uid]:
+                            if not 'total' in self.trade_volumes[uid][bookId]:
+                                if not reorg:
+                                    bt.logging.info(f"Optimizing miner volume history structures...")
+                                    reorg = True
+                                volumes = {'total' : {}, 'maker' : {}, 'taker' : {}, 'self' : {}}
+                                for time, role_volume in self.trade_volumes[uid][bookId].items():
+                                    sampled_time = math.ceil(time / self.config.scoring.activity.trade_volume_sampling_interval) * self.config.scoring.activity.trade_volume_sampling_interval
+                                    for role, volume in role_volume.items():
+                                        if not sampled_time in volumes[role]:
+                                            volumes[role][sampled_time] = 0.0
+                                        volumes[role][sampled_time] += volume
+                                self.trade_volumes[uid][bookId] = {role : {time : round(volumes[role][time], self.simulation.volumeDecimals) for time in volumes[role]} for role in volumes}
+                        if len(self.trade_volumes[uid]) < self.simulation.book_count:
+                            for bookId in range(len(self.trade_volumes[uid]),self.simulation.book_count):
+                                self.trade_volumes[uid][bookId] = {'total' : {}, 'maker' : {}, 'taker' : {}, 'self' : {}}
+                        if len(self.trade_volumes[uid]) > self.simulation.book_count:
+                            self.trade_volumes[uid] = {k : v for k, v in self.trade_volumes[uid].items() if k < self.simulation.book_count}
+                    self.trade_volumes = TradeVolumes.from_state(self.trade_volumes, self.subnet_info.max_uids, self.simulation.book_count, self.config.scoring.activity.trade_volume_sampling_interval, self.config.scoring.activity.trade_volume_assessment_period, self.simulation.volumeDecimals)
+                elif "trade_volumes" in validator_state:
+                    self.trade_volumes = TradeVolumes.from_state(validator_state["trade_volumes"], self.subnet_info.max_uids, self.simulation.book_count, self.config.scoring.activity.trade_volume_sampling_interval, self.config.scoring.activity.trade_volume_assessment_period, self.simulation.volumeDecimals)
+                else:
+                    self.trade_volumes = TradeVolumes(self.subnet_info.max_uids, self.simulation.book_count, self.config.scoring.activity.trade_volume_sampling_interval, self.config.scoring.activity.trade_volume_assessment_period, self.simulation.volumeDecimals)
+                self.scoring_step = validator_state["scoring_step"] if "scoring_step" in validator_state else self.step
+            # Reapply the changes journaled since the state was saved; scoring steps already included in the saved state are skipped.
+            self.journal_hotkeys = list(self.hotkeys)
+            records = self.journal.read()
+            if records:
+                bt.logging.info(f"Replaying {len(records)} steps from {self.journal.path}...")
+            for record in records:
+                if record["delta"]["step"] > self.scoring_step:
+                    replay(self, record["delta"], record["sharpe_values"], record["activity_factors"])
+                    for uid in record["delta"]["resets"]:
+                        self.unnormalized_scores[uid] = 0.0
+                    self.scoring_step = record["delta"]["step"]
+                self.step = record["step"]
+                self.simulation_timestamp = record["simulation_timestamp"]
+                self.scores = torch.tensor(record["scores"])
+                if "unnormalized_scores" in record:
+                    self.unnormalized_scores = dict(enumerate(record["unnormalized_scores"]))
+                self.deregistered_uids = list(record["deregistered_uids"])
+                if "hotkeys" in record:
+                    self.hotkeys = self.journal_hotkeys = list(record["hotkeys"])
             bt.logging.success(f"Loaded validator state.")
         else:
             # If no state exists or the neuron.reset flag is set, re-initialize the validator state
-            if self.config.neuron.reset and os.path.exists(self.validator_state_file):
+            if self.config.neuron.reset and (os.path.exists(self.validator_state_file) or os.path.exists(self.legacy_validator_state_file)):
                 bt.logging.warning(f"`neuron.reset is True, ignoring previous state info at {self.validator_state_file}.")
             else:
                 bt.logging.info(f"No previous state information at {self.validator_state_file}, initializing new simulation state.")
             self.activity_factors = {uid : {bookId : 0.0 for bookId in range(self.simulation.book_count)} for uid in range(self.subnet_info.max_uids)}
-            self.inventory_history = {uid : {} for uid in range(self.subnet_info.max_uids)}
+            self.inventory_history = InventoryHistory(self.subnet_info.max_uids, self.simulation.book_count, self.config.scoring.sharpe.lookback)
             self.sharpe_values = {uid :
                 {
                     'books' : {
@@ -342,7 +440,37 @@ class Validator(BaseValidatorNeuron):
                 } for uid in range(self.subnet_info.max_uids)
             }
             self.unnormalized_scores = {uid : 0.0 for uid in range(self.subnet_info.max_uids)}
-            self.trade_volumes = {uid : {bookId : {'total' : {}, 'maker' : {}, 'taker' : {}, 'self' : {}} for bookId in range(self.simulation.book_count)} for uid in range(self.subnet_info.max_uids)}
+            self.trade_volumes = TradeVolumes(self.subnet_info.max_uids, self.simulation.book_count, self.config.scoring.activity.trade_volume_sampling_interval, self.config.scoring.activity.trade_volume_assessment_period, self.simulation.volumeDecimals)
+            self.scoring_step = 0
+            self.journal_hotkeys = None
+            self.journal.clear()
+        self.start_reward_worker()
+        if migrate:
+            self._save_state()
+        if migrate and os.path.exists(self.validator_state_file):
+            os.rename(self.legacy_validator_state_file, self.legacy_validator_state_file + ".bak")
+            bt.logging.info(f"Msgpack validator state file converted to {self.validator_state_file}")
+
+    def start_reward_worker(self) -> None:
+        """
+        Starts the process in which miner scores are calculated, handing over the loaded inventory and trading volume histories.
+        If the reward process is already running, the loaded state is instead sent to it to replace its scoring state once its pending requests are completed.
+        """
+        self.scoring_summary = scoring_summary(self.inventory_history, self.trade_volumes)
+        state = {
+            "step" : self.scoring_step,
+            "reward_weights" : self.reward_weights,
+            "inventory_history" : self.inventory_history,
+            "trade_volumes" : self.trade_volumes,
+            "activity_factors" : self.activity_factors,
+            "sharpe_values" : self.sharpe_values
+        }
+        if self.reward_worker and self.reward_worker.process.is_alive():
+            self.reward_worker.request('load', (self.simulation, state)).result()
+        else:
+            self.reward_worker = RewardWorker(self.config, self.simulation, state)
+        # The histories are owned by the reward process from this point; the validator retains only the summary values required for reporting and volume limits.
+        del self.inventory_history, self.trade_volumes
 
     def load_simulation_config(self) -> None:
         """
@@ -350,8 +478,12 @@ class Validator(BaseValidatorNeuron):
         """
         self.xml_config = ET.parse(self.config.simulation.xml_config).getroot()
         self.simulation = MarketSimulationConfig.from_xml(self.xml_config)
-        self.validator_state_file = self.config.neuron.full_path + f"/validator.mp"
+        self.validator_state_file = self.config.neuron.full_path + f"/validator.state"
+        self.legacy_validator_state_file = self.config.neuron.full_path + f"/validator.mp"
         self.simulation_state_file = self.config.neuron.full_path + f"/{self.simulation.label()}.pt"
+        if self.journal:
+            self.journal.close()
+        self.journal = StateJournal(self.config.neuron.full_path + f"/validator.journal")
         self.load_state()
 
     def __init__(self, config=None) -> None:
@@ -373,11 +505,17 @@ class Validator(BaseValidatorNeuron):
         self.start_timestamp = None
         self.last_state_time = None
         self.step_rates = []
-        self.rewarding = False
-        self.reporting = False
-        self.saving = False
+        self.reward_worker = None
+        self.journal = None
+        self.pipeline = None
+        self.save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='save')
+        self.report_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='report')
+        # Miner responses are validated as they arrive in a single worker, so that the event loop remains free to receive the remaining responses.
+        self.response_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='response')
         self.compressing = False
         self.initial_balances_published = False
+        self.book_delta_base = None
+        self.state_acks = set()
 
         self.load_simulation_config()
 
@@ -387,10 +525,11 @@ class Validator(BaseValidatorNeuron):
         self.router.add_api_route("/account", self.account, methods=["GET"])
 
         self.repo_path = Path(os.path.dirname(os.path.realpath(__file__))).parent.parent.parent
+        from git import Repo
         self.repo = Repo(self.repo_path)
         self.update_repo()
 
-        self.miner_stats = {uid : {'requests' : 0, 'timeouts' : 0, 'failures' : 0, 'rejections' : 0, 'call_time' : []} for uid in range(self.subnet_info.max_uids)}
+        self.miner_stats = {uid : {'requests' : 0, 'timeouts' : 0, 'failures' : 0, 'rejections' : 0, 'call_time' : [], 'parse_time' : [], 'dropped' : 0} for uid in range(self.subnet_info.max_uids)}
         init_metrics(self)
         publish_info(self)
 
@@ -401,16 +540,14 @@ class Validator(BaseValidatorNeuron):
         """
         bt.logging.info("-"*40)
         bt.logging.info("SIMULATION STARTED")
+        # The state is saved in full before being reloaded for the new simulation, so that changes made since the last save,
+        # including resets requested from the reward process, are retained.
+        if self.pipeline:
+            wait([future for future in self.pipeline.futures.values()])
+        self.save_state().result()
         self.load_simulation_config()
-        self.trade_volumes = {
-            uid : {
-                bookId : {
-                    role : {
-                        prev_time - self.simulation_timestamp : volume for prev_time, volume in self.trade_volumes[uid][bookId][role].items() if prev_time - self.simulation_timestamp < self.simulation_timestamp
-                    } for role in self.trade_volumes[uid][bookId]
-                } for bookId in range(self.simulation.book_count)
-            } for uid in range(self.subnet_info.max_uids)
-        }
+        # Volume history is carried over to the new simulation with timestamps relative to its start
+        self.scoring_summary = self.reward_worker.request('shift', -self.simulation_timestamp).result()
         self.start_time = time.time()
         self.simulation_timestamp = timestamp
         self.start_timestamp = self.simulation_timestamp
@@ -422,9 +559,8 @@ class Validator(BaseValidatorNeuron):
         bt.logging.info(f"TIMESTAMP : {self.start_timestamp}")
         bt.logging.info(f"OUT DIR   : {self.simulation.logDir}")
         bt.logging.info("-"*40)
-        df_fp = pd.read_csv(os.path.join(self.simulation.logDir,'fundamental.csv'))
-        df_fp.set_index('Timestamp')
-        self.fundamental_price = {bookId : df_fp[str(bookId)].to_dict() for bookId in range(self.simulation.book_count)}
+        self.fundamental_prices = FundamentalPriceReader(os.path.join(self.simulation.logDir,'fundamental.csv'), self.simulation.book_count)
+        self.fundamental_prices.read()
         self.initial_balances = {uid : {bookId : {'BASE' : None, 'QUOTE' : None} for bookId in range(self.simulation.book_count)} for uid in range(self.subnet_info.max_uids)}
         self.recent_trades = {bookId : [] for bookId in range(self.simulation.book_count)}
         self.recent_miner_trades = {uid : {bookId : [] for bookId in range(self.simulation.book_count)} for uid in range(self.subnet_info.max_uids)}
@@ -437,7 +573,7 @@ class Validator(BaseValidatorNeuron):
         """
         bt.logging.info("SIMULATION ENDED")
         self.simulation.logDir = None
-        self.fundamental_price = {bookId : None for bookId in range(self.simulation.book_count)}
+        self.fundamental_prices = None
         self.pending_notices = {uid : [] for uid in range(self.subnet_info.max_uids)}
         self.save_state()
         self.update_repo(end=True)
@@ -460,41 +596,62 @@ class Validator(BaseValidatorNeuron):
         }
         self.activity_factors[uid] = {bookId : 0.0 for bookId in range(self.simulation.book_count)}
         self.unnormalized_scores[uid] = 0.0
-        self.inventory_history[uid] = {}
+        self.reward_worker.request('reset', uid)
         self.deregistered_uids.append(uid)
-        self.trade_volumes[uid] = {bookId : {'total' : {}, 'maker' : {}, 'taker' : {}, 'self' : {}} for bookId in range(self.simulation.book_count)}
         bt.logging.debug(f"UID {uid} Deregistered - Scheduled for reset.")
 
-    def report(self) -> None:
+    def report(self, state : MarketSimulationStateUpdate, reward : Future | None = None) -> Future | None:
         """
-        Publish performance and state metrics.
+        Queues publishing of performance and state metrics for the given state; reports are executed in order on a dedicated thread.
         """
-        if not self.config.reporting.disabled and not self.reporting:
-            Thread(target=report, args=(self,), daemon=True, name=f'report_{self.step}').start()
+        if not self.config.reporting.disabled:
+            return self.report_executor.submit(report, self, state, self.step, reward)
 
-    def _reward(self, state : MarketSimulationStateUpdate):
-        # Calculate the rewards for the miner based on the latest simulation state.
+    def publish_latency(self, stage : str, latency : float) -> None:
+        """
+        Publish the latency of a stage in the processing of the latest simulation state update.
+        """
+        if not self.config.reporting.disabled:
+            self.prometheus_stage_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, stage=stage ).set( latency )
+
+    def _reward(self, future : Future, scored : Future, step : int, simulation_timestamp : int) -> None:
+        # Update the miner scores with the rewards calculated by the reward process for the latest simulation state.
         try:
-            bt.logging.info(f"Updating Agent Scores at Step {self.step}...")
-            self.rewarding = True
-            start = time.time()
-            rewards = get_rewards(self, state)
+            result = future.result()
+            rewards = torch.FloatTensor(result['rewards']).to(self.device)
             bt.logging.debug(f"Agent Rewards Recalculated:\n{rewards}")
-            # Update the miner scores.
-            self.update_scores(rewards, self.metagraph.uids)
-            bt.logging.info(f"Agent Scores Updated ({time.time()-start:.4f}s)")
+            self.sharpe_values.update(result['sharpe_values'])
+            self.activity_factors.update(result['activity_factors'])
+            self.scoring_summary = result['summary']
+            self.update_scores(rewards, result['uids'].tolist())
+            bt.logging.info(f"Agent Scores Updated ({time.time()-self.reward_start:.4f}s)")
             bt.logging.debug(f"{self.scores}")
-        finally:
-            self.rewarding = False
+            # The validator state resulting from the step is recorded with the result, as saving runs behind and the validator may since have moved on to the next step.
+            result['validator'] = {
+                "step": step,
+                "simulation_timestamp": simulation_timestamp,
+                "scores": [score.item() for score in self.scores],
+                "unnormalized_scores": [self.unnormalized_scores[uid] for uid in range(len(self.unnormalized_scores))],
+                "deregistered_uids": list(self.deregistered_uids)
+            }
+            scored.set_result(result)
+        except Exception as ex:
+            self.pagerduty_alert(f"Failed to update agent scores : {ex}", details={"trace" : traceback.format_exc()})
+            scored.set_exception(ex)
 
-    def reward(self, state) -> None:
+    def reward(self, state) -> Future:
         """
-        Update agent rewards and recalculate scores.
+        Submit the latest state to the reward process to update agent rewards and recalculate scores.
+        The returned future is resolved once the miner scores have been updated with the result.
         """
-        if not self.rewarding:
-            Thread(target=self._reward, args=(state,), daemon=True, name=f'reward_{self.step}').start()
-
-    async def orderbook(self, request : Request) -> dict:
+        bt.logging.info(f"Updating Agent Scores at Step {self.step}...")
+        self.reward_start = time.time()
+        scored = Future()
+        future = self.reward_worker.request('score', reward_inputs(self, state))
+        future.add_done_callback(partial(self._reward, scored=scored, step=self.step, simulation_timestamp=state.timestamp))
+        return scored
+
+    async def orderbook(self, request : Request) -> Response:
         """
         The route method which receives and processes simulation state updates received from the simulator.
         """
@@ -505,15 +662,22 @@ class Validator(BaseValidatorNeuron):
             bt.logging.info("Nothing to update.")
         bt.logging.debug("Received state update from simulator")
         global_start = time.time()
-        start = time.time()
-        body = await request.body()
-        bt.logging.debug(f"Request body retrieved ({time.time()-start:.4f}s).")
-        start = time.time()
-        message = msgspec.json.decode(body)
-        bt.logging.debug(f"Request body decoded ({time.time()-start:.4f}s).")
-        start = time.time()
-        state = MarketSimulationStateUpdate.from_json(message) # Populate synapse class from request data
-        bt.logging.debug(f"Synapse populated ({time.time()-start:.4f}s).")
+        # The stages of processing for this state are tracked in a new pipeline; the stages of the previous step may still be running in the background.
+        previous = self.pipeline
+        pipeline = StepPipeline(self.step + 1, previous=previous, publish=self.publish_latency)
+        with pipeline.stage('decode'):
+            start = time.time()
+            body = await request.body()
+            bt.logging.debug(f"Request body retrieved ({time.time()-start:.4f}s).")
+            start = time.time()
+            # The simulator can be configured to publish state as msgpack (`bookStateEncoding="msgpack"`); unless configured otherwise, the reply is encoded to match.
+            encoding = 'msgpack' if request.headers.get('content-type', '').startswith('application/msgpack') else 'json'
+            message = msgspec.msgpack.decode(body) if encoding == 'msgpack' else msgspec.json.decode(body)
+            bt.logging.debug(f"Request body decoded ({encoding} | {len(body)} bytes | {time.time()-start:.4f}s).")
+            start = time.time()
+            state = MarketSimulationStateUpdate.from_json(message) # Populate synapse class from request data
+            bt.logging.debug(f"Synapse populated ({time.time()-start:.4f}s).")
+        self.pipeline = pipeline
 
         # Update variables
         if not self.start_time:
@@ -554,29 +718,48 @@ class Validator(BaseValidatorNeuron):
                     else:
                         self.pagerduty_alert(f"Failed to Reset Agent {reset.agentId} : {reset.message}")
 
-        # Await reporting and state saving to complete before proceeding with next step
-        while self.reporting or self.saving or self.rewarding:
-            bt.logging.info(f"Waiting for {'reporting' if self.reporting else ''}{', ' if self.reporting and self.saving else ''}{'state saving' if self.saving else ''}{', ' if (self.reporting or self.saving) and self.rewarding else ''}{'rewarding' if self.rewarding else ''} to complete...")
-            time.sleep(1)
+        # Scores for the latest state are calculated from those resulting from the previous state, so scoring of the previous state must complete first.
+        # Saving and reporting of the previous step are not required here and continue in the background.
+        if previous and not previous.done('reward'):
+            bt.logging.info(f"Waiting for rewarding to complete...")
+            await pipeline.wait('reward')
 
         # Calculate latest rewards and update miner scores
-        self.reward(state)
+        pipeline.track('reward', self.reward(state))
         # Forward state synapse to miners, populate response data to simulator object and serialize for returning to simulator.
-        response = SimulatorResponseBatch(await forward(self, state)).serialize()
+        with pipeline.stage('forward'):
+            instructions = await forward(self, state)
 
         # Log response data, start state serialization and reporting threads, and return miner instructions to the simulator
-        if len(response['responses']) > 0:
-            bt.logging.trace(f"RESPONSE : {response}")
+        if len(instructions) > 0:
+            bt.logging.trace(f"RESPONSE : {instructions}")
         bt.logging.info(f"RATE : {(self.step_rates[-1] if self.step_rates != [] else 0) / 1e9:.2f} STEPS/s | AVG : {(sum(self.step_rates) / len(self.step_rates) / 1e9 if self.step_rates != [] else 0):.2f}  STEPS/s")
         self.step_rates = self.step_rates[-10000:]
         self.last_state_time = time.time()
-        self.save_state()
-        self.report()
+        # Saving and reporting run up to one step behind; those of the previous step must complete before this step's are queued,
+        # so that state is written and metrics are published in order and work cannot accumulate if they are slower than the simulation.
+        if previous:
+            for stage in ['save', 'report']:
+                if not previous.done(stage):
+                    bt.logging.info(f"Waiting for {stage} of step {previous.step} to complete...")
+                    await pipeline.wait(stage)
+            bt.logging.debug(f"Step {previous.step} latencies : {previous} | Critical : {previous.critical().upper() if previous.critical() else None}")
+        pipeline.track('save', self.save_state(pipeline.futures['reward']))
+        report_future = self.report(state, pipeline.futures['reward'])
+        if report_future:
+            pipeline.track('report', report_future)
         for notice in state.notices[0]:
             if notice.type == 'EVENT_SIMULATION_STOP':
                 self.onEnd()
+        # The response body is encoded directly from the validated instructions and returned as is, bypassing serialization by FastAPI.
+        with pipeline.stage('encode'):
+            start = time.time()
+            encoding = encoding if self.config.response_encoding == 'auto' else self.config.response_encoding
+            content = SimulatorResponseBatch.encode_instructions(instructions, encoding)
+            bt.logging.info(f"Response encoded ({encoding} | {len(instructions)} instructions | {len(content)} bytes | {time.time()-start:.4f}s).")
+        pipeline.record('total', time.time()-global_start)
         bt.logging.info(f"State update processed ({time.time()-global_start}s)")
-        return response
+        return Response(content=content, media_type=f'application/{encoding}')
 
     async def account(self, request : Request) -> None:
         """
@@ -590,7 +773,8 @@ class Validator(BaseValidatorNeuron):
         notices = []
         for message in batch.messages:
             if message.type == 'EVENT_SIMULATION_START':
-                self.onStart(message.timestamp, FinanceEventNotification.from_simulator(message).event)
+                # Saving and reloading the state for the new simulation blocks, and is run outside of the event loop.
+                await asyncio.get_running_loop().run_in_executor(None, self.onStart, message.timestamp, FinanceEventNotification.from_simulator(message).event)
             elif message.type == 'EVENT_SIMULATION_STOP':
                 self.onEnd()
             else:
@@ -603,10 +787,15 @@ class Validator(BaseValidatorNeuron):
 
 # The main method which runs the validator
 if __name__ == "__main__":
+    # Dependencies of the entry point only are imported here rather than at module level,
+    # as the validator module is also imported by each process spawned by the validator.
+    import platform
+    import uvicorn
+    from fastapi import FastAPI
     from taos.im.validator.update import check_repo, update_validator, check_simulator, rebuild_simulator, restart_simulator
     from taos.im.validator.forward import forward, notify
     from taos.im.validator.report import report, publish_info, init_metrics
-    from taos.im.validator.reward import get_rewards
+    from taos.im.validator.reward import RewardWorker, reward_inputs, scoring_summary, replay
     if float(platform.freedesktop_os_release()['VERSION_ID']) < 22.04:
         raise Exception(f"taos validator requires Ubuntu >= 22.04!")
     # Initialize FastAPI client and attach validator router
@@ -617,5 +806,6 @@ if __name__ == "__main__":
     Thread(target=validator.maintain, daemon=True, name='Sync').start()
     # Start simulator price seeding data process in new thread
     Thread(target=validator.seed, daemon=True, name='Seed').start()
-    # Run the validator as a FastAPI client via uvicorn on the configured port
-    uvicorn.run(app, port=validator.config.port)
+    # Run the validator as a FastAPI client via uvicorn on the configured port or Unix domain socket.
+    # The simulator holds its connection open across steps, so idle connections are kept alive for the configured period.
+    uvicorn.run(app, port=validator.config.port, uds=validator.config.socket_path, timeout_keep_alive=validator.config.keep_alive_timeout)
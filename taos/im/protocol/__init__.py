@@ -1,25 +1,124 @@
 # SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
 # SPDX-License-Identifier: MIT
+import os
 import zlib
-import json
 import time
 import pybase64
 import msgspec
 import bittensor as bt
+from pydantic import BaseModel
 from typing import Optional, ClassVar
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 from taos.im.protocol.simulator import *
 from taos.im.protocol.models import *
 from taos.common.protocol import SimulationStateUpdate, EventNotification
 from taos.im.protocol.events import *
 from taos.im.protocol.models import Book, Account, Balance, Order
 from taos.im.protocol.response import FinanceAgentResponse
+from taos.im.protocol import structs
 
 """
 The core intelligent market simulation protocol classes are defined here.
 These are the classes which inherit from bittensor.synapse, and are the objects which are transmitted between validator and miner via dendrite query calls.
 """
 
+def _encode_model(obj):
+    """
+    Encoding hook allowing pydantic models to be serialized by msgspec alongside the `msgspec.Struct` state representations.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode='json')
+    raise NotImplementedError(f"Objects of type {type(obj)} are not supported")
+
+COMPRESSION_CODECS = ['zlib', 'zstd', 'lz4']
+
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+_LZ4_MAGIC = b'\x04\x22\x4d\x18'
+
+_compression_pool = None
+
+def _compression_executor() -> ThreadPoolExecutor:
+    """
+    Returns the thread pool used to compress synapse fields concurrently; the compression codecs release the GIL while compressing.
+    """
+    global _compression_pool
+    if _compression_pool is None:
+        _compression_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix='compress')
+    return _compression_pool
+
+def _compress_bytes(data : bytes, codec : str = 'zlib', level : int | None = None) -> bytes:
+    """
+    Compresses data with the specified codec; where `level` is not given, the default level of the codec is used.
+    The `zstd` and `lz4` codecs require the optional `zstandard` and `lz4` packages respectively.
+    """
+    match codec:
+        case 'zlib':
+            return zlib.compress(data, -1 if level is None else level)
+        case 'zstd':
+            import zstandard
+            return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+        case 'lz4':
+            import lz4.frame
+            return lz4.frame.compress(data, compression_level=0 if level is None else level)
+    raise ValueError(f"Unsupported compression codec '{codec}' (must be one of {COMPRESSION_CODECS})")
+
+def _decompress_bytes(data : bytes, max_size : int | None = None) -> bytes:
+    """
+    Decompresses data compressed by `_compress_bytes`, identifying the codec from the frame header.
+    Where `max_size` is given, decompression stops once more than `max_size` bytes have been produced and a `ValueError` is raised.
+    """
+    if data[:4] == _ZSTD_MAGIC:
+        import zstandard
+        if max_size is None:
+            return zstandard.ZstdDecompressor().decompress(data)
+        with zstandard.ZstdDecompressor().stream_reader(data) as reader:
+            decompressed = reader.read(max_size + 1)
+    elif data[:4] == _LZ4_MAGIC:
+        import lz4.frame
+        if max_size is None:
+            return lz4.frame.decompress(data)
+        decompressed = lz4.frame.LZ4FrameDecompressor().decompress(data, max_length=max_size + 1)
+    else:
+        if max_size is None:
+            return zlib.decompress(data)
+        decompressed = zlib.decompressobj().decompress(data, max_size + 1)
+    if len(decompressed) > max_size:
+        raise ValueError(f"Decompressed data exceeds the maximum size of {max_size} bytes")
+    return decompressed
+
+def _compress_field(obj, codec : str = 'zlib', level : int | None = None) -> str:
+    """
+    Serializes and compresses a synapse field for transmission over the network.
+    """
+    return pybase64.b64encode(_compress_bytes(msgspec.json.encode(obj, enc_hook=_encode_model), codec, level)).decode("ascii")
+
+def _decompress_field(data : str, decoder : msgspec.json.Decoder | None = None):
+    """
+    Decompresses and deserializes a synapse field compressed by `_compress_field`, into the type of `decoder` where given.
+    """
+    data = _decompress_bytes(pybase64.b64decode(data))
+    return decoder.decode(data) if decoder else msgspec.json.decode(data)
+
+def _compress_fields(fields : dict, codec : str = 'zlib', level : int | None = None) -> dict[str, str]:
+    """
+    Serializes and compresses the given synapse fields concurrently, logging the time taken and size of each.
+    """
+    def compress(name, obj):
+        start = time.time()
+        encoded = msgspec.json.encode(obj, enc_hook=_encode_model)
+        encode_time = time.time() - start
+        start = time.time()
+        data = pybase64.b64encode(_compress_bytes(encoded, codec, level)).decode("ascii")
+        return name, data, len(encoded), encode_time, time.time() - start
+    if len(fields) > 1:
+        results = list(_compression_executor().map(compress, fields.keys(), fields.values()))
+    else:
+        results = [compress(name, obj) for name, obj in fields.items()]
+    for name, data, size, encode_time, compress_time in results:
+        bt.logging.debug(f"Compressed {name} ({size} -> {len(data)} bytes | {codec} | encode {encode_time:.4f}s | compress {compress_time:.4f}s).")
+    return {name : data for name, data, _, _, _ in results}
+
 class FinanceEventNotification(EventNotification):
     """
     Base class for intelligent market simulator event notifications.
@@ -47,6 +146,9 @@ class MarketSimulationStateUpdate(SimulationStateUpdate):
     - books: A dictionary mapping the ID of the simulated orderbooks to a Book object containing state information.
     - accounts: A dictionary mapping the ID of the agent to a dictionary associating orderbook IDs with the state of the agents accounts relative to each book.
     - notices: A dictionary mapping the ID of an agent to the market events relevant to them which have occurred since the last state update.
+    - book_deltas: Where populated, a dictionary mapping the ID of the simulated orderbooks to the changes in the book since the state at `book_base`; in this case `books` is empty, and is reconstructed by the recipient via `apply_deltas`.
+    - book_base: Timestamp of the previously published state against which `book_deltas` are taken.
+    - state_ack: Set by the miner agent in its response to the timestamp of the state which it processed, indicating that it can receive `book_deltas` relative to this state.
     - response : Mutable field to be populated by the miner agent with a response containing instructions to be executed in the simulation.
     """
     timestamp : int
@@ -54,6 +156,9 @@ class MarketSimulationStateUpdate(SimulationStateUpdate):
     books : dict[int,Book] | str
     accounts : dict[int,dict[int, Account]] | str
     notices : dict[int, list[SimulationStartEvent | LimitOrderPlacementEvent | MarketOrderPlacementEvent | OrderCancellationsEvent | TradeEvent | ResetAgentsEvent | SimulationEndEvent]] | str | None = None
+    book_deltas : dict[int, BookDelta] | str | None = None
+    book_base : int | None = None
+    state_ack : int | None = None
     response: Optional[FinanceAgentResponse] | str = None
     compressed : bool = False    
     
@@ -115,41 +220,51 @@ class MarketSimulationStateUpdate(SimulationStateUpdate):
     def from_json(cls, json):
         """
         Method to transform state update message generated by simulator to subnet synapse format.
+
+        The state objects are populated as the lightweight `msgspec.Struct` mirrors defined in `taos.im.protocol.structs` and the synapse is constructed
+        without validation, since the data is generated by the simulator and this method is called by the validator on every step.
+        The fully validated pydantic representation can be obtained where required via `as_models()`.
         """
         start = time.time()
         payload = json['payload']
         model = 'im'
-        books = {book['bookId'] : Book.from_json(book) for book in payload['books']}
+        books = {book['bookId'] : structs.Book.from_json(book) for book in payload['books']}
         bt.logging.debug(f"Books populated ({time.time()-start:.4f}s).")
         start = time.time()
+        agentIds = [agentId for agentId in map(int, payload['accounts']) if agentId >= 0]
         accounts = {}
         for sagentId, account in payload['accounts'].items():
             agentId = int(sagentId)
             if agentId >= 0:
-                for book_id, balances in enumerate(account['balances']['holdings']):
-                    if not agentId in accounts:
-                        accounts[agentId] = {}
-                    accounts[agentId][book_id] = Account(
-                        agent_id=account['agentId'],book_id=book_id,
-                        base_balance=Balance.from_json(currency='BASE', json=balances['base']),
-                        quote_balance=Balance.from_json(currency='QUOTE', json=balances['quote']),
-                        orders=[Order.from_account(order) for order in account['orders'][book_id]] if account['orders'] and account['orders'][book_id] else [],
-                        fees=Fees.from_json(account['fees'][str(book_id)]) if account['fees'] else None
-                    )
+                accounts[agentId] = {book_id : structs.Account.from_json(book_id, account) for book_id in range(len(account['balances']['holdings']))}
         bt.logging.debug(f"Accounts populated ({time.time()-start:.4f}s).")
-        start = time.time()                        
-        notices = {int(uid) : [] for uid in payload['accounts'] if int(uid) >= 0}
+        start = time.time()
+        notices = {agentId : [] for agentId in agentIds}
         for notice in sorted(payload['notices'], key=lambda x: (x['timestamp'], -x['delay'])):
-            notice = FinanceEventNotification.from_json(notice)
-            if notice.event.agentId:
-                notices[notice.event.agentId].append(notice.event)
+            event = structs.FinanceEvent.from_json(notice)
+            if event.agentId:
+                notices[event.agentId].append(event)
             else:
-                for uid in [int(agentId) for agentId in payload['accounts'] if int(agentId) >= 0]:
-                    notices[uid].append(notice.event)
+                for agentId in agentIds:
+                    notices[agentId].append(event)
         notices = {agentId : sorted(agent_notices, key=lambda x: x.timestamp) for agentId, agent_notices in notices.items()}
         bt.logging.debug(f"Notices populated ({time.time()-start:.4f}s).")
-        return MarketSimulationStateUpdate(timestamp=json['timestamp'],model=model,books=books,accounts=accounts,notices=notices)
-    
+        return MarketSimulationStateUpdate.model_construct(name=cls.__name__,timestamp=json['timestamp'],model=model,books=books,accounts=accounts,notices=notices)
+
+    def as_models(self):
+        """
+        Method to obtain a copy of the synapse in which any state objects populated as `msgspec.Struct` mirrors are replaced with the equivalent validated pydantic models.
+        """
+        as_model = lambda obj: obj.model() if isinstance(obj, structs.FinanceStruct) else obj
+        copy = self.model_copy()
+        if isinstance(self.books, dict):
+            copy.books = {bookId : as_model(book) for bookId, book in self.books.items()}
+        if isinstance(self.accounts, dict):
+            copy.accounts = {agentId : {bookId : as_model(account) for bookId, account in accounts.items()} for agentId, accounts in self.accounts.items()}
+        if isinstance(self.notices, dict):
+            copy.notices = {agentId : [as_model(notice) for notice in notices] for agentId, notices in self.notices.items()}
+        return copy
+
     def clear_inputs(self):
         """
         Method to empty state input data fields to prevent unnecessary data transfer from miners.
@@ -157,24 +272,80 @@ class MarketSimulationStateUpdate(SimulationStateUpdate):
         self.books = {}
         self.accounts = {}
         self.notices = {}
+        self.book_deltas = None
+        return self
+
+    def split(self, uids : list[int], base = None, delta_uids : set[int] | None = None, codec : str = 'zlib', level : int | None = None) -> dict:
+        """
+        Method to produce compressed synapses for each of the specified agents, containing the shared orderbook state together with only the account and notices of the recipient.
+
+        Where a `base` state update is provided, the synapses for the agents in `delta_uids` carry the orderbook levels as changes relative to the books of `base`,
+        which must be the state most recently acknowledged by those agents.  The shared fields are compressed only once for all recipients.
+        """
+        shared = {'books' : self.books}
+        if self.config:
+            shared['config'] = self.config.model_dump(mode='json')
+        if base and delta_uids and isinstance(base.books, dict) and base.books.keys() == self.books.keys():
+            shared['book_deltas'] = {bookId : structs.BookDelta.from_books(base.books[bookId], book) for bookId, book in self.books.items()}
+            shared['no_books'] = {}
+        shared = _compress_fields(shared, codec, level)
+        start = time.time()
+        def compress_agent_fields(uid):
+            return (
+                _compress_field({uid : self.accounts[uid]} if uid in self.accounts else {}, codec, level),
+                _compress_field({uid : self.notices[uid]} if uid in self.notices else {}, codec, level)
+            )
+        agent_fields = dict(zip(uids, _compression_executor().map(compress_agent_fields, uids)))
+        bt.logging.debug(f"Compressed accounts and notices for {len(agent_fields)} agents ({sum(len(a) + len(n) for a, n in agent_fields.values())} bytes | {codec} | {time.time()-start:.4f}s).")
+        synapses = {}
+        for uid, (accounts, notices) in agent_fields.items():
+            delta = 'book_deltas' in shared and uid in delta_uids
+            synapses[uid] = self.model_copy(update={
+                'config' : shared.get('config'),
+                'books' : shared['no_books'] if delta else shared['books'],
+                'book_deltas' : shared['book_deltas'] if delta else None,
+                'book_base' : base.timestamp if delta else None,
+                'accounts' : accounts,
+                'notices' : notices,
+                'compressed' : True
+            })
+        return synapses
+
+    def apply_deltas(self, books : dict[int, Book]):
+        """
+        Method to reconstruct the orderbook state from `book_deltas`, given the books of the previously received state identified by `book_base`.
+        Where the deltas were decoded as structs, the books are reconstructed as structs and assigned without validation.
+        """
+        books = {bookId : delta.apply(books[bookId]) for bookId, delta in self.book_deltas.items()}
+        if any(isinstance(book, structs.FinanceStruct) for book in books.values()):
+            self.__dict__['books'] = books
+        else:
+            self.books = books
+        self.book_deltas = None
         return self
 
-    def compress(self):
+    def compress(self, codec : str = 'zlib', level : int | None = None):
         """
         Method to compress large synapse fields for transmission over the network.
 
+        The fields are compressed concurrently using the specified codec (one of `COMPRESSION_CODECS`); `decompress` identifies the codec automatically.
         Note this method DOES NOT modify the synapse in place, so that the original synapse data can be referenced after sending without requiring decompression.
         """
         try:
             if not self.compressed:
                 compressed = self.model_copy()
+                fields = {}
                 if self.books != {}:
-                    compressed.books = pybase64.b64encode(zlib.compress(msgspec.json.encode({bookId : book.model_dump(mode='json') for bookId, book in self.books.items()}))).decode("ascii")
-                    compressed.accounts = pybase64.b64encode(zlib.compress(msgspec.json.encode({accountId : {bookId : account.model_dump(mode='json') for bookId, account in accounts.items()} for accountId, accounts in self.accounts.items()}))).decode("ascii")
-                    compressed.notices = pybase64.b64encode(zlib.compress(msgspec.json.encode({agentId : [notice.model_dump(mode='json') for notice in notices] for agentId, notices in self.notices.items()}))).decode("ascii")
-                    compressed.config = pybase64.b64encode(zlib.compress(msgspec.json.encode(compressed.config.model_dump(mode='json')))).decode("ascii")
+                    fields['books'] = self.books
+                    fields['accounts'] = self.accounts
+                    fields['notices'] = self.notices
+                    fields['config'] = compressed.config.model_dump(mode='json')
+                if self.book_deltas:
+                    fields['book_deltas'] = self.book_deltas
                 if compressed.response:
-                    compressed.response = pybase64.b64encode(zlib.compress(msgspec.json.encode(compressed.response.model_dump(mode='json')))).decode("ascii")
+                    fields['response'] = compressed.response.model_dump(mode='json')
+                for name, data in _compress_fields(fields, codec, level).items():
+                    setattr(compressed, name, data)
                 compressed.compressed = True
                 return compressed
             else:
@@ -188,16 +359,24 @@ class MarketSimulationStateUpdate(SimulationStateUpdate):
         Method to decompress large synapse fields after transmission over the network.
 
         Note this method DOES modify the synapse in place, so that the synapse can be used normally after decompression.
+
+        The state fields are decoded directly into the `msgspec.Struct` mirrors defined in `taos.im.protocol.structs`, and are assigned without pydantic validation;
+        if the data does not match the struct layout, the fields are instead validated into the equivalent pydantic models.
         """
         try:
             if self.compressed:
-                if self.books != {}:
-                    self.books = msgspec.json.decode(zlib.decompress(pybase64.b64decode(self.books)))
-                    self.accounts = msgspec.json.decode(zlib.decompress(pybase64.b64decode(self.accounts)))
-                    self.notices = msgspec.json.decode(zlib.decompress(pybase64.b64decode(self.notices)))
-                    self.config = msgspec.json.decode(zlib.decompress(pybase64.b64decode(self.config)))
+                state = self.books != {}
+                fields = (['books', 'accounts', 'notices'] if state else []) + (['book_deltas'] if self.book_deltas else [])
+                try:
+                    self.__dict__.update({name : _decompress_field(getattr(self, name), structs.DECODERS[name]) for name in fields})
+                except msgspec.ValidationError as ex:
+                    bt.logging.warning(f"Unable to decode {self.name} synapse data to structs - validating as models : {ex}")
+                    for name in fields:
+                        setattr(self, name, _decompress_field(getattr(self, name)))
+                if state:
+                    self.config = _decompress_field(self.config)
                 if self.response:
-                    self.response = msgspec.json.decode(zlib.decompress(pybase64.b64decode(self.response)))
+                    self.response = _decompress_field(self.response)
                 self.compressed = False
             return self
         except Exception as ex:
@@ -499,6 +499,55 @@ class Book(BaseModel):
                             None) for event in json['record']]
         return Book(id=id,bids=bids,asks=asks,events=events)
 
+class BookDelta(BaseModel):
+    """
+    Represents the changes to an orderbook relative to a previously published state of the book.
+
+    Attributes:
+    - id: ID of the orderbook in the simulation.
+    - bids: List of LevelInfo objects representing the BID levels which are new or have changed since the previous state.
+    - asks: List of LevelInfo objects representing the ASK levels which are new or have changed since the previous state.
+    - removed_bids: Prices of the BID levels in the previous state which are no longer present.
+    - removed_asks: Prices of the ASK levels in the previous state which are no longer present.
+    - events: List of models representing the events having occurred on the book since the last state update.
+    """
+    id : int
+    bids : list[LevelInfo]
+    asks : list[LevelInfo]
+    removed_bids : list[float]
+    removed_asks : list[float]
+    events : list[Order | TradeInfo | Cancellation] | None
+
+    @staticmethod
+    def diff(base_levels : list, levels : list) -> tuple[list, list[float]]:
+        """
+        Method to obtain the levels which are new or changed relative to `base_levels`, and the prices of the levels in `base_levels` which are no longer present.
+        """
+        base = {level.price : level for level in base_levels}
+        changed = [level for level in levels if base.get(level.price) != level]
+        prices = {level.price for level in levels}
+        return changed, [price for price in base if price not in prices]
+
+    @classmethod
+    def from_books(cls, base : Book, book : Book):
+        """
+        Method to construct the delta which transforms the `base` state of an orderbook into `book`.
+        """
+        bids, removed_bids = cls.diff(base.bids, book.bids)
+        asks, removed_asks = cls.diff(base.asks, book.asks)
+        return BookDelta(id=book.id,bids=bids,asks=asks,removed_bids=removed_bids,removed_asks=removed_asks,events=book.events)
+
+    def apply(self, base : Book) -> Book:
+        """
+        Method to reconstruct the current state of the orderbook from the `base` state against which the delta was taken.
+        """
+        def merge(levels, changed, removed, descending):
+            removed = set(removed)
+            merged = {level.price : level for level in levels if level.price not in removed}
+            merged.update({level.price : level for level in changed})
+            return sorted(merged.values(), key=lambda level: level.price, reverse=descending)
+        return Book(id=self.id,bids=merge(base.bids, self.bids, self.removed_bids, True),asks=merge(base.asks, self.asks, self.removed_asks, False),events=self.events)
+
 class Balance(BaseModel):
     """
     Represents an account balance for a specific currency.
@@ -0,0 +1,143 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+"""
+Bounded parser for the responses returned by miners to validators.
+
+Responses are decoded with msgspec rather than validated into the pydantic `FinanceAgentResponse`, in a way that bounds the work done for each miner:
+the decompressed size of the response is limited, and the instruction list is first split into its raw serialized elements without constructing any objects.
+The elements are then read in order, decoding only the header fields used to validate each (see `InstructionHeader`).  Once no later instruction could be accepted,
+the remaining elements are only checked for any instruction which would cause the response to be rejected (see `InstructionIdentity`).
+The instructions read are decoded in full into their struct mirrors (see `taos.im.protocol.structs`) in a single pass.
+
+The parser applies no validation rules other than those needed to bound reading; the instructions read are validated across all miners by `taos.im.utils.instructions.InstructionBatch`.
+"""
+import math
+import time
+import pybase64
+import msgspec
+from typing import Annotated
+from taos.im.protocol import FinanceAgentResponse, _decompress_bytes, _encode_model
+from taos.im.protocol import structs
+
+MAX_INSTRUCTIONS = 200000
+ACCEPTED_TYPES = frozenset({'PLACE_ORDER_MARKET', 'PLACE_ORDER_LIMIT', 'CANCEL_ORDERS'})
+
+class ResponseEnvelope(msgspec.Struct):
+    """
+    The serialized layout of a `FinanceAgentResponse`, with each instruction left undecoded.
+    """
+    agent_id : int
+    instructions : Annotated[list[msgspec.Raw], msgspec.Meta(max_length=MAX_INSTRUCTIONS)] = []
+
+class InstructionHeader(msgspec.Struct):
+    """
+    The fields of an instruction used in validation, with defaults for those fields not present on all instruction types.
+    """
+    agentId : int
+    type : str
+    bookId : int = -1
+    direction : int = -1
+    quantity : float = math.nan
+    price : float = math.nan
+    stp : int = -1
+    delay : int = 0
+
+class InstructionIdentity(msgspec.Struct):
+    """
+    The fields of an instruction which determine whether the response submitting it is to be rejected.
+    """
+    agentId : int
+    type : str
+
+class ParsedResponse(msgspec.Struct):
+    """
+    Result of parsing the response of a miner.
+
+    Attributes:
+    - response: The response containing the instructions read as struct records, or `None` if the response was invalid.
+    - headers: The headers of the instructions in `response`.
+    - received: The number of instructions in the response.
+    - parse_time: The time in seconds taken to decompress and parse the response.
+    - error: Description of the reason the response was rejected, if any.
+    """
+    response : FinanceAgentResponse | None = None
+    headers : list[InstructionHeader] = []
+    received : int = 0
+    parse_time : float = 0.0
+    error : str | None = None
+
+_envelope_decoder = msgspec.json.Decoder(ResponseEnvelope)
+_header_decoder = msgspec.json.Decoder(InstructionHeader)
+_identity_decoder = msgspec.json.Decoder(InstructionIdentity)
+_instructions_decoder = msgspec.json.Decoder(list[structs.Instruction])
+
+def parse_response(data : str | FinanceAgentResponse, uid : int, books : int, max_instructions_per_book : int, capped : set[int] = frozenset(), max_size : int | None = None) -> ParsedResponse:
+    """
+    Parses the response of a miner, reading at most `max_instructions_per_book` order placements and as many cancellations on each book, in the order in which they were submitted;
+    these always include every instruction which can be accepted.  Reading of a book stops once no later instruction on it could be accepted, which for books in `capped`
+    (on which the miner has reached its volume cap, and so may only cancel orders) is once the limit of cancellations is reached.
+    Instructions for books which do not exist in the simulation are skipped, and reading stops at any instruction submitted for another agent or of a type other than
+    an order placement or cancellation, as the response will be rejected; once no later instruction could be accepted, the remaining instructions are still checked for these.
+
+    If the response is submitted for an agent other than `uid`, or cannot be decoded, it is rejected and `response` is `None`.
+
+    Args:
+    - data: The compressed response as returned by the miner, or a response which was received uncompressed.
+    - uid: The UID of the miner which submitted the response.
+    - books: The number of books in the simulation.
+    - max_instructions_per_book: The maximum number of instructions accepted for each book.
+    - capped: The IDs of the books on which the miner has reached its volume cap.
+    - max_size: The maximum decompressed size of the response in bytes.
+
+    Returns:
+    - ParsedResponse: The instructions read and metrics of the parsing.
+    """
+    start = time.perf_counter()
+    result = ParsedResponse()
+    try:
+        if isinstance(data, FinanceAgentResponse):
+            data = msgspec.json.encode(data, enc_hook=_encode_model)
+        else:
+            data = _decompress_bytes(pybase64.b64decode(data), max_size)
+        envelope = _envelope_decoder.decode(data)
+        result.received = len(envelope.instructions)
+        if envelope.agent_id != uid:
+            result.error = f"Mismatched Agent Ids : Response submitted for agent {envelope.agent_id}"
+            return result
+        placements = [0] * books
+        cancellations = [0] * books
+        complete = lambda book : cancellations[book] == max_instructions_per_book or (book not in capped and placements[book] + cancellations[book] >= max_instructions_per_book)
+        completed = sum(complete(book) for book in range(books))
+        headers = []
+        raws = []
+        for raw in envelope.instructions:
+            if completed == books:
+                identity = _identity_decoder.decode(raw)
+                if identity.agentId == uid and identity.type in ACCEPTED_TYPES:
+                    continue
+            header = _header_decoder.decode(raw)
+            if header.agentId != uid or header.type not in ACCEPTED_TYPES:
+                headers.append(header)
+                raws.append(raw)
+                break
+            book = header.bookId
+            if not 0 <= book < books or complete(book):
+                continue
+            if header.type == 'CANCEL_ORDERS':
+                cancellations[book] += 1
+            elif placements[book] < max_instructions_per_book:
+                placements[book] += 1
+            else:
+                continue
+            completed += complete(book)
+            headers.append(header)
+            raws.append(raw)
+        instructions = _instructions_decoder.decode(b'[' + b','.join(raws) + b']')
+        result.response = FinanceAgentResponse.model_construct(agent_id=uid, instructions=instructions)
+        result.headers = headers
+    except Exception as ex:
+        result.response = None
+        result.error = f"Invalid response : {ex}"
+    finally:
+        result.parse_time = time.perf_counter() - start
+    return result
@@ -1,5 +1,6 @@
 # SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
 # SPDX-License-Identifier: MIT
+import msgspec
 from pydantic import BaseModel
 from typing import Any
 from copy import deepcopy
@@ -346,4 +347,59 @@ class SimulatorResponseBatch(BaseModel):
         """
         return {
             "responses": [response.serialize() for response in self.responses]
-        }
\ No newline at end of file
+        }
+
+    def encode(self, encoding : str = 'json') -> bytes:
+        """
+        Encodes the batch of responses for transmission to the simulator.
+
+        Args:
+        - encoding: The wire encoding negotiated with the simulator, one of `json` or `msgpack`.
+
+        Returns:
+        - The encoded response batch.
+        """
+        if encoding not in RESPONSE_ENCODERS:
+            raise ValueError(f"Unsupported response encoding '{encoding}'")
+        return RESPONSE_ENCODERS[encoding].encode(self.serialize())
+
+    @staticmethod
+    def encode_instructions(batch, encoding : str = 'json') -> bytes:
+        """
+        Encodes the validated instructions of all agents held in a `taos.im.utils.instructions.InstructionBatch` for transmission to the simulator,
+        in the same layout as an encoded `SimulatorResponseBatch`.  The agent ID and delay of each instruction are taken from the columns of the batch,
+        and the response body is encoded by msgspec in a single pass from structs, without constructing intermediate dictionaries or models.
+
+        Args:
+        - batch: The validated instructions.
+        - encoding: The wire encoding, one of `json` or `msgpack`.  The simulator decodes `msgpack` responses to the same JSON document which is read by `Message::fromJsonResponse`.
+
+        Returns:
+        - The encoded response body.
+        """
+        if encoding not in RESPONSE_ENCODERS:
+            raise ValueError(f"Unsupported response encoding '{encoding}'")
+        return RESPONSE_ENCODERS[encoding].encode(SimulatorResponseBody([
+            SimulatorInstruction(agentId, delay, record.type, record.payload())
+            for agentId, delay, record in zip(batch.agent.tolist(), batch.delay.tolist(), batch.records)
+        ]))
+
+class SimulatorInstruction(msgspec.Struct):
+    """
+    Serialized layout of an instruction returned to the simulator; equivalent to `SimulatorAgentResponse`.
+    """
+    agentId : int
+    delay : int
+    type : str
+    payload : Any
+
+class SimulatorResponseBody(msgspec.Struct):
+    """
+    Serialized layout of the batch of instructions returned to the simulator; equivalent to `SimulatorResponseBatch`.
+    """
+    responses : list[SimulatorInstruction]
+
+RESPONSE_ENCODERS = {
+    'json' : msgspec.json.Encoder(),
+    'msgpack' : msgspec.msgpack.Encoder()
+}
\ No newline at end of file
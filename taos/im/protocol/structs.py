@@ -0,0 +1,668 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+import msgspec
+from typing import ClassVar, Annotated
+from taos.im.protocol import models, events, instructions
+
+"""
+Lightweight `msgspec.Struct` mirrors of the state models defined in `taos.im.protocol.models` and `taos.im.protocol.events`.
+
+These are used on the validator hot path to populate state updates received from the simulator without incurring the cost of pydantic validation,
+and by miners to decode compressed state updates directly into typed objects via the decoders in `DECODERS`.
+Field names and serialized layout are identical to their pydantic counterparts, so that the two representations can be used interchangeably
+by code which only reads attributes, and so that the data published to miners is unchanged.  The equivalent pydantic object can be obtained from
+any struct by calling `model()`.
+
+Notice events are tagged on their `type` field, with a separate class for the error variant of each response event, so that they are decoded as a tagged union.
+Orderbook events carry no tag, and are decoded according to their fields by `decode_hook`.
+
+The instructions submitted by miners are mirrored in the same way, tagged on their `type`, so that validators can decode responses into compact typed records
+(see `taos.im.protocol.parser`); the constraints on instruction fields are the same as those of the pydantic models.
+"""
+
+class FinanceStruct(msgspec.Struct, kw_only=True):
+    """
+    Base class for struct mirrors of the subnet models.
+    """
+    _model : ClassVar[type] = None
+
+    def model(self):
+        """
+        Method to construct the equivalent (validated) pydantic model for the struct.
+        """
+        return self._model.model_validate(msgspec.to_builtins(self))
+
+    def __str__(self):
+        return str(self.model())
+
+class BookEvent:
+    """
+    Base for the structs representing events occurring on an orderbook (`Order`, `TradeInfo` and `Cancellation`).
+    """
+    __slots__ = ()
+
+class Order(FinanceStruct, BookEvent, kw_only=True):
+    """
+    Represents an order; mirrors `taos.im.protocol.models.Order`.
+    """
+    _model = models.Order
+    id : int
+    client_id : int | None = None
+    timestamp : int
+    quantity : float
+    side : int
+    order_type : str
+    price : float | None
+
+    @classmethod
+    def from_event(cls, event : dict):
+        """
+        Method to extract model data from simulation event in the format required by the MarketSimulationStateUpdate synapse.
+        """
+        return Order(id=event['orderId'],client_id=event['clientOrderId'], timestamp=event['timestamp'],quantity=event['volume'],side=event['direction'],order_type="limit" if event['price'] else 'market',price=event['price'])
+
+    @classmethod
+    def from_account(cls, acc_order : dict):
+        """
+        Method to extract model data from simulation account representation in the format required by the MarketSimulationStateUpdate synapse.
+        """
+        return Order(id=acc_order['orderId'],client_id=acc_order['clientOrderId'], timestamp=acc_order['timestamp'],quantity=acc_order['volume'],side=acc_order['direction'],order_type="limit",price=acc_order['price'])
+
+class LevelInfo(FinanceStruct, kw_only=True):
+    """
+    Represents an orderbook level; mirrors `taos.im.protocol.models.LevelInfo`.
+    """
+    _model = models.LevelInfo
+    price : float
+    quantity : float
+    orders : list[Order] | None
+
+    @classmethod
+    def from_json(cls, json : dict):
+        """
+        Method to transform simulator format model to the format required by the MarketSimulationStateUpdate synapse.
+        """
+        if not 'orders' in json:
+            orders = None
+        else:
+            price = json['price']
+            orders = [Order(id=order['orderId'], timestamp=order['timestamp'],quantity=order['volume'],side=order['direction'],order_type="limit",price=price) for order in json['orders']]
+        return LevelInfo(price=json['price'], quantity=json['volume'], orders=orders)
+
+class TradeInfo(FinanceStruct, BookEvent, kw_only=True):
+    """
+    Represents a trade; mirrors `taos.im.protocol.models.TradeInfo`.
+    """
+    _model = models.TradeInfo
+    id : int
+    side : int
+    timestamp : int
+    taker_id : int
+    taker_agent_id : int
+    maker_id : int
+    maker_agent_id : int
+    quantity : float
+    price : float
+    maker_fee : float | None = None
+    taker_fee : float | None = None
+
+    @classmethod
+    def from_event(cls, event : dict):
+        """
+        Method to extract model data from simulation event in the format required by the MarketSimulationStateUpdate synapse.
+        """
+        return TradeInfo(id=event['tradeId'],timestamp=event['timestamp'],quantity=event['volume'],side=event['direction'],price=event['price'],
+                         taker_agent_id=event['aggressingAgentId'], taker_id=event['aggressingOrderId'], maker_agent_id=event['restingAgentId'], maker_id=event['restingOrderId'],
+                         maker_fee=event['fees']['maker'], taker_fee=event['fees']['taker'])
+
+class Cancellation(FinanceStruct, BookEvent, kw_only=True):
+    """
+    Represents an order cancellation; mirrors `taos.im.protocol.models.Cancellation`.
+    """
+    _model = models.Cancellation
+    orderId : int
+    quantity : float | None
+
+    @classmethod
+    def from_event(cls, event : dict):
+        """
+        Method to extract model data from simulation event in the format required by the MarketSimulationStateUpdate synapse.
+        """
+        return Cancellation(orderId=event['orderId'],quantity=event['volume'])
+
+class Book(FinanceStruct, kw_only=True):
+    """
+    Represents an orderbook; mirrors `taos.im.protocol.models.Book`.
+    """
+    _model = models.Book
+    id : int
+    bids : list[LevelInfo]
+    asks : list[LevelInfo]
+    events : list[BookEvent] | None
+
+    @classmethod
+    def from_json(cls, json : dict):
+        """
+        Method to transform simulator format model to the format required by the MarketSimulationStateUpdate synapse.
+        """
+        bids = []
+        asks = []
+        if json['bid']:
+            bids = [LevelInfo.from_json(bid) for bid in json['bid'][:21]]
+        if json['ask']:
+            asks = [LevelInfo.from_json(ask) for ask in json['ask'][:21]]
+        events = []
+        if json['record']:
+            events = [Order.from_event(event) if event['event'] == 'place' else
+                    (TradeInfo.from_event(event)) if event['event'] == 'trade' else
+                        (Cancellation.from_event(event) if event['event'] == 'cancel' else
+                            None) for event in json['record']]
+        return Book(id=json['bookId'],bids=bids,asks=asks,events=events)
+
+    def arrays(self):
+        """
+        Method to obtain the price and quantity of the bid and ask levels as NumPy arrays of shape (levels, 2), for use in vectorized agent logic.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: The bid and ask levels, in the order in which they appear in the book.
+        """
+        import numpy as np
+        return (np.array([(level.price, level.quantity) for level in self.bids], dtype=np.float64).reshape(-1, 2),
+                np.array([(level.price, level.quantity) for level in self.asks], dtype=np.float64).reshape(-1, 2))
+
+class BookDelta(FinanceStruct, kw_only=True):
+    """
+    Represents the changes to an orderbook relative to a previous state; mirrors `taos.im.protocol.models.BookDelta`.
+    """
+    _model = models.BookDelta
+    id : int
+    bids : list[LevelInfo]
+    asks : list[LevelInfo]
+    removed_bids : list[float]
+    removed_asks : list[float]
+    events : list[BookEvent] | None
+
+    @classmethod
+    def from_books(cls, base : Book, book : Book):
+        """
+        Method to construct the delta which transforms the `base` state of an orderbook into `book`.
+        """
+        bids, removed_bids = models.BookDelta.diff(base.bids, book.bids)
+        asks, removed_asks = models.BookDelta.diff(base.asks, book.asks)
+        return BookDelta(id=book.id,bids=bids,asks=asks,removed_bids=removed_bids,removed_asks=removed_asks,events=book.events)
+
+    def apply(self, base : Book) -> Book:
+        """
+        Method to reconstruct the current state of the orderbook from the `base` state against which the delta was taken.
+        """
+        def merge(levels, changed, removed, descending):
+            removed = set(removed)
+            merged = {level.price : level for level in levels if level.price not in removed}
+            merged.update({level.price : level for level in changed})
+            return sorted(merged.values(), key=lambda level: level.price, reverse=descending)
+        return Book(id=self.id,bids=merge(base.bids, self.bids, self.removed_bids, True),asks=merge(base.asks, self.asks, self.removed_asks, False),events=self.events)
+
+class Balance(FinanceStruct, kw_only=True):
+    """
+    Represents an account balance for a specific currency; mirrors `taos.im.protocol.models.Balance`.
+    """
+    _model = models.Balance
+    currency : str
+    total : float
+    free : float
+    reserved : float
+
+    @classmethod
+    def from_json(cls, currency : str, json : dict):
+        """
+        Method to transform simulator format model to the format required by the MarketSimulationStateUpdate synapse.
+        """
+        return Balance(currency=currency,total=json['total'],free=json['free'],reserved=json['reserved'])
+
+class Fees(FinanceStruct, kw_only=True):
+    """
+    Represents account fees for a specific agent and book; mirrors `taos.im.protocol.models.Fees`.
+    """
+    _model = models.Fees
+    volume_traded : float
+    maker_fee_rate : float
+    taker_fee_rate : float
+
+    @classmethod
+    def from_json(cls, json : dict):
+        """
+        Method to transform simulator format model to the format required by the MarketSimulationStateUpdate synapse.
+        """
+        return Fees(volume_traded=json['volume'],maker_fee_rate=json['makerFeeRate'],taker_fee_rate=json['takerFeeRate'])
+
+class Account(FinanceStruct, kw_only=True):
+    """
+    Represents an agent's trading account; mirrors `taos.im.protocol.models.Account`.
+    """
+    _model = models.Account
+    agent_id : int
+    book_id : int
+    base_balance : Balance
+    quote_balance : Balance
+    orders : list[Order] = []
+    fees : Fees | None
+
+    @classmethod
+    def from_json(cls, book_id : int, json : dict):
+        """
+        Method to transform the simulator format account for a single book to the format required by the MarketSimulationStateUpdate synapse.
+        """
+        holdings = json['balances']['holdings'][book_id]
+        orders = json['orders'][book_id] if json['orders'] else None
+        return Account(
+            agent_id=json['agentId'],book_id=book_id,
+            base_balance=Balance.from_json(currency='BASE', json=holdings['base']),
+            quote_balance=Balance.from_json(currency='QUOTE', json=holdings['quote']),
+            orders=[Order.from_account(order) for order in orders] if orders else [],
+            fees=Fees.from_json(json['fees'][str(book_id)]) if json['fees'] else None
+        )
+
+class FinanceEvent(FinanceStruct, tag_field='type', kw_only=True):
+    """
+    Base class for struct mirrors of the events defined in `taos.im.protocol.events`.
+    The `type` of the event is the tag of its class.
+    """
+    timestamp : int
+    agentId : int | None
+
+    @property
+    def type(self) -> str:
+        return self.__struct_config__.tag
+
+    @classmethod
+    def from_json(cls, json : dict):
+        """
+        Method to transform agent event messages generated by simulator to the format required by the MarketSimulationStateUpdate synapse.
+        """
+        match json['type']:
+            case "EVENT_SIMULATION_START":
+                return SimulationStartEvent(timestamp=json['timestamp'], agentId=None, logDir=json['payload']['logDir'])
+            case "RESPONSE_DISTRIBUTED_PLACE_ORDER_LIMIT" | "ERROR_RESPONSE_DISTRIBUTED_PLACE_ORDER_LIMIT":
+                return LimitOrderPlacementEvent.from_json(json)
+            case "RESPONSE_DISTRIBUTED_PLACE_ORDER_MARKET" | "ERROR_RESPONSE_DISTRIBUTED_PLACE_ORDER_MARKET":
+                return MarketOrderPlacementEvent.from_json(json)
+            case "EVENT_TRADE":
+                return TradeEvent.from_json(json)
+            case "RESPONSE_DISTRIBUTED_CANCEL_ORDERS" | "ERROR_RESPONSE_DISTRIBUTED_CANCEL_ORDERS":
+                return OrderCancellationsEvent.from_json(json)
+            case "RESPONSE_DISTRIBUTED_RESET_AGENT" | "ERROR_RESPONSE_DISTRIBUTED_RESET_AGENT":
+                return ResetAgentsEvent.from_json(json)
+            case "EVENT_SIMULATION_STOP":
+                return SimulationEndEvent(timestamp=json['timestamp'], agentId=None)
+
+class SimulationStartEvent(FinanceEvent, tag='EVENT_SIMULATION_START', kw_only=True):
+    """
+    Represents the event generated on simulation start; mirrors `taos.im.protocol.events.SimulationStartEvent`.
+    """
+    _model = events.SimulationStartEvent
+    logDir : str
+
+class SimulationEndEvent(FinanceEvent, tag='EVENT_SIMULATION_STOP', kw_only=True):
+    """
+    Represents the event generated on simulation end; mirrors `taos.im.protocol.events.SimulationEndEvent`.
+    """
+    _model = events.SimulationEndEvent
+
+class OrderPlacementEvent(FinanceEvent, kw_only=True):
+    """
+    Base class for events corresponding to placement of an order; mirrors `taos.im.protocol.events.OrderPlacementEvent`.
+    """
+    bookId : int | None = None
+    orderId : int | None
+    clientOrderId : int | None
+    side : int
+    quantity : float
+    success : bool
+    message : str
+
+class LimitOrderPlacementEvent(OrderPlacementEvent, tag='RESPONSE_DISTRIBUTED_PLACE_ORDER_LIMIT', kw_only=True):
+    """
+    Represents the event generated on placement of a Limit Order; mirrors `taos.im.protocol.events.LimitOrderPlacementEvent`.
+    """
+    _model = events.LimitOrderPlacementEvent
+    price : float
+
+    @classmethod
+    def from_json(cls, json : dict):
+        """
+        Method to transform simulator format event message to the format required by the MarketSimulationStateUpdate synapse.
+        """
+        payload = json['payload']['payload']
+        request = payload['requestPayload']
+        if json['type'] == 'RESPONSE_DISTRIBUTED_PLACE_ORDER_LIMIT':
+            return LimitOrderPlacementEvent(
+                timestamp=json['timestamp'], agentId=json['payload']['agentId'],
+                bookId=request['bookId'], orderId=payload['orderId'], clientOrderId=request['clientOrderId'],
+                side=request['direction'], price=request['price'], quantity=request['volume'],
+                success=True,message=f"{'Buy' if request['direction'] == 0 else 'Sell'} Limit Order {payload['orderId']} placed successfully for {request['volume']}@{request['price']}!"
+            )
+        elif json['type'] == 'ERROR_RESPONSE_DISTRIBUTED_PLACE_ORDER_LIMIT':
+            return LimitOrderPlacementErrorEvent(
+                timestamp=json['timestamp'], agentId=json['payload']['agentId'],
+                bookId=request['bookId'], orderId=None, clientOrderId=request['clientOrderId'],
+                side=request['direction'], price=request['price'], quantity=request['volume'],
+                success=False,message=payload['errorPayload']['message']
+            )
+
+class MarketOrderPlacementEvent(OrderPlacementEvent, tag='RESPONSE_DISTRIBUTED_PLACE_ORDER_MARKET', kw_only=True):
+    """
+    Represents the event generated on placement of a Market Order; mirrors `taos.im.protocol.events.MarketOrderPlacementEvent`.
+    """
+    _model = events.MarketOrderPlacementEvent
+
+    @classmethod
+    def from_json(cls, json : dict):
+        """
+        Method to transform simulator format event message to the format required by the MarketSimulationStateUpdate synapse.
+        """
+        payload = json['payload']['payload']
+        request = payload['requestPayload']
+        if json['type'] == 'RESPONSE_DISTRIBUTED_PLACE_ORDER_MARKET':
+            return MarketOrderPlacementEvent(
+                timestamp=json['timestamp'], agentId=json['payload']['agentId'],
+                bookId=request['bookId'], orderId=payload['orderId'], clientOrderId=request['clientOrderId'],
+                side=request['direction'], quantity=request['volume'],
+                success=True,message=f"{'Buy' if request['direction'] == 0 else 'Sell'} Market Order {payload['orderId']} placed successfully for {request['volume']}!"
+            )
+        elif json['type'] == 'ERROR_RESPONSE_DISTRIBUTED_PLACE_ORDER_MARKET':
+            return MarketOrderPlacementErrorEvent(
+                timestamp=json['timestamp'], agentId=json['payload']['agentId'],
+                bookId=request['bookId'], orderId=None, clientOrderId=request['clientOrderId'],
+                side=request['direction'], quantity=request['volume'],
+                success=False,message=payload['errorPayload']['message']
+            )
+
+class OrderCancellationEvent(FinanceStruct, kw_only=True):
+    """
+    Represents cancellation of a single order; mirrors `taos.im.protocol.events.OrderCancellationEvent`.
+    """
+    _model = events.OrderCancellationEvent
+    timestamp : int
+    bookId : int
+    orderId : int
+    quantity : float | None
+    success : bool
+    message : str
+
+class OrderCancellationsEvent(FinanceEvent, tag='RESPONSE_DISTRIBUTED_CANCEL_ORDERS', kw_only=True):
+    """
+    Represents the event generated on cancellation of a list of orders; mirrors `taos.im.protocol.events.OrderCancellationsEvent`.
+    """
+    _model = events.OrderCancellationsEvent
+    bookId : int | None = None
+    cancellations : list[OrderCancellationEvent] = []
+
+    @classmethod
+    def from_json(cls, json : dict):
+        """
+        Method to transform simulator format event message to the format required by the MarketSimulationStateUpdate synapse.
+        """
+        agentId = json['payload']['agentId']
+        bookId = json['payload']['payload']['requestPayload']['bookId']
+        success = json['type'] == 'RESPONSE_DISTRIBUTED_CANCEL_ORDERS'
+        cancellations = []
+        if success or json['type'] == 'ERROR_RESPONSE_DISTRIBUTED_CANCEL_ORDERS':
+            cancellations = [
+                OrderCancellationEvent(timestamp=json['timestamp'],
+                    bookId=bookId, orderId=cancellation['orderId'], quantity=cancellation['volume'], success=success,
+                    message=f"Cancelled order {cancellation['orderId']} on book {bookId} for agent {agentId}." if success else "Order Id does not exist!"
+                ) for cancellation in json['payload']['payload']['requestPayload']['cancellations']
+            ]
+        return (OrderCancellationsEvent if success else OrderCancellationsErrorEvent)(timestamp=json['timestamp'], agentId=agentId, bookId=bookId, cancellations=cancellations)
+
+class TradeEvent(FinanceEvent, tag='EVENT_TRADE', kw_only=True):
+    """
+    Represents the event generated on execution of trade; mirrors `taos.im.protocol.events.TradeEvent`.
+    """
+    _model = events.TradeEvent
+    bookId : int | None = None
+    tradeId : int
+    clientOrderId : int | None
+    takerAgentId : int
+    takerOrderId : int
+    makerAgentId : int
+    makerOrderId : int
+    side : int
+    price : float
+    quantity : float
+    makerFee : float
+    takerFee : float
+
+    @classmethod
+    def from_json(cls, json : dict):
+        """
+        Method to transform simulator format event message to the format required by the MarketSimulationStateUpdate synapse.
+        """
+        payload = json['payload']['payload']
+        trade = payload['trade']
+        context = payload['context']
+        return TradeEvent(
+            timestamp=json['timestamp'], agentId=json['payload']['agentId'],
+            bookId=payload['bookId'], tradeId=trade['tradeId'], clientOrderId=payload['clientOrderId'],
+            takerAgentId=context['aggressingAgentId'], takerOrderId=trade['aggressingOrderId'],
+            makerAgentId=context['restingAgentId'], makerOrderId=trade['restingOrderId'],
+            side=trade['direction'], price=trade['price'], quantity=trade['volume'],
+            makerFee=context['fees']['maker'], takerFee=context['fees']['taker']
+        )
+
+class ResetAgentEvent(FinanceStruct, kw_only=True):
+    """
+    Represents the event generated when a single agent account is reset; mirrors `taos.im.protocol.events.ResetAgentEvent`.
+    """
+    _model = events.ResetAgentEvent
+    type : str
+    timestamp : int
+    agentId : int | None
+    success : bool
+    message : str
+
+class ResetAgentsEvent(FinanceEvent, tag='RESPONSE_DISTRIBUTED_RESET_AGENT', kw_only=True):
+    """
+    Represents the event generated on reset of a list of agents; mirrors `taos.im.protocol.events.ResetAgentsEvent`.
+    """
+    _model = events.ResetAgentsEvent
+    resets : list[ResetAgentEvent] = []
+
+    @classmethod
+    def from_json(cls, json : dict):
+        """
+        Method to transform simulator format event message to the format required by the MarketSimulationStateUpdate synapse.
+        """
+        proxyId = json['payload']['agentId']
+        success = json['type'] == 'RESPONSE_DISTRIBUTED_RESET_AGENT'
+        resets = []
+        if success or json['type'] == 'ERROR_RESPONSE_DISTRIBUTED_RESET_AGENT':
+            resets = [
+                ResetAgentEvent(
+                    type=json['type'], timestamp=json['timestamp'], agentId=agentId, success=success,
+                    message=f"Proxy agent {proxyId} successfully reset balances for agent {agentId}." if success else
+                        f"Proxy agent {proxyId} failed to reset balance for agent {agentId} : Agent Id does not exist!"
+                ) for agentId in json['payload']['payload']['agentIds']
+            ]
+        return (ResetAgentsEvent if success else ResetAgentsErrorEvent)(timestamp=json['timestamp'], agentId=proxyId, resets=resets)
+
+class LimitOrderPlacementErrorEvent(LimitOrderPlacementEvent, tag='ERROR_RESPONSE_DISTRIBUTED_PLACE_ORDER_LIMIT', kw_only=True):
+    """
+    Represents the event generated on failure to place a Limit Order.
+    """
+
+class MarketOrderPlacementErrorEvent(MarketOrderPlacementEvent, tag='ERROR_RESPONSE_DISTRIBUTED_PLACE_ORDER_MARKET', kw_only=True):
+    """
+    Represents the event generated on failure to place a Market Order.
+    """
+
+class OrderCancellationsErrorEvent(OrderCancellationsEvent, tag='ERROR_RESPONSE_DISTRIBUTED_CANCEL_ORDERS', kw_only=True):
+    """
+    Represents the event generated on failure to cancel a list of orders.
+    """
+
+class ResetAgentsErrorEvent(ResetAgentsEvent, tag='ERROR_RESPONSE_DISTRIBUTED_RESET_AGENT', kw_only=True):
+    """
+    Represents the event generated on failure to reset a list of agents.
+    """
+
+PositiveFloat = Annotated[float, msgspec.Meta(gt=0)]
+NonNegativeInt = Annotated[int, msgspec.Meta(ge=0)]
+PositiveInt = Annotated[int, msgspec.Meta(gt=0)]
+
+class PlaceMarketOrderPayload(msgspec.Struct):
+    """
+    Payload of a market order placement instruction in the format read by the simulator.
+    """
+    direction : int
+    volume : float
+    bookId : int
+    clientOrderId : int | None
+    stpFlag : int
+    currency : int
+
+class PlaceLimitOrderPayload(msgspec.Struct):
+    """
+    Payload of a limit order placement instruction in the format read by the simulator.
+    """
+    direction : int
+    volume : float
+    price : float
+    bookId : int
+    clientOrderId : int | None
+    postOnly : bool
+    timeInForce : int
+    expiryPeriod : int | None
+    stpFlag : int
+
+class CancelOrdersPayload(msgspec.Struct):
+    """
+    Payload of an order cancellation instruction in the format read by the simulator.
+    """
+    cancellations : list['CancelOrderInstruction']
+    bookId : int
+
+class ResetAgentsPayload(msgspec.Struct):
+    """
+    Payload of an agent reset instruction in the format read by the simulator.
+    """
+    agentIds : list[int]
+
+class FinanceAgentInstruction(FinanceStruct, tag_field='type', kw_only=True):
+    """
+    Base class for struct mirrors of the instructions defined in `taos.im.protocol.instructions`.
+    The `type` of the instruction is the tag of its class.
+    """
+    agentId : int
+    delay : NonNegativeInt = 0
+
+    @property
+    def type(self) -> str:
+        return self.__struct_config__.tag
+
+    def serialize(self) -> dict:
+        return {
+            "agentId": self.agentId,
+            "delay": self.delay,
+            "type": self.type,
+            "payload": self.payload()
+        }
+
+    def payload(self) -> msgspec.Struct:
+        """
+        Method returning the payload of the instruction in the format read by the simulator, as a struct so that it can be encoded directly by msgspec.
+        """
+        ...
+
+class PlaceOrderInstruction(FinanceAgentInstruction, kw_only=True):
+    """
+    Base class for instructions to place an order; mirrors `taos.im.protocol.instructions.PlaceOrderInstruction`.
+    """
+    bookId : NonNegativeInt
+    direction : models.OrderDirection
+    quantity : PositiveFloat
+    clientOrderId : int | None
+    stp : models.STP = models.STP.CANCEL_OLDEST
+    currency : models.OrderCurrency = models.OrderCurrency.BASE
+
+class PlaceMarketOrderInstruction(PlaceOrderInstruction, tag='PLACE_ORDER_MARKET', kw_only=True):
+    """
+    Represents an instruction to place a market order; mirrors `taos.im.protocol.instructions.PlaceMarketOrderInstruction`.
+    """
+    _model = instructions.PlaceMarketOrderInstruction
+
+    def payload(self) -> PlaceMarketOrderPayload:
+        return PlaceMarketOrderPayload(self.direction, self.quantity, self.bookId, self.clientOrderId, self.stp, self.currency)
+
+class PlaceLimitOrderInstruction(PlaceOrderInstruction, tag='PLACE_ORDER_LIMIT', kw_only=True):
+    """
+    Represents an instruction to place a limit order; mirrors `taos.im.protocol.instructions.PlaceLimitOrderInstruction`.
+    """
+    _model = instructions.PlaceLimitOrderInstruction
+    price : PositiveFloat
+    postOnly : bool = False
+    timeInForce : models.TimeInForce = models.TimeInForce.GTC
+    expiryPeriod : PositiveInt | None = None
+
+    def payload(self) -> PlaceLimitOrderPayload:
+        return PlaceLimitOrderPayload(self.direction, self.quantity, self.price, self.bookId, self.clientOrderId, self.postOnly, self.timeInForce, self.expiryPeriod, self.stp)
+
+class CancelOrderInstruction(FinanceStruct, kw_only=True):
+    """
+    Represents the cancellation of a single order; mirrors `taos.im.protocol.instructions.CancelOrderInstruction`.
+    """
+    _model = instructions.CancelOrderInstruction
+    orderId : int
+    volume : PositiveFloat | None
+
+    def serialize(self) -> dict:
+        return {
+            "orderId": self.orderId,
+            "volume": self.volume
+        }
+
+class CancelOrdersInstruction(FinanceAgentInstruction, tag='CANCEL_ORDERS', kw_only=True):
+    """
+    Represents an instruction to cancel a list of orders; mirrors `taos.im.protocol.instructions.CancelOrdersInstruction`.
+    """
+    _model = instructions.CancelOrdersInstruction
+    bookId : NonNegativeInt
+    cancellations : list[CancelOrderInstruction]
+
+    def payload(self) -> CancelOrdersPayload:
+        return CancelOrdersPayload(self.cancellations, self.bookId)
+
+class ResetAgentsInstruction(FinanceAgentInstruction, tag='RESET_AGENT', kw_only=True):
+    """
+    Represents an instruction to reset the accounts of a list of agents; mirrors `taos.im.protocol.instructions.ResetAgentsInstruction`.
+    """
+    _model = instructions.ResetAgentsInstruction
+    agentIds : list[int]
+
+    def payload(self) -> ResetAgentsPayload:
+        return ResetAgentsPayload(self.agentIds)
+
+Instruction = PlaceMarketOrderInstruction | PlaceLimitOrderInstruction | CancelOrdersInstruction | ResetAgentsInstruction
+
+Notice = (SimulationStartEvent | SimulationEndEvent | LimitOrderPlacementEvent | LimitOrderPlacementErrorEvent | MarketOrderPlacementEvent | MarketOrderPlacementErrorEvent
+          | OrderCancellationsEvent | OrderCancellationsErrorEvent | TradeEvent | ResetAgentsEvent | ResetAgentsErrorEvent)
+
+def decode_hook(cls : type, obj):
+    """
+    Decoding hook resolving the untagged orderbook events to the struct having the corresponding fields.
+    """
+    if cls is BookEvent:
+        if 'orderId' in obj:
+            return msgspec.convert(obj, Cancellation)
+        if 'taker_id' in obj:
+            return msgspec.convert(obj, TradeInfo)
+        return msgspec.convert(obj, Order)
+    raise NotImplementedError(f"Objects of type {cls} are not supported")
+
+# Decoders for the serialized state fields of the `MarketSimulationStateUpdate` synapse.
+DECODERS = {
+    'books' : msgspec.json.Decoder(dict[int, Book], dec_hook=decode_hook),
+    'book_deltas' : msgspec.json.Decoder(dict[int, BookDelta], dec_hook=decode_hook),
+    'accounts' : msgspec.json.Decoder(dict[int, dict[int, Account]]),
+    'notices' : msgspec.json.Decoder(dict[int, list[Notice]])
+}
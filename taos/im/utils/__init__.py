@@ -1,3 +1,22 @@
 # SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
 # SPDX-License-Identifier: MIT
-from . import coinbase
+import importlib
+
+# Utility modules are imported on first access, so that using one does not import the dependencies of all others.
+MODULES = [
+    'archive',
+    'coinbase',
+    'fundamental',
+    'instructions',
+    'inventory',
+    'journal',
+    'metrics',
+    'pipeline',
+    'state',
+    'volume'
+]
+
+def __getattr__(name : str):
+    if name in MODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,204 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+# The MIT License (MIT)
+# Copyright © 2023 Yuma Rao
+# Copyright © 2025 Rayleigh Research
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import json
+import time
+import zlib
+import shutil
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List
+
+ARCHIVE_CODECS = ['zstd', 'zlib', 'lz4']
+CHUNK_SIZE = 4 * 1024 * 1024
+
+def compressor(codec : str, level : int | None = None):
+    """
+    Returns a streaming compressor for the codec, having `compress(data)` and `flush()` methods which return the compressed output produced so far.
+    The `zstd` and `lz4` codecs require the `zstandard` and `lz4` packages respectively.
+    """
+    match codec:
+        case 'zstd':
+            import zstandard
+            return zstandard.ZstdCompressor(level=3 if level is None else level).compressobj()
+        case 'zlib':
+            return zlib.compressobj(-1 if level is None else level)
+        case 'lz4':
+            import lz4.frame
+            class LZ4Compressor:
+                def __init__(self):
+                    self.compressor = lz4.frame.LZ4FrameCompressor(compression_level=0 if level is None else level)
+                    self.started = False
+                def compress(self, data):
+                    header = b'' if self.started else self.compressor.begin()
+                    self.started = True
+                    return header + self.compressor.compress(data)
+                def flush(self):
+                    return (b'' if self.started else self.compressor.begin()) + self.compressor.flush()
+            return LZ4Compressor()
+    raise ValueError(f"Unsupported archive codec '{codec}' (must be one of {ARCHIVE_CODECS})")
+
+def decompress(data : bytes, codec : str) -> bytes:
+    """Decompresses a single archived file compressed with the codec."""
+    match codec:
+        case 'zstd':
+            import zstandard
+            return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+        case 'zlib':
+            return zlib.decompress(data)
+        case 'lz4':
+            import lz4.frame
+            return lz4.frame.decompress(data)
+    raise ValueError(f"Unsupported archive codec '{codec}' (must be one of {ARCHIVE_CODECS})")
+
+def compress_file(source : str, destination : str, codec : str, level : int | None, io_budget : float | None) -> Dict[str, float]:
+    """
+    Compresses a file in chunks to the destination path, limiting the rate at which the source is read to the I/O budget.
+    Executed in the archiver process pool.
+
+    Args:
+        source (str): Path of the file to be compressed.
+        destination (str): Path to which the compressed file is written.
+        codec (str): Compression codec; one of `ARCHIVE_CODECS`.
+        level (int | None): Compression level; the default level of the codec if not given.
+        io_budget (float | None): Maximum rate in bytes per second at which the source file is read; unlimited if not given.
+    Returns:
+        Dict[str, float]: Uncompressed and compressed size of the file in bytes, and the time taken to compress it.
+    """
+    start = time.time()
+    size = 0
+    stream = compressor(codec, level)
+    with open(source, 'rb') as input, open(destination, 'wb') as output:
+        while chunk := input.read(CHUNK_SIZE):
+            size += len(chunk)
+            output.write(stream.compress(chunk))
+            if io_budget:
+                # Sleep for long enough to keep the average read rate within the budget
+                delay = size / io_budget - (time.time() - start)
+                if delay > 0:
+                    time.sleep(delay)
+        output.write(stream.flush())
+        compressed_size = output.tell()
+    return {'size' : size, 'compressed_size' : compressed_size, 'time' : time.time() - start}
+
+def read_index(archive : str) -> List[dict]:
+    """
+    Reads the index of an archive written by `archive_directory`, containing an entry for each archived file with its `name`, `offset`, `size`, `compressed_size` and `codec`.
+    The final entry of the index of a completed archive has `complete` set, and holds the totals for the archive.
+    An entry left incomplete by an interrupted write is ignored.
+    """
+    entries = []
+    if os.path.exists(archive + ".index"):
+        with open(archive + ".index", 'r') as file:
+            for line in file:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+    return entries
+
+def read_file(archive : str, name : str) -> bytes:
+    """Reads and decompresses a single file from an archive, seeking directly to its position as recorded in the index."""
+    for entry in read_index(archive):
+        if entry.get('name') == name:
+            with open(archive, 'rb') as file:
+                file.seek(entry['offset'])
+                return decompress(file.read(entry['compressed_size']), entry['codec'])
+    raise FileNotFoundError(f"{name} is not contained in {archive}")
+
+def archive_directory(directory : str, codec : str = 'zstd', level : int | None = None, workers : int = 2, io_budget : float | None = None) -> dict:
+    """
+    Compresses each file of a directory into a single archive at `<directory>.archive`, with an index of the position of each file in the archive written to `<directory>.archive.index`.
+
+    Files are compressed independently in a pool of at most `workers` processes, with the total rate at which files are read limited to `io_budget`,
+    and are appended to the archive as they complete.  Each file is recorded in the index once appended, so that an archive interrupted
+    by a restart of the validator is resumed by compressing only the files not yet indexed.  Once all files are archived the index is marked complete;
+    the directory itself is not removed.
+
+    Args:
+        directory (str): Path of the directory to be archived.
+        codec (str): Compression codec; one of `ARCHIVE_CODECS`.
+        level (int | None): Compression level; the default level of the codec if not given.
+        workers (int): Maximum number of files compressed concurrently.
+        io_budget (float | None): Maximum total rate in bytes per second at which files are read; unlimited if not given.
+    Returns:
+        dict: The final index entry, holding the number of files, total uncompressed and compressed size, compression ratio and throughput of the archive.
+    """
+    directory = Path(directory)
+    archive = str(directory) + ".archive"
+    parts = Path(str(directory) + ".archive.parts")
+    entries = read_index(archive)
+    if entries and entries[-1].get('complete'):
+        return entries[-1]
+    archived = {entry['name'] for entry in entries}
+    # Discard any data appended to the archive after the last indexed file, and rewrite the index without any incomplete entry
+    end = max([entry['offset'] + entry['compressed_size'] for entry in entries], default=0)
+    with open(archive, 'ab') as file:
+        file.truncate(end)
+    with open(archive + ".index", 'w') as index:
+        index.writelines(json.dumps(entry) + "\n" for entry in entries)
+    shutil.rmtree(parts, ignore_errors=True)
+    parts.mkdir()
+    files = sorted(str(path.relative_to(directory)) for path in directory.rglob('*') if path.is_file() and str(path.relative_to(directory)) not in archived)
+    start = time.time()
+    size, compressed_size = 0, 0
+    workers = max(1, min(workers, len(files)))
+    budget = io_budget / workers if io_budget else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool, open(archive, 'ab') as output, open(archive + ".index", 'a') as index:
+            pending = {}
+            queue = list(enumerate(files))
+            while queue or pending:
+                # Submit files only as workers become free, so that the number of partially compressed files on disk is bounded
+                while queue and len(pending) < workers:
+                    i, name = queue.pop(0)
+                    pending[pool.submit(compress_file, str(directory / name), str(parts / str(i)), codec, level, budget)] = (i, name)
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i, name = pending.pop(future)
+                    result = future.result()
+                    entry = {'name' : name, 'offset' : output.tell(), 'size' : result['size'], 'compressed_size' : result['compressed_size'], 'codec' : codec}
+                    with open(parts / str(i), 'rb') as part:
+                        shutil.copyfileobj(part, output, CHUNK_SIZE)
+                    output.flush()
+                    os.remove(parts / str(i))
+                    index.write(json.dumps(entry) + "\n")
+                    index.flush()
+                    entries.append(entry)
+                    size += result['size']
+                    compressed_size += result['compressed_size']
+            elapsed = time.time() - start
+            total_size = sum(entry['size'] for entry in entries)
+            total_compressed_size = sum(entry['compressed_size'] for entry in entries)
+            summary = {
+                'complete' : True,
+                'files' : len(entries),
+                'size' : total_size,
+                'compressed_size' : total_compressed_size,
+                'ratio' : total_size / total_compressed_size if total_compressed_size else 0.0,
+                'throughput' : size / elapsed if elapsed > 0 else 0.0,
+                'time' : elapsed
+            }
+            index.write(json.dumps(summary) + "\n")
+    finally:
+        shutil.rmtree(parts, ignore_errors=True)
+    return summary
@@ -0,0 +1,112 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+# The MIT License (MIT)
+# Copyright © 2023 Yuma Rao
+# Copyright © 2025 Rayleigh Research
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import numpy as np
+from typing import Tuple
+
+class FundamentalPriceReader:
+    """
+    Incremental reader of the fundamental prices written by the simulator to `fundamental.csv`.
+
+    The file holds a header row of book IDs followed by `Timestamp`, and a row of the price on each book for every update of the fundamental price process.
+    The byte offset reached in the file is retained between reads, so that only rows appended since the previous read are parsed.
+    Parsed rows are held in preallocated arrays which are doubled in size as required; the file being replaced (as when a new simulation is started) is detected by a change of inode or size, after which it is read again from the start.
+    """
+    def __init__(self, path : str, books : int, capacity : int = 1024):
+        self.path = path
+        self.books = books
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.prices = np.zeros((capacity, books), dtype=np.float64)
+        self.count = 0
+        self.offset = 0
+        self.inode = None
+        self.columns = None
+        self.partial = b''
+
+    def _reset(self) -> None:
+        """Discards all rows read from the file."""
+        self.count = 0
+        self.offset = 0
+        self.columns = None
+        self.partial = b''
+
+    def _append(self, timestamps : list, prices : list) -> None:
+        """Adds parsed rows to the history, growing the arrays where the capacity is exceeded."""
+        required = self.count + len(timestamps)
+        if required > len(self.timestamps):
+            capacity = max(required, 2 * len(self.timestamps))
+            self.timestamps = np.concatenate([self.timestamps[:self.count], np.zeros(capacity - self.count, dtype=np.int64)])
+            self.prices = np.concatenate([self.prices[:self.count], np.zeros((capacity - self.count, self.books), dtype=np.float64)])
+        self.timestamps[self.count:required] = timestamps
+        self.prices[self.count:required] = prices
+        self.count = required
+
+    def read(self) -> int:
+        """
+        Parses any complete rows appended to the file since the previous read.
+        A trailing row not yet terminated by a newline is retained and completed on the next read.
+
+        Returns:
+            int: Number of new rows read.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return 0
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            self.inode = stat.st_ino
+            self._reset()
+        if stat.st_size == self.offset:
+            return 0
+        with open(self.path, 'rb') as file:
+            file.seek(self.offset)
+            data = file.read()
+        self.offset += len(data)
+        lines = (self.partial + data).split(b'\n')
+        self.partial = lines.pop()
+        timestamps, prices = [], []
+        for line in lines:
+            if not line.strip():
+                continue
+            fields = line.split(b',')
+            if self.columns is None:
+                header = [field.strip().decode() for field in fields]
+                self.columns = [header.index(str(bookId)) for bookId in range(self.books)] + [header.index('Timestamp')]
+                continue
+            timestamps.append(int(fields[self.columns[-1]]))
+            prices.append([float(fields[column]) for column in self.columns[:-1]])
+        if timestamps:
+            self._append(timestamps, prices)
+        return len(timestamps)
+
+    @property
+    def latest(self) -> np.ndarray | None:
+        """The latest fundamental price on each book, or None if no prices have been read."""
+        return self.prices[self.count - 1] if self.count > 0 else None
+
+    def history(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns all prices read from the file.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Timestamps `(rows,)` and prices `(rows, books)`.
+        """
+        return self.timestamps[:self.count], self.prices[:self.count]
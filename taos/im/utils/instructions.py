@@ -0,0 +1,135 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+import numpy as np
+from operator import attrgetter
+from itertools import chain
+
+from taos.im.protocol import FinanceAgentResponse
+from taos.im.protocol.models import STP
+from taos.im.protocol.parser import ParsedResponse, InstructionHeader
+
+class InstructionBatch:
+    """
+    Columnar representation of the instructions submitted by all miners in a simulation step.
+
+    Each row corresponds to an instruction, with the fields used in validation held in NumPy arrays so that the validation rules can be applied to
+    the instructions of all miners at once; `records` holds the instruction objects from which the payloads sent to the simulator are obtained.
+    Rows are ordered by miner in the order in which the responses were parsed, and by submission within the response of each miner.
+
+    Attributes:
+    - uid: The UID of the miner which submitted the instruction.
+    - agent: The agent ID given in the instruction.
+    - book: The ID of the book to which the instruction applies (-1 for agent resets).
+    - type: Index of the instruction type in `TYPES`.
+    - direction: The direction of order placements (-1 for other instructions).
+    - quantity: The quantity of order placements (NaN for other instructions).
+    - price: The price of limit order placements (NaN for other instructions).
+    - stp: The self-trade prevention flag of order placements (-1 for other instructions).
+    - delay: The delay with which the instruction is to be processed in the simulation.
+    - records: The instruction objects.
+    """
+    TYPES = ['PLACE_ORDER_MARKET', 'PLACE_ORDER_LIMIT', 'CANCEL_ORDERS', 'RESET_AGENT']
+    COLUMNS = {
+        'uid' : np.int64,
+        'agent' : np.int64,
+        'book' : np.int64,
+        'type' : np.int8,
+        'direction' : np.int8,
+        'quantity' : np.float64,
+        'price' : np.float64,
+        'stp' : np.int8,
+        'delay' : np.int64
+    }
+    FIELDS = {'agent' : 'agentId', 'book' : 'bookId', 'direction' : 'direction', 'quantity' : 'quantity', 'price' : 'price', 'stp' : 'stp', 'delay' : 'delay'}
+
+    def __init__(self, records : np.ndarray, **columns : np.ndarray):
+        self.records = records
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, columns[name] if name in columns else np.empty(0, dtype=dtype))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __repr__(self) -> str:
+        return f"InstructionBatch({len(self)} instructions from {len(np.unique(self.uid))} agents)"
+
+    @classmethod
+    def from_responses(cls, responses : dict[int, ParsedResponse]):
+        """
+        Constructs the batch from the instructions read from the responses of each miner.
+        """
+        responses = {uid : response for uid, response in responses.items() if response.response and response.headers}
+        headers = list(chain.from_iterable(response.headers for response in responses.values()))
+        records = np.empty(len(headers), dtype=object)
+        records[:] = list(chain.from_iterable(response.response.instructions for response in responses.values()))
+        types = {name : i for i, name in enumerate(cls.TYPES)}
+        columns = {
+            'uid' : np.repeat(np.fromiter(responses.keys(), dtype=np.int64, count=len(responses)), [len(response.headers) for response in responses.values()]),
+            'type' : np.fromiter((types.get(header.type, -1) for header in headers), dtype=np.int8, count=len(headers))
+        }
+        for name, field in cls.FIELDS.items():
+            columns[name] = np.fromiter(map(attrgetter(field), headers), dtype=cls.COLUMNS[name], count=len(headers))
+        return cls(records, **columns)
+
+    @classmethod
+    def from_instructions(cls, uid : int, instructions : list):
+        """
+        Constructs the batch from a list of instruction objects submitted by the agent `uid`, such as those generated by the validator itself.
+        """
+        return cls.from_responses({uid : ParsedResponse(
+            response=FinanceAgentResponse.model_construct(agent_id=uid, instructions=instructions),
+            headers=[InstructionHeader(**{field : getattr(instruction, field) for field in ['agentId', 'type', *cls.FIELDS.values()] if getattr(instruction, field, None) is not None})
+                     for instruction in instructions]
+        )})
+
+    @classmethod
+    def concatenate(cls, batches : list):
+        """
+        Concatenates the rows of the given batches in order.
+        """
+        return cls(np.concatenate([batch.records for batch in batches]), **{name : np.concatenate([getattr(batch, name) for batch in batches]) for name in cls.COLUMNS})
+
+    def select(self, mask : np.ndarray):
+        """
+        Returns a batch containing the rows selected by a boolean mask or array of indices.
+        """
+        return InstructionBatch(self.records[mask], **{name : getattr(self, name)[mask] for name in self.COLUMNS})
+
+    def validate(self, volumes : np.ndarray, volume_cap : float, max_instructions_per_book : int) -> tuple:
+        """
+        Applies the validation rules to the instructions of all miners, each as a single pass over the columns:
+
+        - If a miner submits any instruction for an agent ID other than its own, or an agent reset, none of its instructions are accepted.
+        - If a miner has traded at least `volume_cap` on a book over the volume assessment period, only its cancellations are accepted on that book.
+        - Order placements not specifying self-trade prevention are assigned `STP.CANCEL_OLDEST`.
+        - At most `max_instructions_per_book` instructions are accepted from each miner for each book, in the order in which they were submitted.
+
+        Args:
+        - volumes: Array of shape (uids, books) holding the total trading volume of each miner on each book over the assessment period.
+        - volume_cap: The trading volume above which miners may only cancel orders.
+        - max_instructions_per_book: The maximum number of instructions accepted from each miner for each book.
+
+        Returns:
+        - InstructionBatch: The accepted instructions.
+        - np.ndarray: The UIDs of miners which submitted instructions for other agents.
+        - np.ndarray: Boolean mask of the rows not accepted due to the volume cap.
+        """
+        cancellation = self.type == self.TYPES.index('CANCEL_ORDERS')
+        placement = (self.type == self.TYPES.index('PLACE_ORDER_MARKET')) | (self.type == self.TYPES.index('PLACE_ORDER_LIMIT'))
+        invalid = np.unique(self.uid[(self.agent != self.uid) | ~(placement | cancellation)])
+        accepted = ~np.isin(self.uid, invalid)
+        capped = accepted & ~cancellation & (volumes[self.uid, np.clip(self.book, 0, volumes.shape[1] - 1)] >= volume_cap)
+        accepted &= ~capped
+        unset = placement & (self.stp == STP.NO_STP)
+        self.stp[unset] = STP.CANCEL_OLDEST
+        for i in np.flatnonzero(unset):
+            self.records[i].stp = STP.CANCEL_OLDEST
+        # Rank the accepted instructions of each miner on each book by submission order, rows being ordered by submission within each miner.
+        rows = np.flatnonzero(accepted)
+        keys = self.uid[rows] * volumes.shape[1] + self.book[rows]
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.empty(0, dtype=np.int64)
+        ranks = np.arange(len(keys)) - np.repeat(starts, np.diff(np.r_[starts, len(keys)]))
+        accepted[rows[order[ranks >= max_instructions_per_book]]] = False
+        return self.select(accepted), invalid, capped
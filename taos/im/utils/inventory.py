@@ -0,0 +1,198 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+# The MIT License (MIT)
+# Copyright © 2023 Yuma Rao
+# Copyright © 2025 Rayleigh Research
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import numpy as np
+from typing import Dict, Iterable, Tuple
+
+class InventoryHistory:
+    """
+    Fixed-size history of miner inventory values used for Sharpe ratio calculation.
+
+    Observations are stored in a preallocated `(uids, books, lookback)` ring buffer so that scores for all UIDs can be calculated at once,
+    and so that recording a new observation does not require rebuilding or pruning any per-UID structures.
+    Each UID maintains its own write position and observation count, allowing the history of individual UIDs to be reset on deregistration.
+    """
+    def __init__(self, uids : int, books : int, lookback : int):
+        self.uids = uids
+        self.books = books
+        self.lookback = lookback
+        self.values = np.zeros((uids, books, lookback), dtype=np.float64)
+        self.timestamps = np.zeros((uids, lookback), dtype=np.int64)
+        self.heads = np.zeros(uids, dtype=np.int64)
+        self.counts = np.zeros(uids, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self.uids
+
+    def count(self, uid : int) -> int:
+        """Number of observations currently held for the UID."""
+        return int(self.counts[uid])
+
+    def append(self, uid : int, timestamp : int, values : Iterable[float]) -> None:
+        """
+        Records the inventory values of a UID on each book at the given simulation timestamp, replacing the oldest observation once `lookback` values are held.
+        As for a mapping keyed by timestamp, an observation with the same timestamp as one already held replaces that observation in place.
+
+        Args:
+            uid (int) : UID of the miner
+            timestamp (int) : Simulation timestamp of the observation
+            values (Iterable[float]) : Inventory value of the miner on each book, ordered by book ID
+
+        Returns:
+            None
+        """
+        count = self.counts[uid]
+        positions = (self.heads[uid] - count + np.arange(count)) % self.lookback
+        existing = positions[self.timestamps[uid, positions] == timestamp]
+        if len(existing) > 0:
+            self.values[uid, :, existing[0]] = values
+            return
+        head = self.heads[uid]
+        self.values[uid, :, head] = values
+        self.timestamps[uid, head] = timestamp
+        self.heads[uid] = (head + 1) % self.lookback
+        self.counts[uid] = min(count + 1, self.lookback)
+
+    def reset(self, uid : int) -> None:
+        """Discards all observations held for the UID."""
+        self.counts[uid] = 0
+
+    def window(self, uids : np.ndarray | None = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the observations of the requested UIDs ordered chronologically along the last axis.
+        Where fewer than `lookback` observations are held for a UID, its observations are aligned to the end of the window.
+
+        Args:
+            uids (np.ndarray | None) : UIDs for which to retrieve observations; all UIDs if not specified.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray] : Inventory values `(uids, books, lookback)`, timestamps `(uids, lookback)` and the mask of populated entries `(uids, lookback)`.
+        """
+        uids = np.arange(self.uids) if uids is None else np.asarray(uids)
+        heads = self.heads[uids]
+        counts = self.counts[uids]
+        order = (heads[:, None] + np.arange(self.lookback)) % self.lookback
+        values = np.take_along_axis(self.values[uids], order[:, None, :], axis=2)
+        timestamps = np.take_along_axis(self.timestamps[uids], order, axis=1)
+        valid = np.arange(self.lookback) >= (self.lookback - counts)[:, None]
+        return values, timestamps, valid
+
+    def history(self, uid : int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the observations held for a single UID in chronological order.
+
+        Args:
+            uid (int) : UID of the miner
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray] : Timestamps `(count,)` and inventory values `(count, books)`.
+        """
+        count = self.counts[uid]
+        positions = (self.heads[uid] - count + np.arange(count)) % self.lookback
+        return self.timestamps[uid, positions], self.values[uid][:, positions].T
+
+    def to_dict(self, uid : int) -> Dict[int, Dict[int, float]]:
+        """Returns the observations held for a UID as a mapping of timestamp to the inventory value on each book."""
+        timestamps, values = self.history(uid)
+        return {timestamp : dict(enumerate(book_values)) for timestamp, book_values in zip(timestamps.tolist(), values.tolist())}
+
+    def state(self) -> dict:
+        """Serializable representation of the history, for inclusion in the validator state file."""
+        return {
+            "uids" : self.uids,
+            "books" : self.books,
+            "lookback" : self.lookback,
+            "values" : self.values.tobytes(),
+            "timestamps" : self.timestamps.tobytes(),
+            "heads" : self.heads.tolist(),
+            "counts" : self.counts.tolist()
+        }
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Arrays holding the history, for inclusion in the validator state file; restored with `from_arrays`."""
+        return {
+            "values" : self.values,
+            "timestamps" : self.timestamps,
+            "heads" : self.heads,
+            "counts" : self.counts
+        }
+
+    @classmethod
+    def from_state(cls, state : dict, uids : int, books : int, lookback : int) -> 'InventoryHistory':
+        """
+        Restores the history from the output of `state()`, or from the mapping of UID to `{timestamp : {bookId : value}}` used by previous validator versions.
+        Observations are adapted to the requested dimensions; books which did not previously exist are assigned zero inventory value.
+
+        Args:
+            state (dict) : Serialized history
+            uids (int) : Number of UIDs for which history is to be maintained
+            books (int) : Number of books in the simulation
+            lookback (int) : Number of observations to be maintained for each UID
+
+        Returns:
+            InventoryHistory : The restored history.
+        """
+        if "values" not in state:
+            history = cls(uids, books, lookback)
+            for uid, inventory_values in state.items():
+                if uid >= uids: continue
+                for timestamp, inventory_value in inventory_values.items():
+                    history.append(uid, timestamp, [inventory_value.get(bookId, 0.0) for bookId in range(books)])
+            return history
+        shape = (state["uids"], state["books"], state["lookback"])
+        return cls.from_arrays(
+            np.frombuffer(state["values"], dtype=np.float64).reshape(shape).copy(),
+            np.frombuffer(state["timestamps"], dtype=np.int64).reshape((shape[0], shape[2])).copy(),
+            np.array(state["heads"], dtype=np.int64),
+            np.array(state["counts"], dtype=np.int64),
+            uids, books, lookback
+        )
+
+    @classmethod
+    def from_arrays(cls, values : np.ndarray, timestamps : np.ndarray, heads : np.ndarray, counts : np.ndarray, uids : int, books : int, lookback : int) -> 'InventoryHistory':
+        """
+        Restores the history from its arrays, which are used directly where they have the requested dimensions.
+        Otherwise, UIDs and books are truncated or padded with zero inventory value, and the latest observations of each UID within the requested lookback are retained.
+
+        Args:
+            values (np.ndarray) : Inventory values `(uids, books, lookback)`
+            timestamps (np.ndarray) : Observation timestamps `(uids, lookback)`
+            heads (np.ndarray) : Write position of each UID
+            counts (np.ndarray) : Number of observations held for each UID
+            uids (int) : Number of UIDs for which history is to be maintained
+            books (int) : Number of books in the simulation
+            lookback (int) : Number of observations to be maintained for each UID
+
+        Returns:
+            InventoryHistory : The restored history.
+        """
+        stored = cls.__new__(cls)
+        stored.uids, stored.books, stored.lookback = values.shape
+        stored.values, stored.timestamps, stored.heads, stored.counts = values, timestamps, heads, counts
+        if (stored.uids, stored.books, stored.lookback) == (uids, books, lookback):
+            return stored
+        history = cls(uids, books, lookback)
+        window_values, window_timestamps, _ = stored.window()
+        kept, common_uids, common_books = min(lookback, stored.lookback), min(uids, stored.uids), min(books, stored.books)
+        history.values[:common_uids, :common_books, lookback - kept:] = window_values[:common_uids, :common_books, stored.lookback - kept:]
+        history.timestamps[:common_uids, lookback - kept:] = window_timestamps[:common_uids, stored.lookback - kept:]
+        history.counts[:common_uids] = np.minimum(stored.counts[:common_uids], kept)
+        # Observations are now held in chronological order ending at the last position, so that the next is written to the first
+        return history
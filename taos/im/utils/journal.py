@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+# The MIT License (MIT)
+# Copyright © 2023 Yuma Rao
+# Copyright © 2025 Rayleigh Research
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+
+import os
+import struct
+import msgpack
+from typing import List, Optional, BinaryIO
+
+class StateJournal:
+    """
+    Append-only log of the changes made to the validator state between full snapshots.
+
+    Each record is a msgpack-encoded mapping preceded by its length, and is flushed to the file as it is appended.
+    A record left incomplete by an interrupted write is discarded when the journal is read.
+    """
+    HEADER = struct.Struct('<I')
+
+    def __init__(self, path : str):
+        self.path = path
+        self.file : Optional[BinaryIO] = None
+        self.count = 0
+
+    def append(self, record : dict) -> int:
+        """
+        Appends a record to the journal.
+
+        Args:
+            record (dict): The record to be appended.
+        Returns:
+            int: The number of bytes written.
+        """
+        data = msgpack.packb(record, use_bin_type=True)
+        if not self.file:
+            self.file = open(self.path, 'ab')
+        self.file.write(self.HEADER.pack(len(data)) + data)
+        self.file.flush()
+        self.count += 1
+        return self.HEADER.size + len(data)
+
+    def read(self) -> List[dict]:
+        """
+        Reads all complete records from the journal, truncating any incomplete record at its end so that further records can be appended.
+
+        Returns:
+            List[dict]: The records in the order appended.
+        """
+        self.close()
+        records = []
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        offset = 0
+        while offset + self.HEADER.size <= len(data):
+            length, = self.HEADER.unpack_from(data, offset)
+            if offset + self.HEADER.size + length > len(data):
+                break
+            records.append(msgpack.unpackb(data[offset + self.HEADER.size : offset + self.HEADER.size + length], use_list=False, strict_map_key=False))
+            offset += self.HEADER.size + length
+        if offset < len(data):
+            with open(self.path, 'r+b') as file:
+                file.truncate(offset)
+        self.count = len(records)
+        return records
+
+    def clear(self) -> None:
+        """
+        Removes all records from the journal, once the state they describe has been saved in full.
+        """
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.count = 0
+
+    def close(self) -> None:
+        if self.file:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,111 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+# The MIT License (MIT)
+# Copyright © 2023 Yuma Rao
+# Copyright © 2025 Rayleigh Research
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+
+import threading
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+class ArrayCollector(Collector):
+    """
+    Prometheus collector which renders gauge metric families at scrape time from arrays of values.
+
+    Rather than updating a labelled child gauge for each sample, the values of a metric family are published as arrays whose axes are
+    associated with the values of one or more labels, or as rows of label values for gauges which carry their information in their labels.
+    Publishing is a single assignment per array; samples are only constructed when the metrics are scraped, and are reused for further scrapes
+    until new values are published.  As with individual gauges, an entry which is not set (NaN) in a newly published array retains its previous value.
+    """
+    def __init__(self, constants : Dict[str, Any]):
+        self.constants = {label : str(value) for label, value in constants.items()}
+        self.families : Dict[str, tuple[str, List[str]]] = {}
+        self.blocks : Dict[str, Dict[tuple, tuple[Dict[str, Any], np.ndarray]]] = {}
+        self.rows : Dict[str, List[Dict[str, Any]]] = {}
+        self.rendered : Optional[List[GaugeMetricFamily]] = None
+        self.lock = threading.Lock()
+
+    def gauge(self, name : str, documentation : str, labels : List[str]) -> None:
+        """
+        Declares a gauge metric family with the given labels, which include the constant labels of the collector.
+        """
+        with self.lock:
+            self.families[name] = (documentation, labels)
+            self.blocks[name] = {}
+            self.rows[name] = []
+            self.rendered = None
+
+    def set_values(self, name : str, values : np.ndarray, **axes : Any) -> None:
+        """
+        Publishes an array of values for a gauge metric family.
+
+        Args:
+            name (str): The name of the metric family.
+            values (np.ndarray): The values, with one dimension for each non-scalar entry in `axes` in the order given.
+            **axes: For each label, either the sequence of label values along the corresponding dimension of `values`, or a single value applying to all entries.
+        Returns:
+            None
+        """
+        key = tuple((label, None if isinstance(axis, (list, tuple, np.ndarray, range)) else str(axis)) for label, axis in axes.items())
+        axes = {label : [str(value) for value in axis] if isinstance(axis, (list, tuple, np.ndarray, range)) else str(axis) for label, axis in axes.items()}
+        values = np.asarray(values, dtype=np.float64)
+        with self.lock:
+            previous = self.blocks[name].get(key)
+            if previous and previous[0] == axes:
+                values = np.where(np.isnan(values), previous[1], values)
+            self.blocks[name][key] = (axes, values)
+            self.rendered = None
+
+    def set_rows(self, name : str, rows : List[Dict[str, Any]], value : float = 1.0) -> None:
+        """
+        Publishes the samples of a gauge metric family as rows of label values, replacing all previously published rows.
+        """
+        rows = [{label : str(row_value) for label, row_value in row.items()} for row in rows]
+        with self.lock:
+            self.rows[name] = [(row, value) for row in rows]
+            self.rendered = None
+
+    def render(self) -> List[GaugeMetricFamily]:
+        """
+        Constructs the metric families from the published values.
+        """
+        families = []
+        for name, (documentation, labels) in self.families.items():
+            family = GaugeMetricFamily(name, documentation, labels=labels)
+            for axes, values in self.blocks[name].values():
+                dimensions = [(label, axis) for label, axis in axes.items() if isinstance(axis, list)]
+                fixed = self.constants | {label : axis for label, axis in axes.items() if not isinstance(axis, list)}
+                for index in zip(*np.nonzero(~np.isnan(values))):
+                    sample = fixed | {label : axis[i] for (label, axis), i in zip(dimensions, index)}
+                    family.add_metric([sample[label] for label in labels], values[index].item())
+            for row, value in self.rows[name]:
+                sample = self.constants | row
+                family.add_metric([sample[label] for label in labels], value)
+            families.append(family)
+        return families
+
+    def describe(self) -> Iterable[GaugeMetricFamily]:
+        return [GaugeMetricFamily(name, documentation, labels=labels) for name, (documentation, labels) in self.families.items()]
+
+    def collect(self) -> Iterable[GaugeMetricFamily]:
+        with self.lock:
+            if self.rendered is None:
+                self.rendered = self.render()
+            return self.rendered
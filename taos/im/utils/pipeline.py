@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+# The MIT License (MIT)
+# Copyright © 2023 Yuma Rao
+# Copyright © 2025 Rayleigh Research
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+
+import time
+import asyncio
+from contextlib import contextmanager
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+class StepPipeline:
+    """
+    Task graph for the processing of a single simulation state update by the validator.
+
+    Stages on the path to the simulator response (decoding, querying miners, encoding and any waits on earlier steps) are timed inline,
+    while background stages (scoring, state saving and reporting) are tracked as futures which may complete after the response is returned.
+    Each step awaits only those background stages of the previous step on which it depends, so that these can run up to one step behind the simulator.
+    The latency of every stage is recorded and passed to `publish`, so that the stage on the critical path of each step can be identified.
+    """
+    # Stages which delay the response to the simulator
+    BLOCKING = ['decode', 'reward_wait', 'forward', 'save_wait', 'report_wait', 'encode']
+
+    def __init__(self, step : int, previous : Optional['StepPipeline'] = None, publish : Optional[Callable[[str, float], None]] = None):
+        self.step = step
+        self.previous = previous
+        if previous:
+            # Only the immediately preceding step is retained, since its own dependencies are necessarily resolved before this step is complete.
+            previous.previous = None
+        self.publish = publish
+        self.start = time.time()
+        self.futures : Dict[str, Future] = {}
+        self.latencies : Dict[str, float] = {}
+
+    def record(self, stage : str, latency : float) -> None:
+        """
+        Records and publishes the latency of a stage.
+        """
+        self.latencies[stage] = latency
+        if self.publish:
+            self.publish(stage, latency)
+
+    @contextmanager
+    def stage(self, stage : str):
+        """
+        Times a stage which is executed inline.
+        """
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.record(stage, time.time() - start)
+
+    def track(self, stage : str, future : Future) -> Future:
+        """
+        Registers the future of a background stage; the latency from submission to completion is recorded when the future resolves.
+        """
+        start = time.time()
+        self.futures[stage] = future
+        future.add_done_callback(lambda _ : self.record(stage, time.time() - start))
+        return future
+
+    def done(self, stage : str) -> bool:
+        """
+        Whether the named background stage is complete or was never started.
+        """
+        return stage not in self.futures or self.futures[stage].done()
+
+    async def wait(self, stage : str) -> None:
+        """
+        Awaits completion of a background stage of the previous step without blocking the event loop, recording the time spent waiting as `<stage>_wait`.
+        Failures of the stage are not raised here; they are handled by the stage itself.
+        """
+        if self.previous and not self.previous.done(stage):
+            with self.stage(f"{stage}_wait"):
+                await asyncio.wait([asyncio.wrap_future(self.previous.futures[stage])])
+
+    def critical(self) -> Optional[str]:
+        """
+        The blocking stage with the greatest latency in this step.
+        """
+        blocking = {stage : latency for stage, latency in self.latencies.items() if stage in self.BLOCKING}
+        return max(blocking, key=blocking.get) if blocking else None
+
+    def __str__(self) -> str:
+        return ' | '.join([f"{stage.upper()} {latency:.4f}s" for stage, latency in self.latencies.items()])
@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+# The MIT License (MIT)
+# Copyright © 2023 Yuma Rao
+# Copyright © 2025 Rayleigh Research
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+
+import os
+import json
+import struct
+import numpy as np
+from typing import Dict, Tuple
+
+MAGIC = b'TAOSIMST'
+VERSION = 1
+ALIGNMENT = 64
+HEADER = struct.Struct('<8sII')
+
+def aligned(size : int) -> int:
+    """Rounds a size in bytes up to the alignment of arrays in the state file."""
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+def save_arrays(path : str, arrays : Dict[str, np.ndarray], metadata : dict, version : int = VERSION) -> None:
+    """
+    Writes a set of arrays, together with JSON-serializable metadata, to a file from which they can be memory-mapped by `load_arrays`.
+
+    The file begins with a fixed header holding the format magic, version and the length of a JSON description of the metadata and of the dtype, shape and offset of each array.
+    The raw contents of each array follow, aligned to 64 bytes; offsets are relative to the aligned end of the description.  The file is written to a temporary path and moved into place once complete.
+
+    Args:
+        path (str): Path of the file to be written.
+        arrays (Dict[str, np.ndarray]): Arrays to be saved, by name.
+        metadata (dict): Additional values to be saved.
+        version (int): Version of the layout of the saved arrays and metadata.
+    Returns:
+        None
+    """
+    arrays = {name : np.ascontiguousarray(array) for name, array in arrays.items()}
+    description = {'metadata' : metadata, 'arrays' : {}}
+    offset = 0
+    for name, array in arrays.items():
+        description['arrays'][name] = {'dtype' : array.dtype.str, 'shape' : list(array.shape), 'offset' : offset}
+        offset += aligned(array.nbytes)
+    header = json.dumps(description).encode()
+    start = aligned(HEADER.size + len(header))
+    with open(path + ".tmp", 'wb') as file:
+        file.write(HEADER.pack(MAGIC, version, len(header)) + header)
+        for name, array in arrays.items():
+            file.seek(start + description['arrays'][name]['offset'])
+            file.write(array.tobytes())
+    os.replace(path + ".tmp", path)
+
+def load_arrays(path : str) -> Tuple[int, dict, Dict[str, np.ndarray]]:
+    """
+    Opens the arrays saved to a file by `save_arrays`.
+    Arrays are memory-mapped copy-on-write, so that their contents are read from disk only as accessed and modifications are not written back to the file.
+
+    Args:
+        path (str): Path of the file.
+    Returns:
+        Tuple[int, dict, Dict[str, np.ndarray]]: The layout version, metadata and arrays by name.
+    """
+    with open(path, 'rb') as file:
+        magic, version, header_length = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise Exception(f"{path} is not a validator state file.")
+        description = json.loads(file.read(header_length))
+    start = aligned(HEADER.size + header_length)
+    arrays = {
+        name : np.memmap(path, dtype=np.dtype(array['dtype']), mode='c', offset=start + array['offset'], shape=tuple(array['shape'])) if np.prod(array['shape']) > 0
+                else np.zeros(tuple(array['shape']), dtype=np.dtype(array['dtype']))
+        for name, array in description['arrays'].items()
+    }
+    return version, description['metadata'], arrays
+
+def fit(array : np.ndarray, shape : Tuple[int, ...]) -> np.ndarray:
+    """
+    Adapts an array to the given shape by truncating or zero-padding the end of each axis.
+
+    Args:
+        array (np.ndarray): The array to be adapted.
+        shape (Tuple[int, ...]): The required shape.
+    Returns:
+        np.ndarray: The array if already of the required shape, otherwise a new array.
+    """
+    if array.shape == tuple(shape):
+        return array
+    fitted = np.zeros(shape, dtype=array.dtype)
+    common = tuple(slice(0, min(current, required)) for current, required in zip(array.shape, shape))
+    fitted[common] = array[common]
+    return fitted
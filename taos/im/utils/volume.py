@@ -0,0 +1,234 @@
+# SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
+# SPDX-License-Identifier: MIT
+# The MIT License (MIT)
+# Copyright © 2023 Yuma Rao
+# Copyright © 2025 Rayleigh Research
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import math
+import numpy as np
+from typing import Dict, Iterable
+
+class TradeVolumes:
+    """
+    Rolling history of miner trading volumes aggregated into fixed-size sampling intervals.
+
+    Volumes are held in a preallocated `(uids, books, roles, buckets)` circular array covering the latest `trade_volume_assessment_period`,
+    with bucket timestamps shared by all UIDs.  A running sum over the retained buckets is maintained for each UID, book and role,
+    which is updated as trades are recorded and as buckets expire so that period volumes are available without re-aggregating the history.
+    """
+    ROLES = ['total', 'maker', 'taker', 'self']
+
+    def __init__(self, uids : int, books : int, sampling_interval : int, assessment_period : int, decimals : int):
+        self.uids = uids
+        self.books = books
+        self.sampling_interval = sampling_interval
+        self.assessment_period = assessment_period
+        self.decimals = decimals
+        self.capacity = math.ceil(assessment_period / sampling_interval) + 1
+        self.volumes = np.zeros((uids, books, len(self.ROLES), self.capacity), dtype=np.float64)
+        self.sums = np.zeros((uids, books, len(self.ROLES)), dtype=np.float64)
+        self.timestamps = np.zeros(self.capacity, dtype=np.int64)
+        self.head = 0
+        self.count = 0
+
+    def _positions(self) -> np.ndarray:
+        """Positions of the retained buckets in chronological order."""
+        return (self.head - self.count + np.arange(self.count)) % self.capacity
+
+    def _expire(self) -> None:
+        """Removes the oldest retained bucket from the history and running sums."""
+        position = (self.head - self.count) % self.capacity
+        self.sums = np.round(self.sums - self.volumes[..., position], self.decimals)
+        self.volumes[..., position] = 0.0
+        self.count -= 1
+
+    def advance(self, timestamp : int) -> int:
+        """
+        Expires buckets falling outside the assessment period ending at the given simulation timestamp,
+        and opens the bucket for the sampling interval containing the timestamp if it is not already the latest.
+
+        Args:
+            timestamp (int) : Current simulation timestamp
+
+        Returns:
+            int: Timestamp of the bucket to which trades at the given timestamp are assigned.
+        """
+        sampled_timestamp = math.ceil(timestamp / self.sampling_interval) * self.sampling_interval
+        while self.count > 0 and self.timestamps[(self.head - self.count) % self.capacity] <= timestamp - self.assessment_period:
+            self._expire()
+        if self.count == 0 or self.timestamps[(self.head - 1) % self.capacity] != sampled_timestamp:
+            if self.count == self.capacity:
+                self._expire()
+            self.timestamps[self.head] = sampled_timestamp
+            self.volumes[..., self.head] = 0.0
+            self.head = (self.head + 1) % self.capacity
+            self.count += 1
+        return sampled_timestamp
+
+    def record(self, uid : int, book_id : int, role : str, volume : float) -> None:
+        """
+        Adds traded volume for a UID on a book in the specified role to the latest bucket.
+
+        Args:
+            uid (int) : UID of the miner
+            book_id (int) : ID of the book on which the trade occurred
+            role (str) : One of `total`, `maker`, `taker` or `self`
+            volume (float) : Traded volume in quote currency
+
+        Returns:
+            None
+        """
+        role_index = self.ROLES.index(role)
+        position = (self.head - 1) % self.capacity
+        self.volumes[uid, book_id, role_index, position] = round(self.volumes[uid, book_id, role_index, position] + volume, self.decimals)
+        self.sums[uid, book_id, role_index] = round(self.sums[uid, book_id, role_index] + volume, self.decimals)
+
+    def total(self, uid : int | None = None, role : str = 'total') -> np.ndarray:
+        """
+        Returns the volume traded over the assessment period on each book in the specified role.
+
+        Args:
+            uid (int | None) : UID of the miner; if not specified, volumes are returned for all UIDs
+            role (str) : One of `total`, `maker`, `taker` or `self`
+
+        Returns:
+            np.ndarray: Period volumes of shape `(books,)` for a single UID, or `(uids, books)` otherwise.
+        """
+        sums = self.sums[..., self.ROLES.index(role)]
+        return sums if uid is None else sums[uid]
+
+    def since(self, timestamp : int, uids : Iterable[int] | None = None, role : str = 'total') -> np.ndarray:
+        """
+        Returns the volume traded on each book in the specified role in buckets having timestamp no earlier than that given.
+
+        Args:
+            timestamp (int) : Earliest bucket timestamp to include
+            uids (Iterable[int] | None) : UIDs for which to return volumes; all UIDs if not specified
+            role (str) : One of `total`, `maker`, `taker` or `self`
+
+        Returns:
+            np.ndarray: Volumes of shape `(uids, books)`.
+        """
+        uids = np.arange(self.uids) if uids is None else np.asarray(uids)
+        positions = self._positions()
+        positions = positions[self.timestamps[positions] >= timestamp]
+        volumes = self.volumes[uids][:, :, self.ROLES.index(role)][..., positions]
+        return np.round(np.cumsum(volumes, axis=-1)[..., -1], self.decimals) if len(positions) > 0 else np.zeros((len(uids), self.books))
+
+    def latest(self, uids : Iterable[int] | None = None, role : str = 'total') -> np.ndarray:
+        """
+        Returns the volume traded on each book in the specified role in the latest bucket.
+
+        Args:
+            uids (Iterable[int] | None) : UIDs for which to return volumes; all UIDs if not specified
+            role (str) : One of `total`, `maker`, `taker` or `self`
+
+        Returns:
+            np.ndarray: Volumes of shape `(uids, books)`.
+        """
+        uids = np.arange(self.uids) if uids is None else np.asarray(uids)
+        if self.count == 0:
+            return np.zeros((len(uids), self.books))
+        return self.volumes[uids, :, self.ROLES.index(role), (self.head - 1) % self.capacity]
+
+    def reset(self, uid : int) -> None:
+        """Discards all volume history for the UID."""
+        self.volumes[uid] = 0.0
+        self.sums[uid] = 0.0
+
+    def shift(self, offset : int) -> None:
+        """Shifts the timestamps of all retained buckets by the given offset, used to carry volume history over to a new simulation."""
+        self.timestamps[self._positions()] += offset
+
+    def state(self) -> dict:
+        """Serializable representation of the volume history, for inclusion in the validator state file."""
+        positions = self._positions()
+        return {
+            "uids" : self.uids,
+            "books" : self.books,
+            "timestamps" : self.timestamps[positions].tolist(),
+            "volumes" : np.ascontiguousarray(self.volumes[..., positions]).tobytes()
+        }
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Timestamps and volumes of the retained buckets in chronological order, for inclusion in the validator state file; restored with `from_arrays`."""
+        positions = self._positions()
+        return {
+            "timestamps" : self.timestamps[positions],
+            "volumes" : self.volumes[..., positions]
+        }
+
+    @classmethod
+    def from_state(cls, state : dict, uids : int, books : int, sampling_interval : int, assessment_period : int, decimals : int) -> 'TradeVolumes':
+        """
+        Restores the volume history from the output of `state()`, or from the mapping of UID to `{bookId : {role : {timestamp : volume}}}` used by previous validator versions.
+        Only the latest buckets which fit within the assessment period are retained, and running sums are recalculated from the restored buckets.
+
+        Args:
+            state (dict) : Serialized volume history
+            uids (int) : Number of UIDs for which history is to be maintained
+            books (int) : Number of books in the simulation
+            sampling_interval (int) : Simulation time interval covered by each bucket
+            assessment_period (int) : Simulation time period over which volumes are aggregated
+            decimals (int) : Precision to which volumes are rounded
+
+        Returns:
+            TradeVolumes : The restored volume history.
+        """
+        if "volumes" in state:
+            timestamps = list(state["timestamps"])
+            volumes = np.frombuffer(state["volumes"], dtype=np.float64).reshape((state["uids"], state["books"], len(cls.ROLES), len(timestamps)))
+        else:
+            timestamps = sorted({time for book_volumes in state.values() for role_volumes in book_volumes.values() for role_trades in role_volumes.values() for time in role_trades})
+            columns = {time : i for i, time in enumerate(timestamps)}
+            volumes = np.zeros((max(state.keys(), default=-1) + 1, max([max(book_volumes.keys(), default=-1) for book_volumes in state.values()], default=-1) + 1, len(cls.ROLES), len(timestamps)))
+            for uid, book_volumes in state.items():
+                for book_id, role_volumes in book_volumes.items():
+                    for role, role_trades in role_volumes.items():
+                        for time, volume in role_trades.items():
+                            volumes[uid, book_id, cls.ROLES.index(role), columns[time]] = volume
+        return cls.from_arrays(np.array(timestamps, dtype=np.int64), volumes, uids, books, sampling_interval, assessment_period, decimals)
+
+    @classmethod
+    def from_arrays(cls, timestamps : np.ndarray, volumes : np.ndarray, uids : int, books : int, sampling_interval : int, assessment_period : int, decimals : int) -> 'TradeVolumes':
+        """
+        Restores the volume history from the timestamps and volumes of its retained buckets in chronological order, as held in the validator state file.
+        UIDs and books are truncated or padded with zero volume, only the latest buckets which fit within the assessment period are retained,
+        and running sums are recalculated from the restored buckets.
+
+        Args:
+            timestamps (np.ndarray) : Bucket timestamps `(buckets,)`
+            volumes (np.ndarray) : Bucket volumes `(uids, books, roles, buckets)`
+            uids (int) : Number of UIDs for which history is to be maintained
+            books (int) : Number of books in the simulation
+            sampling_interval (int) : Simulation time interval covered by each bucket
+            assessment_period (int) : Simulation time period over which volumes are aggregated
+            decimals (int) : Precision to which volumes are rounded
+
+        Returns:
+            TradeVolumes : The restored volume history.
+        """
+        trade_volumes = cls(uids, books, sampling_interval, assessment_period, decimals)
+        timestamps = timestamps[-trade_volumes.capacity:]
+        volumes = volumes[..., volumes.shape[-1] - len(timestamps):]
+        count = len(timestamps)
+        trade_volumes.timestamps[:count] = timestamps
+        trade_volumes.volumes[:min(uids, volumes.shape[0]), :min(books, volumes.shape[1]), :, :count] = volumes[:uids, :books]
+        trade_volumes.head = count % trade_volumes.capacity
+        trade_volumes.count = count
+        trade_volumes.sums = np.round(np.cumsum(trade_volumes.volumes, axis=-1)[..., -1], decimals)
+        return trade_volumes
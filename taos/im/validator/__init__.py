@@ -1,7 +1,22 @@
 # SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
 # SPDX-License-Identifier: MIT
-from .forward import forward, notify
-from .reward import reward
-from .report import report
-from .seed import seed
-from .update import *
\ No newline at end of file
+import importlib
+
+# Validator routines are imported from their modules on first access, so that processes using only one of them
+# (such as the reward process) do not import the reporting, seeding and update dependencies of the others.
+# `forward`, `report` and `seed` share their names with the submodules defining them, which once imported take precedence
+# over the module `__getattr__`, and are therefore imported directly from `taos.im.validator.forward`, `.report` and `.seed`.
+EXPORTS = {
+    'notify' : 'forward',
+    'RewardWorker' : 'reward',
+    'check_repo' : 'update',
+    'update_validator' : 'update',
+    'rebuild_simulator' : 'update',
+    'restart_simulator' : 'update',
+    'check_simulator' : 'update'
+}
+
+def __getattr__(name : str):
+    if name in EXPORTS:
+        return getattr(importlib.import_module(f'.{EXPORTS[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -19,72 +19,99 @@
 # DEALINGS IN THE SOFTWARE.
 
 import time
+import asyncio
+import numpy as np
 import bittensor as bt
 from typing import List
 
 from taos.im.neurons.validator import Validator
 from taos.im.protocol import FinanceAgentResponse, FinanceEventNotification, MarketSimulationStateUpdate
-from taos.im.protocol.instructions import *
+from taos.im.protocol.parser import parse_response
+from taos.im.utils.instructions import InstructionBatch
 from taos.im.validator.reward import set_delays
+from taos.im.utils.volume import TradeVolumes
 
-def validate_responses(self : Validator, synapses : dict[int, MarketSimulationStateUpdate]) -> None:
+def volume_limits(self : Validator) -> tuple[np.ndarray, float]:
     """
-    Checks responses from miners for any attempts at invalid actions, and enforces limits on instruction counts
+    Obtains the trading volumes of miners used in enforcing the volume cap.
+
+    Args:
+        self (taos.im.neurons.validator.Validator): The intelligent markets simulation validator.
+    Returns:
+        np.ndarray: Array of shape (uids, books) holding the total trading volume of each miner on each book over the assessment period.
+        float: The trading volume above which miners may only cancel orders.
+    """
+    # If a miner exceeds `capital_turnover_cap` times their initial wealth in trading volume over a single `trade_volume_assessment_period`, they are restricted from placing additional orders.
+    # Only cancellations may be submitted and processed by the miner until their volume on the specified book in the previous period is below the cap.
+    volume_cap = round(self.config.scoring.activity.capital_turnover_cap * (self.simulation.miner_wealth), self.simulation.volumeDecimals)
+    volumes = self.scoring_summary['volumes'][:, :, TradeVolumes.ROLES.index('total')]
+    return volumes, volume_cap
+
+def validate_responses(self : Validator, synapses : dict[int, MarketSimulationStateUpdate], limits : tuple[np.ndarray, float] | None = None) -> InstructionBatch:
+    """
+    Checks responses from miners for any attempts at invalid actions, and enforces limits on instruction counts.
+    Responses are parsed by `taos.im.protocol.parser.parse_response`, which reads only as much of each response as could be accepted, and the instructions
+    read from all miners are then validated together by `taos.im.utils.instructions.InstructionBatch.validate`.
+    The rules apply to each miner independently, so that the responses may be validated all together or in any number of separate calls.
+    The time taken to parse and number of instructions dropped for each miner are recorded in the miner statistics.
 
     Args:
         self (taos.im.neurons.validator.Validator): The intelligent markets simulation validator.
         synapses (list[taos.im.protocol.MarketSimulationStateUpdate]): The synapses with attached agent responses to be validated.
+        limits (tuple[np.ndarray, float]): The miner trading volumes and volume cap as returned by `volume_limits`; obtained from the validator state if not given.
     Returns:
-        None
+        InstructionBatch: The validated instructions of all miners.
     """
-    total_responses = 0
-    total_instructions = 0
+    volumes, volume_cap = limits if limits else volume_limits(self)
+    capped_books = volumes >= volume_cap
+    parsed = {}
     for uid, synapse in synapses.items():
-        valid_instructions = []
         if synapse.response:
-            synapse.decompress()
-            if synapse.compressed:
-                bt.logging.warning(f"Failed to decompress response for {uid}!")
+            parsed[uid] = parse_response(synapse.response, uid, self.simulation.book_count, self.config.scoring.max_instructions_per_book,
+                                         set(np.flatnonzero(capped_books[uid]).tolist()), self.config.scoring.max_response_size)
+            self.miner_stats[uid]['parse_time'].append(parsed[uid].parse_time)
+            synapse.compressed = False
+            if not parsed[uid].response:
+                bt.logging.warning(f"Invalid response submitted by agent {uid} ({parsed[uid].parse_time:.4f}s) : {parsed[uid].error}")
+                self.miner_stats[uid]['dropped'] += parsed[uid].received
                 synapse.response = None
-                continue
-            # If agents attempt to submit instructions for agent IDs other than their own, ignore these responses
-            if synapse.response.agent_id != uid:
-                bt.logging.warning(f"Invalid response submitted by agent {uid} (Mismatched Agent Ids) : {synapse.response}")
-                synapse.response = None
-                continue
-            volume_cap =  round(self.config.scoring.activity.capital_turnover_cap * (self.simulation.miner_wealth), self.simulation.volumeDecimals)
-            miner_volumes = {book_id : round(sum(book_volume['total'].values()), self.simulation.volumeDecimals) for book_id, book_volume in self.trade_volumes[uid].items()}        
-            for instruction in synapse.response.instructions:
-                if instruction.agentId != uid or instruction.type == 'RESET_AGENT':
-                    bt.logging.warning(f"Invalid instruction submitted by agent {uid} (Mismatched Agent Ids) : {instruction}")
-                    valid_instructions = []
-                    break
-                # If a miner exceeds `capital_turnover_cap` times their initial wealth in trading volume over a single `trade_volume_assessment_period`, they are restricted from placing additional orders.
-                # Only cancellations may be submitted and processed by the miner until their volume on the specified book in the previous period is below the cap.
-                if miner_volumes[instruction.bookId] >= volume_cap and instruction.type != "CANCEL_ORDERS":
-                    bt.logging.debug(f"Agent {uid} has reached their volume cap on book {instruction.bookId} : Traded {miner_volumes[instruction.bookId]} / {volume_cap}.")
-                    continue
-                if instruction.type in ['PLACE_ORDER_MARKET', 'PLACE_ORDER_LIMIT'] and instruction.stp == STP.NO_STP:
-                    instruction.stp = STP.CANCEL_OLDEST
-                valid_instructions.append(instruction)
-            final_instructions = []
-            # Enforce the configured limit on maximum submitted instructions (to prevent overloading simulator)
-            instructions_per_book = {}
-            for instruction in valid_instructions:
-                if hasattr(instruction, 'bookId') and instruction.bookId not in instructions_per_book:
-                    instructions_per_book[instruction.bookId] = 0
-                instructions_per_book[instruction.bookId] += 1
-                if instructions_per_book[instruction.bookId] < self.config.scoring.max_instructions_per_book:
-                    final_instructions.append(instruction)
-            if len(final_instructions) < len(valid_instructions):
-                bt.logging.warning(f"Agent {uid} sent more than {self.config.scoring.max_instructions_per_book} instructions on some books - excess instructions were dropped.")
-            # Update the synapse response with only the validated instructions
-            synapse.response.instructions = final_instructions
-            total_responses += 1
-            total_instructions += len(synapse.response.instructions)
         else:
-            bt.logging.debug(f"UID {uid} failed to respond : {synapse.dendrite.status_message}")    
-    bt.logging.info(f"Received {total_responses} valid responses containing {total_instructions} instructions.")
+            bt.logging.debug(f"UID {uid} failed to respond : {synapse.dendrite.status_message}")
+    received = InstructionBatch.from_responses(parsed)
+    batch, invalid, capped = received.validate(volumes, volume_cap, self.config.scoring.max_instructions_per_book)
+    uids, starts = np.unique(batch.uid, return_index=True)
+    accepted = dict(zip(uids.tolist(), np.split(batch.records, starts[1:]))) if len(batch) else {}
+    capped_counts = dict(zip(*[values.tolist() for values in np.unique(received.uid[capped], return_counts=True)]))
+    for uid in invalid.tolist():
+        bt.logging.warning(f"Invalid instruction submitted by agent {uid} (Mismatched Agent Ids) - no instructions were accepted.")
+    for uid, response in parsed.items():
+        if not response.response:
+            continue
+        instructions = list(accepted.get(uid, []))
+        dropped = response.received - len(instructions)
+        self.miner_stats[uid]['dropped'] += dropped
+        if uid not in invalid and dropped > capped_counts.get(uid, 0):
+            bt.logging.warning(f"Agent {uid} sent more than {self.config.scoring.max_instructions_per_book} instructions on some books - {dropped - capped_counts.get(uid, 0)} of {response.received} instructions were dropped ({response.parse_time:.4f}s).")
+        if uid in capped_counts:
+            bt.logging.debug(f"Agent {uid} has reached their volume cap on books {np.flatnonzero(capped_books[uid]).tolist()} ({volume_cap}) - {capped_counts[uid]} instructions were dropped.")
+        # Update the synapse response with only the validated instructions
+        synapses[uid].response = FinanceAgentResponse.model_construct(agent_id=uid, instructions=instructions)
+    return batch
+
+def process_response(self : Validator, uid : int, synapse_response : MarketSimulationStateUpdate, limits : tuple[np.ndarray, float]) -> InstructionBatch:
+    """
+    Validates the response of a single miner and sets the simulation time delay on its instructions, as soon as the response is received.
+
+    Args:
+        self (taos.im.neurons.validator.Validator): The intelligent markets simulation validator.
+        uid (int): The UID of the miner.
+        synapse_response (taos.im.protocol.MarketSimulationStateUpdate): The synapse returned by the miner.
+        limits (tuple[np.ndarray, float]): The miner trading volumes and volume cap as returned by `volume_limits`.
+    Returns:
+        InstructionBatch: The validated instructions of the miner, with delays applied.
+    """
+    synapse_responses = {uid : synapse_response}
+    return set_delays(self, synapse_responses, validate_responses(self, synapse_responses, limits))
 
 def update_stats(self : Validator, synapses : dict[int, MarketSimulationStateUpdate]) -> None:
     """
@@ -107,52 +134,94 @@ def update_stats(self : Validator, synapses : dict[int, MarketSimulationStateUpd
         elif synapse.dendrite.process_time:            
             self.miner_stats[uid]['call_time'].append(synapse.dendrite.process_time)
 
-async def forward(self : Validator, synapse : MarketSimulationStateUpdate) -> List[FinanceAgentResponse]:
+def miner_synapses(self : Validator, synapse : MarketSimulationStateUpdate) -> dict[int, MarketSimulationStateUpdate]:
+    """
+    Constructs the synapse to be sent to each miner.
+    Where enabled, each miner is sent the shared orderbook state together with only its own account and notices, and miners which acknowledged the previous state
+    are sent the orderbook levels as deltas relative to that state; otherwise all miners are sent the full compressed state.
+
+    Args:
+        self (taos.im.neurons.validator.Validator): The intelligent markets simulation validator.
+        synapse : The market state update synapse to be forwarded to miners
+    Returns:
+        dict[int, MarketSimulationStateUpdate] : The synapse to be sent to each UID.
+    """
+    start = time.time()
+    uids = range(len(self.metagraph.axons))
+    if self.config.neuron.per_miner_state:
+        delta_uids = self.state_acks if self.config.neuron.book_deltas else set()
+        synapses = synapse.split(uids, base=self.book_delta_base, delta_uids=delta_uids, codec=self.config.compression.codec, level=self.config.compression.level)
+        bt.logging.debug(f"Per-miner synapses compressed ({len(delta_uids)} deltas | {time.time()-start:.4f}s).")
+        return synapses
+    compressed = synapse.compress(codec=self.config.compression.codec, level=self.config.compression.level)
+    bt.logging.debug(f"Synapse compressed ({time.time()-start:.4f}s).")
+    return {uid : compressed.model_copy() for uid in uids}
+
+async def forward(self : Validator, synapse : MarketSimulationStateUpdate) -> InstructionBatch:
     """
     Forwards state update to miners, validates responses, calculates rewards and handles deregistered UIDs.
 
+    Each response is validated and has its delays set in `self.response_executor` as soon as it is received, while the remaining miners are still being awaited,
+    so that once the last response is received or the timeout is reached only the responses still in the executor remain to be processed.
+
     Args:
         self (taos.im.neurons.validator.Validator): The intelligent markets simulation validator.
         synapse : The market state update synapse to be forwarded to miners
     Returns:
-        List[FinanceAgentResponse] : Successfully validated responses generated by queried agents.
+        InstructionBatch : The validated instructions of all queried agents, to be returned to the simulator.
     """ 
-    responses = []
+    batches = []
     if self.deregistered_uids != []:
         # Account balances must be reset in the simulator for deregistered agent IDs.
         # The validator constructs a response containing the agent reset instruction for this purpose.
         response = FinanceAgentResponse(agent_id=self.uid)
         response.reset_agents(agent_ids=self.deregistered_uids)
-        responses.append(response)
+        batches.append(InstructionBatch.from_instructions(self.uid, response.instructions))
 
-    # Forward the simulation state update to all miners in the network
+    # Forward the simulation state update to all miners in the network, validating each response as it is received
     bt.logging.info(f"Querying Miners...")
     start = time.time()
-    synapse_responses = await self.dendrite(
-        axons=self.metagraph.axons,
-        synapse=synapse.compress(),
-        timeout=self.config.neuron.timeout,
-        deserialize=False
-    )
-    synapse_responses = {self.metagraph.hotkeys.index(synapse_response.axon.hotkey) : synapse_response for synapse_response in synapse_responses}
+    limits = volume_limits(self)
+    synapses = miner_synapses(self, synapse)
+    loop = asyncio.get_running_loop()
+    queries = {
+        asyncio.ensure_future(self.dendrite.call(
+            target_axon=axon,
+            synapse=synapses[uid],
+            timeout=self.config.neuron.timeout,
+            deserialize=False
+        )) : uid for uid, axon in enumerate(self.metagraph.axons)
+    }
+    synapse_responses = {}
+    processing = {}
+    pending = set(queries)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for query in done:
+            uid = queries[query]
+            synapse_responses[uid] = query.result()
+            processing[uid] = loop.run_in_executor(self.response_executor, process_response, self, uid, synapse_responses[uid], limits)
     bt.logging.debug(f"Dendrite call completed ({time.time()-start:.4f}s).")
+    # Instructions are returned in order of UID regardless of the order in which the responses were received.
+    synapse_responses = dict(sorted(synapse_responses.items()))
+    validated = await asyncio.gather(*[processing[uid] for uid in synapse_responses])
+    bt.logging.debug(f"Responses validated ({time.time()-start:.4f}s).")
+    if self.config.neuron.per_miner_state:
+        # Record which miners processed this state, so that they can be sent book deltas relative to it in the next step.
+        # Miners which timed out or failed to acknowledge will receive a full snapshot.
+        self.book_delta_base = synapse
+        self.state_acks = {uid for uid, synapse_response in synapse_responses.items() if synapse_response.is_success and synapse_response.state_ack == synapse.timestamp}
     self.dendrite.synapse_history = self.dendrite.synapse_history[-10:]
-    
-    # Validate the miner responses
-    bt.logging.info(f"Validating Responses...")
-    validate_responses(self, synapse_responses)
-    
+    bt.logging.info(f"Received {sum(1 for synapse_response in synapse_responses.values() if synapse_response.response)} valid responses containing {sum(len(batch) for batch in validated)} instructions.")
+
     # Update miner statistics
     bt.logging.debug(f"Updating Stats...")
-    start = time.time()
     update_stats(self, synapse_responses)
-    
-    # Set the simulation time delays on the instructions proportional to the response time,
-    # and add the modified responses to the return array.
-    bt.logging.debug(f"Setting Delays...")
-    responses.extend(set_delays(self, synapse_responses))
-    bt.logging.debug(f"Responses: {responses}")   
-    return responses
+
+    # Add the validated instructions, with simulation time delays set proportional to the response time, to those returned.
+    batch = InstructionBatch.concatenate(batches + validated)
+    bt.logging.debug(f"Responses: {batch}")
+    return batch
 
 async def notify(self : Validator, notices : List[FinanceEventNotification]) -> None:
     """
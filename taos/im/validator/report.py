@@ -1,18 +1,22 @@
 # SPDX-FileCopyrightText: 2025 Rayleigh Research <to@rayleigh.re>
 # SPDX-License-Identifier: MIT
-import os
 import traceback
 import time
 import torch
+import numpy as np
 import psutil
 import bittensor as bt
-import pandas as pd
 
 from taos.im.neurons.validator import Validator
+from taos.im.protocol import MarketSimulationStateUpdate
 from taos.im.protocol.models import TradeInfo
+from taos.im.protocol import structs
+from taos.im.utils.volume import TradeVolumes
+from taos.im.utils.metrics import ArrayCollector
+from concurrent.futures import Future, wait
 
 from taos.common.utils.prometheus import prometheus
-from prometheus_client import Counter, Gauge, Info
+from prometheus_client import Counter, Gauge, Info, REGISTRY
 
 def init_metrics(self : Validator) -> None:
     """
@@ -31,31 +35,35 @@ def init_metrics(self : Validator) -> None:
     self.prometheus_counters = Counter('counters', 'Counter summaries for the running validator.', ['wallet', 'netuid', 'timestamp', 'counter_name'])
     self.prometheus_simulation_gauges = Gauge('simulation_gauges', 'Gauge summaries for global simulation metrics.', ['wallet', 'netuid', 'simulation_gauge_name'])
     self.prometheus_validator_gauges = Gauge('validator_gauges', 'Gauge summaries for validator-related metrics.', ['wallet', 'netuid', 'validator_gauge_name'])
-    self.prometheus_miner_gauges = Gauge('miner_gauges', 'Gauge summaries for miner-related metrics.', ['wallet', 'netuid', 'agent_id', 'miner_gauge_name'])
-    self.prometheus_book_gauges = Gauge('book_gauges', 'Gauge summaries for book-related metrics.', ['wallet', 'netuid', 'book_id', 'level', 'book_gauge_name'])
-    self.prometheus_agent_gauges = Gauge('agent_gauges', 'Gauge summaries for agent-related metrics.', ['wallet', 'netuid', 'book_id', 'agent_id', 'agent_gauge_name'])
+    self.prometheus_stage_gauges = Gauge('stage_gauges', 'Latency in seconds of each stage in processing of the latest simulation state update.', ['wallet', 'netuid', 'stage'])
+    # High-cardinality per-book, per-agent and per-miner metrics are rendered from arrays at scrape time rather than set as individual gauges.
+    self.prometheus_collector = ArrayCollector({'wallet' : self.wallet.hotkey.ss58_address, 'netuid' : self.config.netuid})
+    self.prometheus_collector.gauge('miner_gauges', 'Gauge summaries for miner-related metrics.', ['wallet', 'netuid', 'agent_id', 'miner_gauge_name'])
+    self.prometheus_collector.gauge('book_gauges', 'Gauge summaries for book-related metrics.', ['wallet', 'netuid', 'book_id', 'level', 'book_gauge_name'])
+    self.prometheus_collector.gauge('agent_gauges', 'Gauge summaries for agent-related metrics.', ['wallet', 'netuid', 'book_id', 'agent_id', 'agent_gauge_name'])
 
-    self.prometheus_trades = Gauge('trades', 'Gauge summaries for trade metrics.', [
+    self.prometheus_collector.gauge('trades', 'Gauge summaries for trade metrics.', [
         'wallet', 'netuid', 'timestamp', 'timestamp_str', 'book_id', 'agent_id', 'trade_id', 
         'aggressing_order_id', 'aggressing_agent_id', 'resting_order_id', 'resting_agent_id', 
         'maker_fee', 'taker_fee',
         'price', 'volume', 'side', 'trade_gauge_name'])
-    self.prometheus_miner_trades = Gauge('miner_trades', 'Gauge summaries for agent trade metrics.', [
+    self.prometheus_collector.gauge('miner_trades', 'Gauge summaries for agent trade metrics.', [
         'wallet', 'netuid', 'timestamp', 'timestamp_str', 'book_id', 'uid', 
         'role', 'price', 'volume', 'side', 'fee',
         'miner_trade_gauge_name'])
-    self.prometheus_books = Gauge('books', 'Gauge summaries for book snapshot metrics.', [
+    self.prometheus_collector.gauge('books', 'Gauge summaries for book snapshot metrics.', [
         'wallet', 'netuid', 'timestamp', 'timestamp_str', 'book_id',
         'bid_5', 'bid_vol_5', 'bid_4', 'bid_vol_4', 'bid_3', 'bid_vol_3', 'bid_2', 'bid_vol_2', 'bid_1', 'bid_vol_1',
         'ask_5', 'ask_vol_5', 'ask_4', 'ask_vol_4', 'ask_3', 'ask_vol_3', 'ask_2', 'ask_vol_2', 'ask_1', 'ask_vol_1',
         'book_gauge_name'
     ])
-    self.prometheus_miners = Gauge('miners', 'Gauge summaries for miner metrics.', [
+    self.prometheus_collector.gauge('miners', 'Gauge summaries for miner metrics.', [
         'wallet', 'netuid', 'timestamp', 'timestamp_str', 'agent_id',
         'placement', 'base_balance', 'quote_balance', 'inventory_value', 'inventory_value_change', 'pnl', 'pnl_change', 
         'min_daily_volume','activity_factor', 'sharpe', 'unnormalized_score', 'score',
         'miner_gauge_name'
     ])
+    REGISTRY.register(self.prometheus_collector)
     self.prometheus_info = Info('neuron_info', "Info summaries for the running validator.", ['wallet', 'netuid'])
     
 def publish_validator_gauges(self : Validator):   
@@ -75,6 +83,8 @@ def publish_validator_gauges(self : Validator):
     self.prometheus_validator_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, validator_gauge_name="cpu_usage_percent").set( cpu_usage )
     self.prometheus_validator_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, validator_gauge_name="ram_usage_percent").set( memory_usage )
     self.prometheus_validator_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, validator_gauge_name="disk_usage_percent").set( disk_usage )
+    for name, value in self.dendrite.metrics().items():
+        self.prometheus_validator_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, validator_gauge_name=f"dendrite_{name}").set( value )
 
 def publish_info(self : Validator) -> None:
     """
@@ -105,170 +115,165 @@ def duration_from_timestamp(timestamp : int) -> str:
     days, hours = divmod(hours, 24)
     return (f"{days}d " if days > 0 else "") + f"{hours:02}:{minutes:02}:{seconds:02}.{nanoseconds:09d}"
 
-def report(self : Validator) -> None:
+# Names of the gauges published for each level of the orderbooks
+BOOK_LEVEL_GAUGES = ['bid', 'bid_vol', 'bid_vol_sum', 'ask', 'ask_vol', 'ask_vol_sum']
+# Names of the gauges published for each orderbook
+BOOK_GAUGES = ['mid', 'fundamental_price', 'trade_price', 'trade_volume', 'trade_buy_volume', 'trade_sell_volume']
+# Names of the gauges published for each agent on each book
+AGENT_GAUGES = [
+    'base_balance_initial', 'quote_balance_initial',
+    'base_balance_total', 'base_balance_free', 'base_balance_reserved', 'quote_balance_total', 'quote_balance_free', 'quote_balance_reserved',
+    'fees_traded_volume', 'fees_maker_rate', 'fees_taker_rate',
+    'inventory_value', 'pnl', 'daily_volume', 'daily_maker_volume', 'daily_taker_volume', 'daily_self_volume', 'activity_factor', 'sharpe'
+]
+# Names of the gauges published for each miner
+MINER_GAUGES = [
+    'total_base_balance', 'total_quote_balance', 'total_inventory_value', 'pnl',
+    'total_daily_volume', 'total_daily_maker_volume', 'total_daily_taker_volume', 'total_daily_self_volume',
+    'average_daily_volume', 'average_daily_maker_volume', 'average_daily_taker_volume', 'average_daily_self_volume',
+    'min_daily_volume', 'min_daily_maker_volume', 'min_daily_taker_volume', 'min_daily_self_volume',
+    'activity_factor', 'sharpe', 'unnormalized_score', 'score', 'placement', 'trust', 'consensus', 'incentive', 'emission',
+    'requests', 'success', 'failures', 'timeouts', 'rejections', 'call_time', 'parse_time', 'dropped_instructions', 'rtt'
+]
+
+def top_levels(side : str, levels : list) -> dict:
+    """
+    Label values for the price and quantity of the top 5 levels on one side of a book, as published with the `books` metric.
+    """
+    labels = {}
+    for i in reversed(range(5)):
+        labels[f"{side}_{i+1}"] = levels[i].price if len(levels) > i else 0
+        labels[f"{side}_vol_{i+1}"] = levels[i].quantity if len(levels) > i else 0
+    return labels
+
+def report(self : Validator, state : MarketSimulationStateUpdate, report_step : int, reward : Future | None = None) -> None:
     """
     Calculates and publishes metrics related to simulation state, validator and agent performance.
+    Reporting may run while the validator processes the next state, so metrics are calculated from the state and scoring summary of the reported step.
+    Per-book, per-agent and per-miner metrics are assembled into arrays and published to the validator's collector, from which they are rendered when scraped.
 
     Args:
         self (taos.im.neurons.validator.Validator): The intelligent markets simulation validator.
+        state (taos.im.protocol.MarketSimulationStateUpdate): The simulation state for which to publish metrics.
+        report_step (int): The validator step at which the state was received.
+        reward (concurrent.futures.Future): The future resolving to the result of scoring the state in the reward process.
     Returns:
         None
     """
     try:
-        self.reporting = True
-        report_step = self.step
-        bt.logging.info(f"Publishing Metrics at Step {self.step}...")
+        bt.logging.info(f"Publishing Metrics at Step {report_step}...")
         report_start = time.time()
         bt.logging.debug(f"Publishing simulation metrics...")
         start = time.time()
-        simulation_duration = duration_from_timestamp(self.simulation_timestamp)
-        self.prometheus_simulation_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, simulation_gauge_name="timestamp").set( self.simulation_timestamp )
+        simulation_duration = duration_from_timestamp(state.timestamp)
+        self.prometheus_simulation_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, simulation_gauge_name="timestamp").set( state.timestamp )
         self.prometheus_simulation_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, simulation_gauge_name="step_rate").set( sum(self.step_rates) / len(self.step_rates) if len(self.step_rates) > 0 else 0 )
         has_new_trades = False
         has_new_miner_trades = False
         
         publish_validator_gauges(self)    
         
-        self.prometheus_books.clear()
         bt.logging.debug(f"Simulation metrics published ({time.time()-start:.4f}s).")
-        if self.simulation.logDir:
+        fundamental_prices = None
+        reader = self.fundamental_prices
+        if self.simulation.logDir and reader:
             bt.logging.debug(f"Retrieving fundamental prices...")
             start = time.time()
-            df_fp = pd.read_csv(os.path.join(self.simulation.logDir,'fundamental.csv'))
-            df_fp.set_index('Timestamp', inplace=True)
-            self.fundamental_price = {bookId : df_fp[str(bookId)] for bookId in range(self.simulation.book_count)}
-            bt.logging.debug(f"Retrieved fundamental prices ({time.time()-start:.4f}s).")
-        a=0
+            # Only the rows appended since the last report are parsed
+            rows = reader.read()
+            fundamental_prices = reader.latest
+            bt.logging.debug(f"Retrieved {rows} new fundamental prices ({time.time()-start:.4f}s).")
         bt.logging.debug(f"Publishing book metrics...")
-        book_start = time.time()
-        for bookId, book in self.last_state.books.items():
-            if book.bids:
-                start = time.time()
-                bid_cumsum = 0
-                for i, level in enumerate(book.bids):
-                    self.prometheus_book_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, level=i, book_gauge_name="bid").set( level.price )
-                    self.prometheus_book_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, level=i, book_gauge_name="bid_vol").set( level.quantity )
-                    bid_cumsum += level.quantity
-                    self.prometheus_book_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, level=i, book_gauge_name="bid_vol_sum").set( bid_cumsum )
-                    if i == 20: break
-            if book.asks:
-                start = time.time()
-                ask_cumsum = 0
-                for i, level in enumerate(book.asks):
-                    self.prometheus_book_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, level=i, book_gauge_name="ask").set( level.price )
-                    self.prometheus_book_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, level=i, book_gauge_name="ask_vol").set( level.quantity )
-                    ask_cumsum += level.quantity
-                    self.prometheus_book_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, level=i, book_gauge_name="ask_vol_sum").set( ask_cumsum )
-                    if i == 20: break
-            bt.logging.debug(f"Book {bookId} levels metrics published ({time.time()-start:.4f}s).")
+        start = time.time()
+        book_ids = list(state.books.keys())
+        book_index = {bookId : i for i, bookId in enumerate(book_ids)}
+        book_levels = np.full((len(book_ids), 21, len(BOOK_LEVEL_GAUGES)), np.nan)
+        book_values = np.full((len(book_ids), len(BOOK_GAUGES)), np.nan)
+        books = []
+        for bookId, book in state.books.items():
+            i = book_index[bookId]
+            for side, levels in [('bid', book.bids), ('ask', book.asks)]:
+                if levels:
+                    column = BOOK_LEVEL_GAUGES.index(side)
+                    depth = np.array([[level.price, level.quantity] for level in levels[:21]])
+                    book_levels[i, :len(depth), column:column+2] = depth
+                    book_levels[i, :len(depth), column+2] = np.cumsum(depth[:, 1])
             if book.bids and book.asks:
-                start = time.time()
-                self.prometheus_book_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, level=0, book_gauge_name="mid").set( (book.bids[0].price + book.asks[0].price) / 2 )
-                def get_price(side, idx):
-                    if side == 'bid':
-                        return book.bids[idx].price if len(book.bids) > idx else 0
-                    if side == 'ask':
-                        return book.asks[idx].price if len(book.asks) > idx else 0
-                def get_vol(side, idx):
-                    if side == 'bid':
-                        return book.bids[idx].quantity if len(book.bids) > idx else 0
-                    if side == 'ask':
-                        return book.asks[idx].quantity if len(book.asks) > idx else 0
-                self.prometheus_books.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, timestamp=self.simulation_timestamp, timestamp_str=simulation_duration, book_id=bookId,
-                    bid_5=get_price('bid',4), bid_vol_5=get_vol('bid',4),bid_4=get_price('bid',3), bid_vol_4=get_vol('bid',3),bid_3=get_price('bid',2), bid_vol_3=get_vol('bid',2),bid_2=get_price('bid',1), bid_vol_2=get_vol('bid',1),bid_1=get_price('bid',0), bid_vol_1=get_vol('bid',0),
-                    ask_5=get_price('ask',4), ask_vol_5=get_vol('ask',4),ask_4=get_price('ask',3), ask_vol_4=get_vol('ask',3),ask_3=get_price('ask',2), ask_vol_3=get_vol('ask',2),ask_2=get_price('ask',1), ask_vol_2=get_vol('ask',1),ask_1=get_price('ask',0), ask_vol_1=get_vol('ask',0),
-                    book_gauge_name='books'
-                ).set( 1.0 )
-                bt.logging.debug(f"Book {bookId} aggregate metrics published ({time.time()-start:.4f}s).")
+                book_values[i, BOOK_GAUGES.index('mid')] = (book.bids[0].price + book.asks[0].price) / 2
+                books.append({'timestamp' : state.timestamp, 'timestamp_str' : simulation_duration, 'book_id' : bookId} | top_levels('bid', book.bids) | top_levels('ask', book.asks) | {'book_gauge_name' : 'books'})
             if book.events:
-                trades = [event for event in book.events if isinstance(event, TradeInfo)]
+                trades = [event for event in book.events if isinstance(event, (TradeInfo, structs.TradeInfo))]
                 if len(trades) > 0:
-                    start = time.time()
-                    last_trade = trades[-1]
-                    if isinstance(self.fundamental_price[0],pd.Series):
-                        self.prometheus_book_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, level=0, book_gauge_name="fundamental_price").set( self.fundamental_price[bookId].iloc[-1] )
-                    self.prometheus_book_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, level=0, book_gauge_name="trade_price").set( last_trade.price )
-                    self.prometheus_book_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, level=0, book_gauge_name="trade_volume").set( sum([trade.quantity for trade in trades]) )
-                    self.prometheus_book_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, level=0, book_gauge_name="trade_buy_volume").set( sum([trade.quantity for trade in trades if trade.side == 0]) )
-                    self.prometheus_book_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, level=0, book_gauge_name="trade_sell_volume").set( sum([trade.quantity for trade in trades if trade.side == 1]) )
+                    if fundamental_prices is not None:
+                        book_values[i, BOOK_GAUGES.index('fundamental_price')] = fundamental_prices[bookId]
+                    book_values[i, BOOK_GAUGES.index('trade_price')] = trades[-1].price
+                    book_values[i, BOOK_GAUGES.index('trade_volume')] = sum([trade.quantity for trade in trades])
+                    book_values[i, BOOK_GAUGES.index('trade_buy_volume')] = sum([trade.quantity for trade in trades if trade.side == 0])
+                    book_values[i, BOOK_GAUGES.index('trade_sell_volume')] = sum([trade.quantity for trade in trades if trade.side == 1])
                     self.recent_trades[bookId].extend(trades)
                     self.recent_trades[bookId] = self.recent_trades[bookId][-25:]
                     has_new_trades = True
-                bt.logging.debug(f"Book {bookId} events metrics published ({time.time()-start:.4f}s).")
-            
-        bt.logging.debug(f"Book metrics published ({time.time()-book_start}s).")
+        self.prometheus_collector.set_values('book_gauges', book_levels, book_id=book_ids, level=range(21), book_gauge_name=BOOK_LEVEL_GAUGES)
+        self.prometheus_collector.set_values('book_gauges', book_values, book_id=book_ids, level=0, book_gauge_name=BOOK_GAUGES)
+        self.prometheus_collector.set_rows('books', books)
+        bt.logging.debug(f"Book metrics published ({time.time()-start:.4f}s).")
         if has_new_trades:
             bt.logging.debug(f"Publishing trade metrics...")
             start = time.time()
-            self.prometheus_trades.clear()
-            for bookId, trades in self.recent_trades.items():
-                for trade in trades:
-                    self.prometheus_trades.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, 
-                                                timestamp=trade.timestamp, timestamp_str=duration_from_timestamp(trade.timestamp), 
-                                                book_id=bookId, agent_id=trade.taker_agent_id,
-                                                trade_id=trade.id, aggressing_order_id=trade.taker_id, resting_order_id=trade.maker_id,
-                                                aggressing_agent_id=trade.taker_agent_id, resting_agent_id=trade.maker_agent_id,
-                                                price=trade.price, volume=trade.quantity, side=trade.side, 
-                                                maker_fee=trade.maker_fee, taker_fee=trade.taker_fee, 
-                                                trade_gauge_name="trades").set( 1.0 )
+            self.prometheus_collector.set_rows('trades', [
+                {
+                    'timestamp' : trade.timestamp, 'timestamp_str' : duration_from_timestamp(trade.timestamp),
+                    'book_id' : bookId, 'agent_id' : trade.taker_agent_id,
+                    'trade_id' : trade.id, 'aggressing_order_id' : trade.taker_id, 'resting_order_id' : trade.maker_id,
+                    'aggressing_agent_id' : trade.taker_agent_id, 'resting_agent_id' : trade.maker_agent_id,
+                    'price' : trade.price, 'volume' : trade.quantity, 'side' : trade.side,
+                    'maker_fee' : trade.maker_fee, 'taker_fee' : trade.taker_fee,
+                    'trade_gauge_name' : "trades"
+                } for bookId, trades in self.recent_trades.items() for trade in trades
+            ])
             bt.logging.debug(f"Trade metrics published ({time.time()-start:.4f}s).")
 
-        if self.last_state.accounts:
+        if state.accounts:
             bt.logging.debug(f"Publishing accounts metrics...")
             start = time.time()            
-            while self.rewarding:
+            if reward and not reward.done():
                 bt.logging.info(f"Waiting for reward calculation to complete before obtaining daily volumes...")
-                time.sleep(0.5)
-            daily_volumes = {agentId : 
-                {bookId : {
-                    role : round(sum([volume for volume in self.trade_volumes[agentId][bookId][role].values()]), self.simulation.volumeDecimals) for role in ['total', 'maker', 'taker', 'self']
-                } for bookId in range(self.simulation.book_count)} 
-                for agentId in self.last_state.accounts.keys() 
-            }
-            bt.logging.debug(f"Daily volumes calculated ({time.time()-start:.4f}s).")
+                wait([reward])
+            summary = reward.result()['summary'] if reward and not reward.exception() else self.scoring_summary
+            # Trading volumes over the assessment period for each agent, book and role, ordered as `TradeVolumes.ROLES`
+            volumes = summary['volumes']
+            agent_ids = list(state.accounts.keys())
+            agent_values = np.full((len(agent_ids), len(book_ids), len(AGENT_GAUGES)), np.nan)
             initial_balance_publish_status = {f"{uid}_{bookId}" : False for bookId in range(self.simulation.book_count) for uid in range(self.subnet_info.max_uids)}
-            start = time.time()
-            for agentId, accounts in self.last_state.accounts.items():
+            for i, (agentId, accounts) in enumerate(state.accounts.items()):
                 for bookId, account in accounts.items():                    
                     if self.initial_balances[agentId][bookId]['BASE'] == None:
                         self.initial_balances[agentId][bookId]['BASE'] = account.base_balance.total
                     if self.initial_balances[agentId][bookId]['QUOTE'] == None:
                         self.initial_balances[agentId][bookId]['QUOTE'] = account.quote_balance.total
                     if not self.initial_balances_published:
-                        self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="base_balance_initial").set( self.initial_balances[agentId][bookId]['BASE'] )                        
-                        self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="quote_balance_initial").set( self.initial_balances[agentId][bookId]['QUOTE'] )
+                        agent_values[i, book_index[bookId], :2] = [self.initial_balances[agentId][bookId]['BASE'], self.initial_balances[agentId][bookId]['QUOTE']]
                         initial_balance_publish_status[f"{agentId}_{bookId}"] = True
-                if agentId < 0 or len(self.inventory_history[agentId]) < 3: continue
-                start_inv = [i for i in list(self.inventory_history[agentId].values()) if len(i) > bookId][0]
-                last_inv = list(self.inventory_history[agentId].values())[-1]
+                if agentId < 0 or summary['inventory_counts'][agentId] < 3: continue
+                start_inv = summary['inventory_first'][agentId].tolist()
+                last_inv = summary['inventory_last'][agentId].tolist()
                 sharpes = self.sharpe_values[agentId]
                 for bookId, account in accounts.items():
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="base_balance_total").set( account.base_balance.total )
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="base_balance_free").set( account.base_balance.free )
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="base_balance_reserved").set( account.base_balance.reserved )
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="quote_balance_total").set( account.quote_balance.total )
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="quote_balance_free").set( account.quote_balance.free )
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="quote_balance_reserved").set( account.quote_balance.reserved )                    
-                    
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="fees_traded_volume").set( account.fees.volume_traded )
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="fees_maker_rate").set( account.fees.maker_fee_rate )
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="fees_taker_rate").set( account.fees.taker_fee_rate )
-                    
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="inventory_value").set( last_inv[bookId] )
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="pnl").set( last_inv[bookId] - start_inv[bookId] )
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="daily_volume").set( daily_volumes[agentId][bookId]['total'] )
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="daily_maker_volume").set( daily_volumes[agentId][bookId]['maker'] )
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="daily_taker_volume").set( daily_volumes[agentId][bookId]['taker'] )
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="daily_self_volume").set( daily_volumes[agentId][bookId]['self'] )
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="activity_factor").set( self.activity_factors[agentId][bookId] )
-                    self.prometheus_agent_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, book_id=bookId, agent_id=agentId, agent_gauge_name="sharpe").set( sharpes['books'][bookId] )
+                    agent_values[i, book_index[bookId], 2:] = [
+                        account.base_balance.total, account.base_balance.free, account.base_balance.reserved,
+                        account.quote_balance.total, account.quote_balance.free, account.quote_balance.reserved,
+                        account.fees.volume_traded, account.fees.maker_fee_rate, account.fees.taker_fee_rate,
+                        last_inv[bookId], last_inv[bookId] - start_inv[bookId], *volumes[agentId, bookId],
+                        self.activity_factors[agentId][bookId], sharpes['books'][bookId]
+                    ]
             if all(initial_balance_publish_status):
                 self.initial_balances_published = True
+            self.prometheus_collector.set_values('agent_gauges', agent_values, agent_id=agent_ids, book_id=book_ids, agent_gauge_name=AGENT_GAUGES)
             bt.logging.debug(f"Agent book metrics published ({time.time()-start:.4f}s).")
             
             bt.logging.debug(f"Publishing miner trade metrics...")
             start = time.time()
-            for agentId, notices in self.last_state.notices.items():
+            for agentId, notices in state.notices.items():
                 if agentId < 0: continue
                 for notice in notices:
                     if notice.type == "EVENT_TRADE":
@@ -280,18 +285,20 @@ def report(self : Validator) -> None:
                             self.recent_miner_trades[miner_trade.makerAgentId if role == "maker" else miner_trade.takerAgentId][miner_trade.bookId].append([miner_trade, role])
             
             if has_new_miner_trades:
-                self.prometheus_miner_trades.clear()
+                miner_trades_rows = []
                 for uid, book_miner_trades in self.recent_miner_trades.items():
                     for bookId, miner_trades in book_miner_trades.items():
                         self.recent_miner_trades[uid][bookId] = miner_trades[-5:]
                         for miner_trade, role in self.recent_miner_trades[uid][bookId]:
-                            self.prometheus_miner_trades.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, 
-                                    timestamp=miner_trade.timestamp, timestamp_str=duration_from_timestamp(miner_trade.timestamp), book_id=miner_trade.bookId, uid=uid,
-                                    role=role, fee=miner_trade.makerFee if role == 'maker' else miner_trade.takerFee,
-                                    price=miner_trade.price, volume=miner_trade.quantity, side=miner_trade.side, miner_trade_gauge_name="miner_trades").set( 1.0 )
+                            miner_trades_rows.append({
+                                'timestamp' : miner_trade.timestamp, 'timestamp_str' : duration_from_timestamp(miner_trade.timestamp), 'book_id' : miner_trade.bookId, 'uid' : uid,
+                                'role' : role, 'fee' : miner_trade.makerFee if role == 'maker' else miner_trade.takerFee,
+                                'price' : miner_trade.price, 'volume' : miner_trade.quantity, 'side' : miner_trade.side, 'miner_trade_gauge_name' : "miner_trades"
+                            })
+                self.prometheus_collector.set_rows('miner_trades', miner_trades_rows)
             bt.logging.debug(f"Miner Trade metrics published ({time.time()-start:.4f}s).")
             
-            self.prometheus_miners.clear()
+            start = time.time()
             # # neurons_lite call fails after first call, we cannot calculate network-wide miner placement until this is resolved
             # neurons = self.subtensor.neurons_lite(self.config.netuid)
             # network_scores = torch.tensor([n.pruning_score for n in neurons])
@@ -301,75 +308,53 @@ def report(self : Validator) -> None:
             scores = self.scores.detach().clone()
             indices = scores.argsort(dim=-1, descending=True)
             placements = torch.empty_like(indices).scatter_(-1, indices, torch.arange(scores.size(-1), device=scores.device))
-            time_metric = 0
-            time_gauges = 0
-            for agentId, accounts in self.last_state.accounts.items():
-                if agentId < 0 or len(self.inventory_history[agentId]) < 3: continue
-                total_inventory_history[agentId] = [sum(list(inventory_value.values())) for inventory_value in list(self.inventory_history[agentId].values())]
+            miner_values = np.full((len(agent_ids), len(MINER_GAUGES)), np.nan)
+            miners = []
+            for i, (agentId, accounts) in enumerate(state.accounts.items()):
+                if agentId < 0 or summary['inventory_counts'][agentId] < 3: continue
+                total_inventory_history[agentId] = [summary['inventory_first'][agentId].sum(), summary['inventory_previous'][agentId].sum(), summary['inventory_last'][agentId].sum()]
                 pnl[agentId] = total_inventory_history[agentId][-1] - total_inventory_history[agentId][0]
-                total_base_balance = round(sum([accounts[bookId].base_balance.total for bookId in self.last_state.books]), self.simulation.baseDecimals)
-                total_quote_balance = round(sum([accounts[bookId].quote_balance.total for bookId in self.last_state.books]), self.simulation.baseDecimals)
-                total_daily_volume = {
-                    role : round(sum([book_volume[role] for book_volume in daily_volumes[agentId].values()]), self.simulation.volumeDecimals) for role in ['total', 'maker', 'taker', 'self']
-                }
-                average_daily_volume = {
-                    role : round(total_daily_volume[role] / len(daily_volumes[agentId]), self.simulation.volumeDecimals) for role in ['total', 'maker', 'taker', 'self']
-                }
-                min_daily_volume = {
-                    role : min([book_volume[role] for book_volume in daily_volumes[agentId].values()]) for role in ['total', 'maker', 'taker', 'self']
-                }
+                total_base_balance = round(sum([accounts[bookId].base_balance.total for bookId in state.books]), self.simulation.baseDecimals)
+                total_quote_balance = round(sum([accounts[bookId].quote_balance.total for bookId in state.books]), self.simulation.baseDecimals)
+                book_volumes = volumes[agentId].tolist()
+                total_daily_volume = [round(sum([book_volume[role] for book_volume in book_volumes]), self.simulation.volumeDecimals) for role in range(len(TradeVolumes.ROLES))]
+                average_daily_volume = [round(total_daily_volume[role] / len(book_volumes), self.simulation.volumeDecimals) for role in range(len(TradeVolumes.ROLES))]
+                min_daily_volume = [min([book_volume[role] for book_volume in book_volumes]) for role in range(len(TradeVolumes.ROLES))]
                 # # neurons_lite call fails after first call, we cannot calculate network-wide miner placement until this is resolved
                 # uids_at_score = (network_scores == neurons[agentId].pruning_score).nonzero().flatten().sort().values.flip(0)
                 # min_place_for_score = (sorted_scores.values == neurons[agentId].pruning_score).nonzero().flatten()[0].item()
                 # placement = min_place_for_score + (uids_at_score == agentId).nonzero().flatten().item()
-                start_gauges = time.time()
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="total_base_balance").set(total_base_balance)
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="total_quote_balance").set(total_quote_balance)
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="total_inventory_value").set(total_inventory_history[agentId][-1])
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="pnl").set(pnl[agentId])
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="total_daily_volume").set(total_daily_volume['total'])
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="total_daily_maker_volume").set(total_daily_volume['maker'])
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="total_daily_taker_volume").set(total_daily_volume['taker'])
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="total_daily_self_volume").set(total_daily_volume['self'])
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="average_daily_volume").set(average_daily_volume['total'])
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="average_daily_maker_volume").set(average_daily_volume['maker'])
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="average_daily_taker_volume").set(average_daily_volume['taker'])
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="average_daily_self_volume").set(average_daily_volume['self'])
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="min_daily_volume").set(min_daily_volume['total'])
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="min_daily_maker_volume").set(min_daily_volume['maker'])
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="min_daily_taker_volume").set(min_daily_volume['taker'])
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="min_daily_self_volume").set(min_daily_volume['self'])
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="activity_factor").set(min(self.activity_factors[agentId].values()))                
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="sharpe").set(self.sharpe_values[agentId]['median'])
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="unnormalized_score").set(self.unnormalized_scores[agentId])
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="score").set(scores[agentId].item())
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="placement").set(placements[agentId].item())
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="trust").set(self.metagraph.trust[agentId] if len(self.metagraph.trust) > agentId else 0.0)
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="consensus").set(self.metagraph.consensus[agentId] if len(self.metagraph.consensus) > agentId else 0.0)
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="incentive").set(self.metagraph.incentive[agentId] if len(self.metagraph.incentive) > agentId else 0.0)
-                self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="emission").set(self.metagraph.emission[agentId] if len(self.metagraph.emission) > agentId else 0.0)
-                if self.simulation_timestamp % (self.simulation.publish_interval * 100) == 0:
-                    self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="requests").set( self.miner_stats[agentId]['requests'] )
-                    self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="success").set( self.miner_stats[agentId]['requests'] - self.miner_stats[agentId]['failures'] - self.miner_stats[agentId]['timeouts'] - self.miner_stats[agentId]['rejections'] )
-                    self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="failures").set( self.miner_stats[agentId]['failures'] )
-                    self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="timeouts").set( self.miner_stats[agentId]['timeouts'] )
-                    self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="rejections").set( self.miner_stats[agentId]['rejections'] )
-                    self.prometheus_miner_gauges.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId, miner_gauge_name="call_time").set( sum(self.miner_stats[agentId]['call_time']) / len(self.miner_stats[agentId]['call_time']) if len(self.miner_stats[agentId]['call_time']) > 0 else 0 )
-                    self.miner_stats[agentId] = {'requests' : 0, 'timeouts' : 0, 'failures' : 0, 'rejections' : 0, 'call_time' : []}
-                time_gauges += time.time() - start_gauges
-                start_metric = time.time()
-                self.prometheus_miners.labels( wallet=self.wallet.hotkey.ss58_address, netuid=self.config.netuid, agent_id=agentId,
-                    timestamp=self.simulation_timestamp, timestamp_str=simulation_duration,
-                    placement=placements[agentId].item(), base_balance=total_base_balance, quote_balance=total_quote_balance,
-                    inventory_value=total_inventory_history[agentId][-1], inventory_value_change=total_inventory_history[agentId][-1] - total_inventory_history[agentId][-2] if len(total_inventory_history[agentId]) > 1 else 0.0,
-                    pnl=pnl[agentId], pnl_change=pnl[agentId] - (total_inventory_history[agentId][-2] - total_inventory_history[agentId][0]) if len(total_inventory_history[agentId]) > 1 else 0.0,
-                    min_daily_volume=min_daily_volume['total'], activity_factor=min(self.activity_factors[agentId].values()), sharpe=self.sharpe_values[agentId]['median'], unnormalized_score=self.unnormalized_scores[agentId], score=scores[agentId].item(),
-                    miner_gauge_name='miners'
-                ).set( 1.0 )
-                time_metric += time.time() - start_metric
-            bt.logging.debug(f"Accounts metrics published ({time.time()-start:.4f}s | Gauges ({time_gauges}s) | Metrics ({time_metric}s)")        
+                miner_values[i, :MINER_GAUGES.index('requests')] = [
+                    total_base_balance, total_quote_balance, total_inventory_history[agentId][-1], pnl[agentId],
+                    *total_daily_volume, *average_daily_volume, *min_daily_volume,
+                    min(self.activity_factors[agentId].values()), self.sharpe_values[agentId]['median'], self.unnormalized_scores[agentId], scores[agentId].item(), placements[agentId].item(),
+                    float(self.metagraph.trust[agentId]) if len(self.metagraph.trust) > agentId else 0.0,
+                    float(self.metagraph.consensus[agentId]) if len(self.metagraph.consensus) > agentId else 0.0,
+                    float(self.metagraph.incentive[agentId]) if len(self.metagraph.incentive) > agentId else 0.0,
+                    float(self.metagraph.emission[agentId]) if len(self.metagraph.emission) > agentId else 0.0
+                ]
+                if state.timestamp % (self.simulation.publish_interval * 100) == 0:
+                    miner_values[i, MINER_GAUGES.index('requests'):] = [
+                        self.miner_stats[agentId]['requests'],
+                        self.miner_stats[agentId]['requests'] - self.miner_stats[agentId]['failures'] - self.miner_stats[agentId]['timeouts'] - self.miner_stats[agentId]['rejections'],
+                        self.miner_stats[agentId]['failures'], self.miner_stats[agentId]['timeouts'], self.miner_stats[agentId]['rejections'],
+                        sum(self.miner_stats[agentId]['call_time']) / len(self.miner_stats[agentId]['call_time']) if len(self.miner_stats[agentId]['call_time']) > 0 else 0,
+                        sum(self.miner_stats[agentId]['parse_time']) / len(self.miner_stats[agentId]['parse_time']) if len(self.miner_stats[agentId]['parse_time']) > 0 else 0,
+                        self.miner_stats[agentId]['dropped'],
+                        self.dendrite.rtt.get(self.metagraph.hotkeys[agentId], 0.0) if len(self.metagraph.hotkeys) > agentId else 0.0
+                    ]
+                    self.miner_stats[agentId] = {'requests' : 0, 'timeouts' : 0, 'failures' : 0, 'rejections' : 0, 'call_time' : [], 'parse_time' : [], 'dropped' : 0}
+                miners.append({
+                    'agent_id' : agentId, 'timestamp' : state.timestamp, 'timestamp_str' : simulation_duration,
+                    'placement' : placements[agentId].item(), 'base_balance' : total_base_balance, 'quote_balance' : total_quote_balance,
+                    'inventory_value' : total_inventory_history[agentId][-1], 'inventory_value_change' : total_inventory_history[agentId][-1] - total_inventory_history[agentId][-2] if len(total_inventory_history[agentId]) > 1 else 0.0,
+                    'pnl' : pnl[agentId], 'pnl_change' : pnl[agentId] - (total_inventory_history[agentId][-2] - total_inventory_history[agentId][0]) if len(total_inventory_history[agentId]) > 1 else 0.0,
+                    'min_daily_volume' : min_daily_volume[0], 'activity_factor' : min(self.activity_factors[agentId].values()), 'sharpe' : self.sharpe_values[agentId]['median'], 'unnormalized_score' : self.unnormalized_scores[agentId], 'score' : scores[agentId].item(),
+                    'miner_gauge_name' : 'miners'
+                })
+            self.prometheus_collector.set_values('miner_gauges', miner_values, agent_id=agent_ids, miner_gauge_name=MINER_GAUGES)
+            self.prometheus_collector.set_rows('miners', miners)
+            bt.logging.debug(f"Miner metrics published ({time.time()-start:.4f}s).")
         bt.logging.info(f"Metrics Published for Step {report_step}  ({time.time()-report_start}s).")
     except Exception as ex:
         self.pagerduty_alert(f"Unable to publish metrics : {ex}", details={"traceback" : traceback.format_exc()})
-    finally:
-        self.reporting = False
\ No newline at end of file
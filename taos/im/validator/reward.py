@@ -18,15 +18,28 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 
-import torch
+from __future__ import annotations
+
 import math
 import traceback
+import multiprocessing
 import bittensor as bt
 import numpy as np
-from typing import List, Dict
-from taos.im.neurons.validator import Validator
-from taos.im.protocol import MarketSimulationStateUpdate, FinanceAgentResponse
-from taos.im.protocol.models import Account, Book
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing.connection import Connection
+from threading import Thread, Lock
+from types import SimpleNamespace
+from typing import List, Dict, TYPE_CHECKING
+from taos.im.protocol import MarketSimulationStateUpdate
+from taos.im.protocol.models import Account, Book, MarketSimulationConfig
+from taos.im.utils.inventory import InventoryHistory
+from taos.im.utils.volume import TradeVolumes
+
+if TYPE_CHECKING:
+    # The validator is not imported by the reward process, which requires only the scoring routines
+    from taos.im.neurons.validator import Validator
+    from taos.im.utils.instructions import InstructionBatch
 
 def get_inventory_value(account : Account, book : Book, method='midquote') -> float:
     """
@@ -66,6 +79,7 @@ def sharpe(self : Validator, uid : int, inventory_values : Dict[int, Dict[int,fl
     """
     Calculates intraday Sharpe ratios for a particular UID using the change in inventory values over previous `config.scoring.sharpe.lookback` observations to represent returns.
     Values are also stored to a property of the Validator class to be accessed later for scoring and reporting purposes.
+    Scoring during validation uses the equivalent calculation for all UIDs in `score_inventory_histories`; this implementation is retained as reference.
 
     Args:
         self (taos.im.neurons.validator.Validator) : Validator instance
@@ -131,7 +145,8 @@ def sharpe(self : Validator, uid : int, inventory_values : Dict[int, Dict[int,fl
 
 def score_inventory_values(self : Validator, uid : int, inventory_values : Dict[int, Dict[int,float]]) -> float:
     """
-    Calculates the new score value for a specific UID
+    Calculates the new score value for a specific UID.
+    Scoring during validation uses the equivalent calculation for all UIDs in `score_inventory_histories`; this implementation is retained as reference.
 
     Args:
         self (taos.im.neurons.validator.Validator) : Validator instance
@@ -147,11 +162,11 @@ def score_inventory_values(self : Validator, uid : int, inventory_values : Dict[
     # The maximum volume to be traded by a miner in a `trade_volume_assessment_period` (24H) is `capital_turnover_cap` (10) times the initial miner capital
     volume_cap =  round(self.config.scoring.activity.capital_turnover_cap * (self.simulation.miner_wealth), self.simulation.volumeDecimals)
     # Calculate the volume traded by miners on each book in the period over which Sharpe values were calculated
-    miner_volumes = {book_id : round(sum([volume for time, volume in book_volume['total'].items() if time >= self.simulation_timestamp - self.config.scoring.sharpe.lookback * self.simulation.publish_interval]), self.simulation.volumeDecimals) for book_id, book_volume in self.trade_volumes[uid].items()}
+    miner_volumes = dict(enumerate(self.trade_volumes.since(self.simulation_timestamp - self.config.scoring.sharpe.lookback * self.simulation.publish_interval, [uid])[0].tolist()))
     # Calculate the factor to be multiplied on the Sharpes when there has been no trading activity in the previous Sharpe assessment window
     # This factor is designed to reduce the activity multiplier by half after each `sharpe.lookback` steps of inactivity
     inactivity_decay_factor = (2 ** (-1 / self.config.scoring.sharpe.lookback))
-    latest_volumes = {book_id : list(book_volume['total'].values())[-1] if len(book_volume['total']) > 0 else 0.0 for book_id, book_volume in self.trade_volumes[uid].items()}
+    latest_volumes = dict(enumerate(self.trade_volumes.latest([uid])[0].tolist()))
     # Calculate the activity factors to be multiplied onto the Sharpes to obtain the final values for assessment
     # If the miner has traded in the previous Sharpe assessment window, the factor is equal to the ratio of the miner trading volume to the cap
     # If the miner has not traded, their existing activity factor is decayed by the factor defined above so as to halve the miner score over each Sharpe assessment window where they remain inactive
@@ -179,94 +194,413 @@ def score_inventory_values(self : Validator, uid : int, inventory_values : Dict[
     
     return self.reward_weights['sharpe'] * sharpe_score
 
-def reward(self : Validator, synapse : MarketSimulationStateUpdate, uid : int) -> float:
+def sharpe_ratios(values : np.ndarray, valid : np.ndarray) -> np.ndarray:
+    """
+    Calculates Sharpe ratios of a batch of value series in a single pass, using the change in value between consecutive observations to represent returns.
+    Results are identical to those obtained from the per-UID calculation in `sharpe`; sums are accumulated in observation order and powers are evaluated
+    with `np.float_power`, which matches the scalar arithmetic used in that calculation.
+
+    Args:
+        values (np.ndarray) : Value series of shape `(..., lookback)`, ordered chronologically along the last axis
+        valid (np.ndarray) : Mask of shape `(..., lookback - 1)`, broadcastable against the returns, indicating the returns to be included in the calculation
+
+    Returns:
+        np.ndarray: Sharpe ratio of each series.
     """
-    Calculate and store the scores for a particular miner.
+    returns = np.where(valid, values[..., 1:] - values[..., :-1], 0.0)
+    n = np.broadcast_to(valid, returns.shape).sum(axis=-1)
+    mean = np.divide(np.cumsum(returns, axis=-1)[..., -1], n, out=np.zeros(returns.shape[:-1]), where=n > 0)
+    deviations = np.where(valid, np.float_power(returns - mean[..., None], 2.0), 0.0)
+    variance = np.divide(np.cumsum(deviations, axis=-1)[..., -1], n, out=np.zeros(returns.shape[:-1]), where=n > 0)
+    std = np.float_power(variance, 0.5)
+    return np.sqrt(n) * np.divide(mean, std, out=np.zeros_like(mean), where=std != 0.0)
+
+def score_inventory_histories(self : Validator, uids : np.ndarray) -> np.ndarray:
+    """
+    Calculates the new score values for a set of UIDs from the inventory histories maintained by the validator.
+    Sharpe ratios, activity factors and outlier penalties are evaluated for all UIDs at once, producing the same values as `score_inventory_values` applied to each UID.
+    Sharpe values and activity factors are stored to properties of the Validator class for the UIDs scored.
+    UIDs having fewer than two inventory observations cannot be assessed and retain their existing score.
+
+    Args:
+        self (taos.im.neurons.validator.Validator) : Validator instance
+        uids (np.ndarray) : UIDs of the miners to be scored
+
+    Returns:
+        np.ndarray: The new score value for each of the given UIDs.
+    """
+    scores = np.array([self.scores[uid].item() for uid in uids], dtype=np.float64)
+    scored = self.inventory_history.counts[uids] > 1
+    uids = uids[scored]
+    if len(uids) == 0:
+        return scores
+    lower, upper = self.config.scoring.sharpe.normalization_min, self.config.scoring.sharpe.normalization_max
+    values, timestamps, valid = self.inventory_history.window(uids)
+    # Returns spanning a simulation changeover (where timestamps decrease) or involving unpopulated entries are excluded
+    valid_returns = valid[:, 1:] & valid[:, :-1] & ~(timestamps[:, 1:] < timestamps[:, :-1])
+    # Calculate the per-book and total Sharpe ratio values, where total inventory values are summed over books in order of book ID
+    total_values = np.cumsum(values, axis=1)[:, -1:, :]
+    ratios = sharpe_ratios(np.concatenate([values, total_values], axis=1), valid_returns[:, None, :])
+    book_sharpes, total_sharpes = ratios[:, :-1], ratios[:, -1]
+    average_sharpes = np.cumsum(book_sharpes, axis=1)[:, -1] / book_sharpes.shape[1]
+    median_sharpes = np.median(book_sharpes, axis=1)
+    normalized_sharpes = (np.clip(book_sharpes, lower, upper) + upper) / (upper - lower)
+    for i, uid in enumerate(uids.tolist()):
+        self.sharpe_values[uid]['books'] = dict(enumerate(book_sharpes[i].tolist()))
+        self.sharpe_values[uid]['total'] = total_sharpes[i].item()
+        self.sharpe_values[uid]['average'] = average_sharpes[i].item()
+        self.sharpe_values[uid]['median'] = median_sharpes[i].item()
+        self.sharpe_values[uid]['normalized_average'] = normalize(lower, upper, average_sharpes[i].item())
+        self.sharpe_values[uid]['normalized_total'] = normalize(lower, upper, total_sharpes[i].item())
+        self.sharpe_values[uid]['normalized_median'] = normalize(lower, upper, median_sharpes[i].item())
+
+    # The maximum volume to be traded by a miner in a `trade_volume_assessment_period` (24H) is `capital_turnover_cap` (10) times the initial miner capital
+    volume_cap =  round(self.config.scoring.activity.capital_turnover_cap * (self.simulation.miner_wealth), self.simulation.volumeDecimals)
+    # Calculate the volume traded by miners on each book in the period over which Sharpe values were calculated, and the volume traded in the latest sampling interval
+    lookback_start = self.simulation_timestamp - self.config.scoring.sharpe.lookback * self.simulation.publish_interval
+    miner_volumes = self.trade_volumes.since(lookback_start, uids)
+    latest_volumes = self.trade_volumes.latest(uids)
+    previous_activity_factors = np.array([[self.activity_factors[uid][book_id] for book_id in range(self.simulation.book_count)] for uid in uids.tolist()], dtype=np.float64)
+    # Miners which traded in the latest interval receive an activity factor determined by the ratio of their volume to the cap,
+    # while the factors of inactive miners are decayed so as to halve the miner score over each Sharpe assessment window where they remain inactive
+    inactivity_decay_factor = (2 ** (-1 / self.config.scoring.sharpe.lookback))
+    activity_factors = np.where(latest_volumes > 0, np.minimum(1 + (miner_volumes / volume_cap), 2.0), previous_activity_factors * inactivity_decay_factor)
+    for i, uid in enumerate(uids.tolist()):
+        self.activity_factors[uid] = dict(enumerate(activity_factors[i].tolist()))
+    # Magnify wins and losses occurring in periods with higher trading volumes
+    activity_weighted_normalized_sharpes = np.where((activity_factors < 1) | (normalized_sharpes > 0.5), activity_factors, 2 - activity_factors) * normalized_sharpes
+
+    # Use the 1.5 rule to detect left-hand outliers in the activity-weighted Sharpes, and penalize by the lowest outlier where negative
+    q1 = np.percentile(activity_weighted_normalized_sharpes, 25, axis=1)
+    q3 = np.percentile(activity_weighted_normalized_sharpes, 75, axis=1)
+    outliers = activity_weighted_normalized_sharpes < (q1 - 1.5 * (q3 - q1))[:, None]
+    min_outliers = np.where(outliers, activity_weighted_normalized_sharpes, np.inf).min(axis=1)
+    outlier_penalties = np.where(outliers.any(axis=1) & (min_outliers < 0.0), min_outliers, 0.0)
+    activity_weighted_normalized_medians = np.median(activity_weighted_normalized_sharpes, axis=1)
+    scores[scored] = self.reward_weights['sharpe'] * (activity_weighted_normalized_medians - np.abs(outlier_penalties))
+    return scores
+
+def reward_inputs(self : Validator, synapse : MarketSimulationStateUpdate) -> dict:
+    """
+    Extracts the compact account and trade arrays required to update miner scores from the latest state.
 
     Args:
         self (taos.im.neurons.validator.Validator) : Validator instance
         synapse (taos.im.protocol.MarketSimulationStateUpdate) : The latest state update synapse
-        uid (int) : UID of miner being scored
 
     Returns:
-        float: The new score value for the miner.
+        dict: The inputs to the scoring step; account balances and midquote prices on each book are provided as `(uids, books)` and `(books,)` arrays,
+              and trades in which miners participated as flat arrays of UID, book ID, quote volume and role.
     """
-    try:
-        sampled_timestamp = math.ceil(synapse.timestamp / self.config.scoring.activity.trade_volume_sampling_interval) * self.config.scoring.activity.trade_volume_sampling_interval
-        # Prune the trading volume history of the miner to exclude values prior to the latest `trade_volume_assessment_period`
-        for book_id, role_trades in self.trade_volumes[uid].items():
-            for role, trades in role_trades.items():
-                if trades != {}:
-                    if min(trades.keys()) < synapse.timestamp - self.config.scoring.activity.trade_volume_assessment_period:
-                        self.trade_volumes[uid][book_id][role] = {time : volume for time, volume in trades.items() if time > synapse.timestamp - self.config.scoring.activity.trade_volume_assessment_period}
-                if not sampled_timestamp in self.trade_volumes[uid][book_id]['total']:
-                    self.trade_volumes[uid][book_id]['total'][sampled_timestamp] = 0.0
-                    self.trade_volumes[uid][book_id]['maker'][sampled_timestamp] = 0.0
-                    self.trade_volumes[uid][book_id]['taker'][sampled_timestamp] = 0.0
-                    self.trade_volumes[uid][book_id]['self'][sampled_timestamp] = 0.0
-        # Update trade volume history with new trades since the previous step
-        
+    uids = [uid.item() for uid in self.metagraph.uids]
+    book_ids = list(synapse.books.keys())
+    midquotes = np.array([(book.asks[0].price + book.bids[0].price) / 2 if len(book.asks) > 0 and len(book.bids) > 0 else 0.0 for book in synapse.books.values()], dtype=np.float64)
+    quote_balances = np.zeros((len(uids), len(book_ids)), dtype=np.float64)
+    base_balances = np.zeros((len(uids), len(book_ids)), dtype=np.float64)
+    has_account = np.zeros(len(uids), dtype=bool)
+    trades = {'uid' : [], 'book' : [], 'volume' : [], 'role' : []}
+    for i, uid in enumerate(uids):
+        if uid in synapse.accounts:
+            has_account[i] = True
+            quote_balances[i] = [synapse.accounts[uid][book_id].quote_balance.total for book_id in book_ids]
+            base_balances[i] = [synapse.accounts[uid][book_id].base_balance.total for book_id in book_ids]
         for notice in synapse.notices[uid]:
             if notice.type == 'EVENT_TRADE':
-                self.trade_volumes[uid][notice.bookId]['total'][sampled_timestamp] = round(self.trade_volumes[uid][notice.bookId]['total'][sampled_timestamp] + notice.quantity * notice.price, self.simulation.volumeDecimals)
-                if notice.makerAgentId == notice.takerAgentId:                
-                    self.trade_volumes[uid][notice.bookId]['self'][sampled_timestamp] = round(self.trade_volumes[uid][notice.bookId]['self'][sampled_timestamp] + notice.quantity * notice.price, self.simulation.volumeDecimals)
-                elif notice.makerAgentId == uid:
-                    self.trade_volumes[uid][notice.bookId]['maker'][sampled_timestamp] = round(self.trade_volumes[uid][notice.bookId]['maker'][sampled_timestamp] + notice.quantity * notice.price, self.simulation.volumeDecimals)
-                elif notice.takerAgentId == uid:
-                    self.trade_volumes[uid][notice.bookId]['taker'][sampled_timestamp] = round(self.trade_volumes[uid][notice.bookId]['taker'][sampled_timestamp] + notice.quantity * notice.price, self.simulation.volumeDecimals)
-        
-        # Calculate the current value of the agent's inventory and append to the history array
-        if uid in synapse.accounts:
-            self.inventory_history[uid][synapse.timestamp] = {book_id : get_inventory_value(synapse.accounts[uid][book_id], book) - self.simulation.miner_wealth for book_id, book in synapse.books.items()}
-        else:
-            self.inventory_history[uid][synapse.timestamp] = {book_id : 0.0 for book_id in synapse.books}
-        # Prune the inventory history
-        self.inventory_history[uid] = dict(list(self.inventory_history[uid].items())[-self.config.scoring.sharpe.lookback:])        
-        
-        inventory_score = score_inventory_values(self, uid, self.inventory_history[uid])        
-        return inventory_score
-    except Exception as ex:
-        bt.logging.error(f"Failed to calculate reward for UID {uid} at step {self.step} : {traceback.format_exc()}")
-        return self.scores[uid]
+                trades['uid'].append(uid)
+                trades['book'].append(notice.bookId)
+                trades['volume'].append(notice.quantity * notice.price)
+                trades['role'].append('self' if notice.makerAgentId == notice.takerAgentId else 'maker' if notice.makerAgentId == uid else 'taker' if notice.takerAgentId == uid else None)
+    return {
+        'timestamp' : synapse.timestamp,
+        'step' : self.step,
+        'uids' : np.array(uids, dtype=np.int64),
+        'scores' : self.scores.detach().cpu().numpy().astype(np.float64),
+        'midquotes' : midquotes,
+        'quote_balances' : quote_balances,
+        'base_balances' : base_balances,
+        'has_account' : has_account,
+        'trades' : trades
+    }
 
-def get_rewards(
-    self : Validator, synapse : MarketSimulationStateUpdate
-) -> torch.FloatTensor:
+def scoring_summary(inventory_history : InventoryHistory, trade_volumes : TradeVolumes) -> dict:
     """
-    Returns a tensor of rewards for the given query and responses.
+    Extracts the values of the scoring state used outside of the scoring process, for reporting and enforcement of volume limits.
 
     Args:
-        self (taos.im.neurons.validator.Validator) : Validator instance
-        synapse (taos.im.protocol.MarketSimulationStateUpdate) : The latest state update object.
+        inventory_history (taos.im.utils.inventory.InventoryHistory) : Miner inventory value history
+        trade_volumes (taos.im.utils.volume.TradeVolumes) : Miner trading volume history
+
+    Returns:
+        dict: Period trading volumes `(uids, books, roles)`, number of inventory observations held for each UID and the first, second-last and last inventory values `(uids, books)`.
+    """
+    uids = np.arange(inventory_history.uids)
+    counts = inventory_history.counts.copy()
+    heads = inventory_history.heads
+    return {
+        'volumes' : trade_volumes.sums.copy(),
+        'inventory_counts' : counts,
+        'inventory_first' : inventory_history.values[uids, :, (heads - counts) % inventory_history.lookback],
+        'inventory_previous' : inventory_history.values[uids, :, (heads - 2) % inventory_history.lookback],
+        'inventory_last' : inventory_history.values[uids, :, (heads - 1) % inventory_history.lookback]
+    }
+
+def update_histories(self, timestamp : int, trades : dict, uids : np.ndarray, inventory_values : np.ndarray) -> None:
+    """
+    Records the trades and inventory values of miners in a new state to the trading volume and inventory histories.
+
+    Args:
+        self : Scoring state, holding the `inventory_history` and `trade_volumes`
+        timestamp (int) : Simulation timestamp of the state
+        trades (dict) : Trades in which miners participated, as output by `reward_inputs`
+        uids (np.ndarray) : UIDs for which inventory values are given
+        inventory_values (np.ndarray) : `(uids, books)` array of inventory values
 
     Returns:
-        torch.FloatTensor: A tensor of rewards for the given query and responses.
+        None
     """
-    # Get all the reward results by iteratively calling your reward() function.
-    return torch.FloatTensor(
-        [reward(self, synapse, uid.item()) for uid in self.metagraph.uids]
-    ).to(self.device)
+    # Expire trading volumes prior to the latest `trade_volume_assessment_period` and record new trades since the previous step
+    self.trade_volumes.advance(timestamp)
+    for uid, book_id, volume, role in zip(trades['uid'], trades['book'], trades['volume'], trades['role']):
+        self.trade_volumes.record(uid, book_id, 'total', volume)
+        if role:
+            self.trade_volumes.record(uid, book_id, role, volume)
+    for uid, values in zip(uids.tolist(), inventory_values):
+        self.inventory_history.append(uid, timestamp, values)
+
+def reset_scoring(self, uid : int) -> None:
+    """
+    Discards the scoring history of a UID.
+
+    Args:
+        self : Scoring state, holding the histories, Sharpe values and activity factors
+        uid (int) : The UID to be reset
+
+    Returns:
+        None
+    """
+    self.inventory_history.reset(uid)
+    self.trade_volumes.reset(uid)
+    self.activity_factors[uid] = {bookId : 0.0 for bookId in range(self.simulation.book_count)}
+    self.sharpe_values[uid] = {
+        'books' : {bookId : 0.0 for bookId in range(self.simulation.book_count)},
+        'total' : 0.0, 'average' : 0.0, 'median' : 0.0,
+        'normalized_average' : 0.0, 'normalized_total' : 0.0, 'normalized_median' : 0.0
+    }
+
+def score(self, inputs : dict) -> dict:
+    """
+    Updates the scoring state with the trading volumes and inventory values of miners in the latest state, and calculates the new miner scores.
+
+    Args:
+        self : Scoring state maintained by the reward process
+        inputs (dict) : Output of `reward_inputs` for the latest state
+
+    Returns:
+        dict: The new score values for the UIDs in `inputs`, the updated Sharpe values and activity factors of scored UIDs, the scoring summary
+              and the changes made to the scoring state, which can be reapplied with `replay`.
+    """
+    self.simulation_timestamp = inputs['timestamp']
+    self.step = inputs['step']
+    self.scores = inputs['scores']
+    # Calculate the current value of the agents' inventories and record them to the history together with the latest trades
+    uids = inputs['uids']
+    inventory_values = np.where(inputs['has_account'][:, None], inputs['quote_balances'] + inputs['midquotes'] * inputs['base_balances'] - self.simulation.miner_wealth, 0.0)
+    update_histories(self, inputs['timestamp'], inputs['trades'], uids, inventory_values)
+    rewards = score_inventory_histories(self, uids)
+    scored = uids[self.inventory_history.counts[uids] > 1].tolist()
+    resets, self.resets = self.resets, []
+    return {
+        'uids' : uids,
+        'rewards' : rewards,
+        'sharpe_values' : {uid : self.sharpe_values[uid] for uid in scored},
+        'activity_factors' : {uid : self.activity_factors[uid] for uid in scored},
+        'summary' : scoring_summary(self.inventory_history, self.trade_volumes),
+        'delta' : {
+            'step' : inputs['step'],
+            'timestamp' : inputs['timestamp'],
+            'resets' : resets,
+            'trades' : inputs['trades'],
+            'uids' : uids.tobytes(),
+            'inventory_values' : inventory_values.tobytes()
+        }
+    }
+
+def replay(self, delta : dict, sharpe_values : dict, activity_factors : dict) -> None:
+    """
+    Reapplies the changes made to the scoring state by a scoring step, as recorded in the `delta` of the result of `score`.
+
+    Args:
+        self : Scoring state, holding the histories, Sharpe values and activity factors
+        delta (dict) : The changes to the scoring state made by the step
+        sharpe_values (dict) : Sharpe values of the UIDs scored in the step
+        activity_factors (dict) : Activity factors of the UIDs scored in the step
+
+    Returns:
+        None
+    """
+    for uid in delta['resets']:
+        reset_scoring(self, uid)
+    uids = np.frombuffer(delta['uids'], dtype=np.int64)
+    inventory_values = np.frombuffer(delta['inventory_values'], dtype=np.float64).reshape(len(uids), -1)
+    update_histories(self, delta['timestamp'], delta['trades'], uids, inventory_values)
+    self.sharpe_values.update(sharpe_values)
+    self.activity_factors.update(activity_factors)
+
+def reward_process(connection : Connection, config : bt.Config, simulation : MarketSimulationConfig, state : dict) -> None:
+    """
+    Main loop of the reward process, which owns the scoring state and handles requests received from the validator in order.
+
+    Requests are tuples of `(kind, payload)`, where `kind` is one of:
+        a) `score` : Update the scoring state with the output of `reward_inputs` and return the result of `score`
+        b) `reset` : Discard the scoring history of the UID given as payload
+        c) `shift` : Shift trading volume timestamps by the offset given as payload
+        d) `state` : Return the scoring state for saving, together with the validator step at which it was last updated
+        e) `load` : Replace the simulation config and scoring state with the `(simulation, state)` given as payload, as on reloading the validator state
+        f) `stop` : Exit the process
+    Each request is answered with a tuple of `(success, result)`, where the result is the formatted traceback of any exception raised.
+
+    Args:
+        connection (multiprocessing.connection.Connection) : Connection over which requests are received and results returned
+        config (bittensor.Config) : Validator config
+        simulation (taos.im.protocol.models.MarketSimulationConfig) : Simulation config
+        state (dict) : Initial scoring state, as returned by the `state` request
+
+    Returns:
+        None
+    """
+    self = SimpleNamespace(
+        config=config,
+        simulation=simulation,
+        reward_weights=state['reward_weights'],
+        inventory_history=state['inventory_history'],
+        trade_volumes=state['trade_volumes'],
+        activity_factors=state['activity_factors'],
+        sharpe_values=state['sharpe_values'],
+        simulation_timestamp=0,
+        step=state.get('step', 0),
+        scores=None,
+        resets=[]
+    )
+    while True:
+        try:
+            kind, payload = connection.recv()
+        except EOFError:
+            return
+        try:
+            match kind:
+                case 'score':
+                    result = score(self, payload)
+                case 'reset':
+                    reset_scoring(self, payload)
+                    # Resets are reported with the changes made by the next scoring step, so that they can be replayed in order
+                    self.resets.append(payload)
+                    result = None
+                case 'shift':
+                    self.trade_volumes.shift(payload)
+                    result = scoring_summary(self.inventory_history, self.trade_volumes)
+                case 'load':
+                    simulation, state = payload
+                    self.simulation = simulation
+                    self.reward_weights = state['reward_weights']
+                    self.inventory_history = state['inventory_history']
+                    self.trade_volumes = state['trade_volumes']
+                    self.activity_factors = state['activity_factors']
+                    self.sharpe_values = state['sharpe_values']
+                    self.step = state.get('step', 0)
+                    self.resets = []
+                    result = None
+                case 'state':
+                    # Resets made before the state is taken are included in it, and need not be replayed
+                    self.resets = []
+                    result = {
+                        'step' : self.step,
+                        'inventory_history' : self.inventory_history.arrays(),
+                        'trade_volumes' : self.trade_volumes.arrays(),
+                        'activity_factors' : self.activity_factors,
+                        'sharpe_values' : self.sharpe_values
+                    }
+                case 'stop':
+                    connection.send((True, None))
+                    return
+            connection.send((True, result))
+        except Exception as ex:
+            connection.send((False, traceback.format_exc()))
+
+class RewardWorker:
+    """
+    Handle to the persistent process in which miner scores are calculated, so that scoring does not contend with the validator event loop for the GIL.
+    Requests are processed by the worker in the order submitted, and each returns a future which is resolved when the worker responds.
+    """
+    def __init__(self, config : bt.Config, simulation : MarketSimulationConfig, state : dict):
+        context = multiprocessing.get_context('spawn')
+        self.connection, worker_connection = context.Pipe()
+        self.process = context.Process(target=reward_process, args=(worker_connection, config, simulation, state), daemon=True, name='reward')
+        self.process.start()
+        worker_connection.close()
+        self.pending = deque()
+        self.lock = Lock()
+        Thread(target=self._receive, daemon=True, name='reward_results').start()
+
+    def request(self, kind : str, payload=None) -> Future:
+        """
+        Submits a request to the reward process.
+
+        Args:
+            kind (str) : Type of the request; see `reward_process`
+            payload : Data associated with the request
+
+        Returns:
+            concurrent.futures.Future: Future resolved with the result of the request.
+        """
+        future = Future()
+        with self.lock:
+            self.pending.append(future)
+            self.connection.send((kind, payload))
+        return future
+
+    def _receive(self) -> None:
+        while True:
+            try:
+                if not self.connection.poll(1.0):
+                    if not self.process.is_alive():
+                        break
+                    continue
+                success, result = self.connection.recv()
+            except (EOFError, OSError):
+                break
+            future = self.pending.popleft()
+            if success:
+                future.set_result(result)
+            else:
+                future.set_exception(Exception(result))
+        while self.pending:
+            self.pending.popleft().set_exception(Exception("Reward process exited."))
+
+    def stop(self) -> None:
+        """Stops the reward process once all submitted requests are completed."""
+        if self.process.is_alive():
+            self.request('stop').result()
+        self.process.join()
+        self.connection.close()
 
-def set_delays(self : Validator, synapse_responses : dict[int, MarketSimulationStateUpdate]) -> list[FinanceAgentResponse]:
+def set_delays(self : Validator, synapse_responses : dict[int, MarketSimulationStateUpdate], batch : InstructionBatch) -> InstructionBatch:
     """
     Calculates and applies the simulation time delay to be applied to each instruction received by the validator
 
     Args:
         self (taos.im.neurons.validator.Validator) : Validator instance
-        synapse_responses (list[taos.im.protocol.MarketSimulationStateUpdate]) : The latest state update object.
+        synapse_responses (list[taos.im.protocol.MarketSimulationStateUpdate]) : The synapses with attached validated agent responses.
+        batch (taos.im.utils.instructions.InstructionBatch) : The validated instructions of all agents.
 
     Returns:
-        torch.FloatTensor: A tensor of rewards for the given query and responses.
+        InstructionBatch: The validated instructions, with delays applied.
     """
-    responses = []
+    delays = np.zeros(max(synapse_responses.keys(), default=-1) + 1, dtype=np.int64)
+    counts = np.bincount(batch.uid, minlength=len(delays))
     for uid, synapse_response in synapse_responses.items():
-        response = synapse_response.response
-        if response:
+        if synapse_response.response:
             # Delay is calculated to be proportional to the configured maximum in the same proportion as the response time to the timeout
-            delay = max(int((self.config.scoring.max_delay * (synapse_response.dendrite.process_time / self.config.neuron.timeout))),self.config.scoring.min_delay)
-            for instruction in response.instructions:
-                instruction.delay = delay + instruction.delay
-            responses.append(response)
-            bt.logging.debug(f"UID {response.agent_id} Responded with {len(response.instructions)} instructions after {synapse_response.dendrite.process_time:.4f}s - delay set to {delay}{self.simulation.time_unit}")
-    return responses
\ No newline at end of file
+            delays[uid] = max(int((self.config.scoring.max_delay * (synapse_response.dendrite.process_time / self.config.neuron.timeout))),self.config.scoring.min_delay)
+            bt.logging.debug(f"UID {uid} Responded with {counts[uid]} instructions after {synapse_response.dendrite.process_time:.4f}s - delay set to {delays[uid]}{self.simulation.time_unit}")
+    batch.delay += delays[batch.uid]
+    return batch
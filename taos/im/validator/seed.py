@@ -2,14 +2,167 @@
 # SPDX-License-Identifier: MIT
 import os
 import json
+import mmap
 import time
-import pandas as pd
+import struct
+import calendar
+import traceback
 import bittensor as bt
+from datetime import datetime, timedelta
+from threading import Lock, Timer
 
 from binance.websocket.spot.websocket_stream import SpotWebsocketStreamClient
 from taos.im.utils.coinbase import CoinbaseClient
 from coinbase.websocket import WSClientConnectionClosedException,WSClientException
 
+EPOCH = datetime(1970, 1, 1)
+
+def binance_time(timestamp : int) -> str:
+    """Formats a Binance trade timestamp in milliseconds as an ISO-8601 UTC time string with microsecond precision."""
+    return (EPOCH + timedelta(milliseconds=timestamp)).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+def iso_timestamp(time : str) -> float:
+    """
+    Converts an ISO-8601 UTC time string of the form `2025-01-01T00:00:00.123456789Z` to a POSIX timestamp in seconds.
+    As for `pandas.Timestamp(time).timestamp()`, the time is held as an integer count of microseconds, or of nanoseconds where given to more than six decimal places,
+    and the timestamp is rounded to microseconds.
+    """
+    seconds = calendar.timegm((int(time[0:4]), int(time[5:7]), int(time[8:10]), int(time[11:13]), int(time[14:16]), int(time[17:19])))
+    fraction = time[19:].rstrip('Z').lstrip('.')
+    if len(fraction) > 6:
+        return round((seconds * 1_000_000_000 + int(fraction[:9].ljust(9, '0'))) / 1_000_000_000, 6)
+    return round((seconds * 1_000_000 + int(fraction.ljust(6, '0'))) / 1_000_000, 6)
+
+def minute(time : str) -> int:
+    """Minute of the hour of an ISO-8601 time string."""
+    return int(time[14:16])
+
+def read_last_count(filename : str) -> int:
+    """
+    Reads the count recorded in the first field of the last line of a seed file, reading backwards from the end of the file so that the cost does not grow with its length.
+
+    Args:
+        filename (str): Path of the seed file.
+    Returns:
+        int: The last count, or 0 if the file does not exist or is empty.
+    """
+    if not os.path.exists(filename):
+        return 0
+    with open(filename, 'rb') as file:
+        end = file.seek(0, os.SEEK_END)
+        position = end
+        data = b''
+        while position > 0 and data.rstrip(b'\n').count(b'\n') == 0:
+            position = max(0, position - 4096)
+            file.seek(position)
+            data = file.read(end - position)
+    lines = data.rstrip(b'\n').split(b'\n')
+    return int(lines[-1].split(b',')[0]) if lines[-1] else 0
+
+class SeedFile:
+    """
+    Seed file opened for appending, to which lines are written in batches.
+    Buffered lines are written and flushed once they exceed `FLUSH_SIZE` bytes, and otherwise by a timer started when the first line is buffered
+    which fires `FLUSH_INTERVAL` seconds later, so that the latest values are available to the simulator promptly without a system call for every trade received
+    even where no further line is written.
+    Lines are written from the exchange stream callbacks and flushed by the timer and periodically from the seeding loop, so access to the buffer is serialized.
+    """
+    FLUSH_INTERVAL = 0.1
+    FLUSH_SIZE = 65536
+
+    def __init__(self, filename : str):
+        self.filename = filename
+        self.file = open(filename, 'a')
+        self.buffer = []
+        self.size = 0
+        self.timer = None
+        self.lock = Lock()
+
+    def write(self, data : str) -> None:
+        if not data:
+            return
+        with self.lock:
+            if self.timer is None:
+                self.timer = Timer(self.FLUSH_INTERVAL, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+            self.buffer.append(data)
+            self.size += len(data)
+            if self.size < self.FLUSH_SIZE:
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            self.timer = None
+            if self.buffer:
+                self.file.write(''.join(self.buffer))
+                self.buffer = []
+                self.size = 0
+            self.file.flush()
+
+class SeedChannel:
+    """
+    Memory-mapped ring of the most recent seed values, from which the simulator reads the latest seed without parsing the seed file.
+    The file begins with a 64-byte header holding the magic bytes, format version, number of slots and the count of the latest complete record,
+    followed by slots of (count, price, timestamp, count); the layout is mirrored by `taosim::util::SeedChannel` in the simulator.
+    The count is written before and after the values of each slot, and the record is published in the header only once the slot is complete;
+    a reader which does not find both counts equal to the published count has raced with the writer and retries.
+    Nothing is synced to disk, since the simulator reads the shared pages directly.
+    """
+    MAGIC = b'TAOSSEED'
+    VERSION = 1
+    SLOTS = 1024
+    HEADER = struct.Struct('<8sIIQ')
+    HEADER_SIZE = 64
+    SLOT_SIZE = 32
+    COUNT = struct.Struct('<Q')
+    VALUES = struct.Struct('<dq')
+
+    def __init__(self, filename : str, slots : int = SLOTS):
+        self.filename = filename
+        self.slots = slots
+        size = self.HEADER_SIZE + slots * self.SLOT_SIZE
+        fd = os.open(filename, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != size:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+            self.mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        if self.HEADER.unpack_from(self.mmap)[:3] != (self.MAGIC, self.VERSION, slots):
+            self.mmap[:] = bytes(size)
+            self.HEADER.pack_into(self.mmap, 0, self.MAGIC, self.VERSION, slots, 0)
+
+    def write(self, count : int, price : float, timestamp : int) -> None:
+        """
+        Publishes a seed value.
+
+        Args:
+            count (int): The count of the seed, as recorded in the seed file.
+            price (float): The seed price.
+            timestamp (int): Time in nanoseconds at which the seed was received.
+        Returns:
+            None
+        """
+        offset = self.HEADER_SIZE + (count % self.slots) * self.SLOT_SIZE
+        self.COUNT.pack_into(self.mmap, offset, count)
+        self.VALUES.pack_into(self.mmap, offset + 8, price, timestamp)
+        self.COUNT.pack_into(self.mmap, offset + 24, count)
+        self.COUNT.pack_into(self.mmap, 16, count)
+
+    def latest(self) -> tuple[int, float, int] | None:
+        """Reads the latest complete record as (count, price, timestamp), or None if no seed has yet been published."""
+        count = self.COUNT.unpack_from(self.mmap, 16)[0]
+        if count == 0:
+            return None
+        offset = self.HEADER_SIZE + (count % self.slots) * self.SLOT_SIZE
+        return (count, *self.VALUES.unpack_from(self.mmap, offset + 8))
+
+    def close(self) -> None:
+        self.mmap.close()
+
 def seed(self) -> None:
         """
         Retrieve price data for use as simulation fundamental price seed, and record to simulator-accessible location.
@@ -18,6 +171,7 @@ def seed(self) -> None:
         try:
             self.seed_count = 0
             self.seed_filename = None
+            self.seed_channel = None
             last_count = self.seed_count
             self.last_seed = None
             self.pending_seed_data = ''
@@ -41,7 +195,7 @@ def seed(self) -> None:
                         trade = {
                             "product_id" : message_dict['s'].lower(),
                             "price" : float(message_dict['p']),
-                            "time" : pd.to_datetime(message_dict['T']*1000000).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+                            "time" : binance_time(message_dict['T']),
                             "timestamp" : message_dict['T']
                         }
                         match trade['product_id']:
@@ -69,7 +223,7 @@ def seed(self) -> None:
                                         seed = float(trade['price'])
                                         record_seed(seed)
                                     case self.config.simulation.seeding.external.symbol.coinbase:
-                                        trade['timestamp'] = pd.Timestamp(trade['time']).timestamp()
+                                        trade['timestamp'] = iso_timestamp(trade['time'])
                                         record_external(trade)
                                 return
                 except Exception as ex:
@@ -88,16 +242,23 @@ def seed(self) -> None:
                                 self.pending_seed_data = ''
                             if not self.last_seed:
                                 self.seed_filename = os.path.join(self.simulation.logDir,"fundamental_seed.csv")
-                                if os.path.exists(self.seed_filename) and os.stat(self.seed_filename).st_size > 0:
-                                    with open(self.seed_filename) as f:
-                                        for line in f:
-                                            pass
-                                        self.seed_count = self.seed_count + int(line.split(',')[0])
-                                self.seed_file = open(self.seed_filename,'a')
+                                self.seed_count = self.seed_count + read_last_count(self.seed_filename)
+                                self.seed_file = SeedFile(self.seed_filename)
                                 self.seed_file.write(self.pending_seed_data)
                                 self.pending_seed_data = ''
+                                if self.seed_channel:
+                                    self.seed_channel.close()
+                                    self.seed_channel = None
+                                channel_filename = os.path.join(self.simulation.logDir,"fundamental_seed.bin")
+                                if self.config.simulation.seeding.fundamental.channel:
+                                    self.seed_channel = SeedChannel(channel_filename)
+                                elif os.path.exists(channel_filename):
+                                    # The simulator reads from the channel in preference to the seed file while it exists,
+                                    # so a channel left by a previous run with the channel enabled is removed.
+                                    os.remove(channel_filename)
                             self.seed_file.write(f"{self.seed_count},{seed}\n")
-                            self.seed_file.flush()
+                            if self.seed_channel:
+                                self.seed_channel.write(self.seed_count, seed, time.time_ns())
                             self.last_seed = seed
                 except Exception as ex:
                     bt.logging.error(f"Exception in seed handling : Seed={seed} | Error={ex}")
@@ -115,28 +276,18 @@ def seed(self) -> None:
                                 self.pending_external_data = ''
                             if not self.last_external:
                                 self.external_filename = os.path.join(self.simulation.logDir,"external_seed.csv")
-                                if os.path.exists(self.external_filename) and os.stat(self.external_filename).st_size > 0:
-                                    with open(self.external_filename) as f:
-                                        for line in f:
-                                            pass
-                                        self.external_count = self.external_count + int(line.split(',')[0])
-                                self.external_file = open(self.external_filename,'a')
+                                self.external_count = self.external_count + read_last_count(self.external_filename)
+                                self.external_file = SeedFile(self.external_filename)
                                 self.external_file.write(self.pending_external_data)
                                 self.pending_external_data = ''
                                 
                                 self.sampled_external_filename = os.path.join(self.simulation.logDir,"external_seed_sampled.csv")
-                                if os.path.exists(self.sampled_external_filename) and os.stat(self.sampled_external_filename).st_size > 0:
-                                    with open(self.sampled_external_filename) as f:
-                                        for line in f:
-                                            pass
-                                        self.sampled_external_count = self.sampled_external_count + int(line.split(',')[0])
-                                self.sampled_external_file = open(self.sampled_external_filename,'a')
+                                self.sampled_external_count = self.sampled_external_count + read_last_count(self.sampled_external_filename)
+                                self.sampled_external_file = SeedFile(self.sampled_external_filename)
                             self.external_file.write(f"{self.external_count},{trade['price']},{trade['time']}\n")
-                            self.external_file.flush()
                             sampling_period = self.config.simulation.seeding.external.sampling_seconds
-                            if self.last_external and ((not self.last_sampled_external and pd.to_datetime(self.last_external['time']).minute != pd.to_datetime(trade['time']).minute) or (self.last_sampled_external and self.last_sampled_external['timestamp'] < trade['timestamp'] - sampling_period)):
+                            if self.last_external and ((not self.last_sampled_external and minute(self.last_external['time']) != minute(trade['time'])) or (self.last_sampled_external and self.last_sampled_external['timestamp'] < trade['timestamp'] - sampling_period)):
                                 self.sampled_external_file.write(f"{self.sampled_external_count},{self.last_external['price']}\n")
-                                self.sampled_external_file.flush()
                                 self.last_sampled_external = self.last_external
                                 self.sampled_external_count += 1
                             self.last_external = trade
@@ -196,6 +347,7 @@ def seed(self) -> None:
                         last_count = self.seed_count
                     if self.last_external:
                         self.external_file.flush()
+                        self.sampled_external_file.flush()
                         if last_external_count == self.external_count:
                             external_update_counter += 1
                             if external_update_counter >= 6: 
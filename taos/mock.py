@@ -6,7 +6,9 @@ import asyncio
 import random
 import bittensor as bt
 
-from typing import List
+from collections import defaultdict
+
+from taos.common.utils.dendrite import PooledDendrite
 
 
 class MockSubtensor(bt.MockSubtensor):
@@ -53,69 +55,50 @@ class MockMetagraph(bt.metagraph):
         bt.logging.info(f"Axons: {self.axons}")
 
 
-class MockDendrite(bt.dendrite):
+class MockDendrite(PooledDendrite):
     """
     Replaces a real bittensor network request with a mock request that just returns some static response for all axons that are passed and adds some random delay.
-    """
 
-    def __init__(self, wallet):
-        super().__init__(wallet)
-
-    async def forward(
-        self,
-        axons: List[bt.axon],
-        synapse: bt.Synapse = bt.Synapse(),
-        timeout: float = 12,
-        deserialize: bool = True,
-        run_async: bool = True,
-        streaming: bool = False,
-    ):
-        if streaming:
-            raise NotImplementedError("Streaming not implemented yet.")
-
-        async def query_all_axons(streaming: bool):
-            """Queries all axons for responses."""
-
-            async def single_axon_response(i, axon):
-                """Queries a single axon for a response."""
-
-                start_time = time.time()
-                s = synapse.copy()
-                # Attach some more required data so it looks real
-                s = self.preprocess_synapse_for_request(axon, s, timeout)
-                # We just want to mock the response, so we'll just fill in some data
-                process_time = random.random()
-                if process_time < timeout:
-                    s.dendrite.process_time = str(time.time() - start_time)
-                    # Update the status code and status message of the dendrite to match the axon
-                    s.dendrite.status_code = 200
-                    s.dendrite.status_message = "OK"
-                    synapse.dendrite.process_time = str(process_time)
-                else:
-                    s.dendrite.status_code = 408
-                    s.dendrite.status_message = "Timeout"
-                    synapse.dendrite.process_time = str(timeout)
-
-                # Return the updated synapse object after deserializing if requested
-                if deserialize:
-                    return s.deserialize()
-                else:
-                    return s
-
-            return await asyncio.gather(
-                *(
-                    single_axon_response(i, target_axon)
-                    for i, target_axon in enumerate(axons)
-                )
-            )
+    The connection pool, request limit and circuit breakers of `PooledDendrite` are exercised against a simulated network, so that the transport can be load tested locally.
+    Each hotkey is assigned a network round trip time drawn from `latency`; establishing a connection takes one round trip, and connections are pooled and expire
+    as configured for the real transport.  Responses take a further processing time drawn uniformly from [0, 1) seconds, and the fraction `unresponsive` of hotkeys never respond.
+    """
 
-        return await query_all_axons(streaming)
+    def __init__(self, wallet, latency: tuple = (0.01, 0.1), unresponsive: float = 0.0, seed: int | None = None, **kwargs):
+        super().__init__(wallet, **kwargs)
+        self.latency = latency
+        self.unresponsive = unresponsive
+        self.rng = random.Random(seed)
+        self.profiles = {}
+        self.idle = defaultdict(list)
+
+    async def _request(self, target_axon, request_name, synapse, timeout):
+        """Simulates sending the request to the axon over a pooled or new connection."""
+        if target_axon.hotkey not in self.profiles:
+            self.profiles[target_axon.hotkey] = (self.rng.uniform(*self.latency), self.rng.random() < self.unresponsive)
+        latency, unresponsive = self.profiles[target_axon.hotkey]
+        start_time = time.time()
+        idle = [expiry for expiry in self.idle[target_axon.hotkey] if expiry > start_time]
+        reused = len(idle) > 0
+        self.idle[target_axon.hotkey] = idle[1:]
+        self.record_connection(reused, 0.0 if reused else min(latency, timeout))
+        # We just want to mock the response, so we'll just fill in some data
+        process_time = (0.0 if reused else latency) + latency + self.rng.random()
+        if unresponsive or process_time >= timeout:
+            await asyncio.sleep(timeout)
+            raise asyncio.TimeoutError()
+        await asyncio.sleep(process_time)
+        if len(self.idle[target_axon.hotkey]) < self.connections_per_axon:
+            self.idle[target_axon.hotkey].append(time.time() + self.keepalive_timeout)
+        # Update the status code and status message of the dendrite to match the axon
+        synapse.dendrite.status_code = 200
+        synapse.dendrite.status_message = "OK"
 
     def __str__(self) -> str:
         """
         Returns a string representation of the Dendrite object.
 
         Returns:
-            str: The string representation of the Dendrite object in the format "dendrite(<user_wallet_address>)".
+            str: The string representation of the Dendrite object in the format "MockDendrite(<user_wallet_address>)".
         """
         return "MockDendrite({})".format(self.keypair.ss58_address)